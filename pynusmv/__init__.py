@@ -28,6 +28,8 @@ functionalities:
 * :mod:`parser <pynusmv.parser>` gives access to NuSMV parser to parse simple
   expressions of the SMV language.
 * :mod:`mc <pynusmv.mc>` contains model checking features.
+* :mod:`mucalc <pynusmv.mucalc>` provides a mu-calculus evaluator on top of
+  BDD-represented FSMs, to prototype fixpoint-based logics.
 * :mod:`exception <pynusmv.exception>` groups all the PyNuSMV-related
   exceptions.
 * :mod:`utils <pynusmv.utils>` contains some side functionalities.
@@ -77,14 +79,15 @@ functionalities:
 
 """
 
-__all__ = ['dd', 'exception', 'fsm', 'glob', 'init', 'mc', 'parser',
-           'prop', 'utils', 'model', 'node', 'collections']
+__all__ = ['dd', 'exception', 'fsm', 'glob', 'init', 'mc', 'mucalc',
+           'parser', 'prop', 'utils', 'model', 'node', 'collections']
 
 from . import dd
 from . import fsm
 from . import glob
 from . import init
 from . import mc
+from . import mucalc
 from . import parser
 from . import prop
 from . import utils
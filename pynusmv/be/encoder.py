@@ -22,7 +22,9 @@ from pynusmv_lower_interface.nusmv.enc      import enc  as _enc
 from pynusmv_lower_interface.nusmv.enc.be   import be   as _be
 from pynusmv_lower_interface.nusmv.enc.base import base as _base
 from pynusmv_lower_interface.nusmv.enc.bool import bool  as _bool
+from pynusmv_lower_interface.bmc_utils      import bmc_utils as _bmc_utils
 
+import weakref
 from enum                   import IntEnum
 from collections            import Iterator 
 from pynusmv.node           import Node
@@ -31,6 +33,7 @@ from pynusmv.collections    import NodeList
 from pynusmv.fsm            import SymbTable
 from pynusmv.be.expression  import Be
 from pynusmv.be.manager     import BeRbcManager
+from pynusmv.sat            import int32_zeros
 
 from pynusmv.exception      import NuSMVBeEncNotInitializedError 
 
@@ -182,20 +185,17 @@ class BeVar:
         :return: the untimed variable corresponding to self. If self is already
             untimed, self is returned.
         """
-        if self.is_untimed:
-            return self
-        else:
-            idx = _be.BeEnc_index_to_untimed_index(self.encoding._ptr, self.index)
-            return BeVar(self.encoding, idx)
+        enc = self.encoding
+        idx = enc._untimed_index(self.index)
+        return self if idx == self.index else enc._var(idx)
     
     @indexed.getter
     def at_time(self, time):
         """
         :return: the timed version corresponding to this variable at `time`.
         """
-        var = _be.BeEnc_index_to_timed(self.encoding._ptr, self.untimed.index, time)
-        idx = _be.BeEnc_var_to_index(self.encoding._ptr, var)
-        return BeVar(self.encoding, idx)
+        enc = self.encoding
+        return enc._var(enc._timed_index(enc._untimed_index(self.index), time))
     
     @property
     def next(self):
@@ -410,12 +410,14 @@ class BeEncUntimedVarIterator(Iterator):
         :param random_offset: the offset to consider in random iterations
         """
         self._enc        = enc
+        self._cached     = None
+        if not randomized:
+            # the plain order is cached by the encoder
+            self._cached = iter(enc._untimed_vars(var_type))
+            return
         self._idx        = _be.BeEnc_get_first_untimed_var_index(enc._ptr,
                                                                  var_type)
-        if randomized:
-            self._nxt = lambda x: _be.BeEnc_get_var_index_with_offset(enc._ptr, x, random_offset, var_type)
-        else:
-            self._nxt = lambda x: _be.BeEnc_get_next_var_index(enc._ptr, x, var_type)
+        self._nxt = lambda x: _be.BeEnc_get_var_index_with_offset(enc._ptr, x, random_offset, var_type)
             
     def __next__(self):
         """
@@ -424,10 +426,12 @@ class BeEncUntimedVarIterator(Iterator):
         :return: the variable at the current position of the iterator
         :raise: StopIteration when the iteration is over.
         """
+        if self._cached is not None:
+            return next(self._cached)
         if not _be.BeEnc_is_var_index_valid(self._enc._ptr, self._idx):
             raise StopIteration
         else:
-            _ret      = BeVar(self._enc, self._idx)
+            _ret      = self._enc._var(self._idx)
             self._idx = self._nxt(self._idx)
             return _ret
 
@@ -449,6 +453,10 @@ class BeEnc(PointerWrapper):
         therefore called *timed* variables.
         
     """
+    # the live encoders, whose lookup tables are dropped when a layer is
+    # committed to (or removed from) the NuSMV encoder they wrap. They are
+    # keyed by id since all the wrappers of one encoder are equal.
+    _instances = weakref.WeakValueDictionary()
 
     def __init__(self, ptr, freeit=False):
         """
@@ -459,6 +467,9 @@ class BeEnc(PointerWrapper):
           to this encoding should be reclaimed upon garbage collection.
         """
         super().__init__(ptr, freeit=freeit)
+        self._vars = {}  # index -> BeVar (an index always denotes the same var)
+        self.clear_caches()
+        BeEnc._instances[id(self)] = self
     
     def _free(self):
         """
@@ -619,7 +630,7 @@ class BeEnc(PointerWrapper):
         """
         if index < 0:
             raise ValueError("Index needs to be >= 0")
-        return BeVar(self, index)
+        return self._var(index)
     
     @indexed.getter
     def by_name(self, name_str):
@@ -631,10 +642,14 @@ class BeEnc(PointerWrapper):
         :return: the Be representing the variable if it was found
         :raise: KeyError if the variable could not be found.
         """
-        for v in self.iterator():
-            if str(v.name) == name_str:
-                return v
-        raise KeyError("{} not found".format(name_str))
+        if self._by_name is None:
+            self._by_name = {}
+            for v in self._untimed_vars(BeVarType.ALL):
+                self._by_name.setdefault(str(v.name), v)
+        try:
+            return self._by_name[name_str]
+        except KeyError:
+            raise KeyError("{} not found".format(name_str))
     
     @indexed.getter
     def by_expr(self, expr):
@@ -649,7 +664,7 @@ class BeEnc(PointerWrapper):
         index = _be.BeEnc_var_to_index(self._ptr, expr._ptr)
         if index == -1:
             raise KeyError("The given expression does not denote a variable")
-        return BeVar(self, index)
+        return self._var(index)
     
     @property
     def untimed_variables(self):
@@ -896,68 +911,205 @@ class BeEnc(PointerWrapper):
         valuations. Concretely, the returned value is a multi-level dictionary
         with the following structure: time_block -> scalar_name -> decoded_value
         
+        The model is decoded in one single pass over its literals. The location
+        (time and variable) of each CNF literal is looked up in a table which
+        is only rebuilt when the maximum time of the encoder grows (or when new
+        CNF variables appear) and the values of the scalar variables are
+        memoized.
+        
         :param sat_model: the dimacs model generated by a sat solver to satisfy
             some given property.
         :return: a multi-level map time_block -> scalar_name -> decoded_value
             representing the content of the sat_model
         """
-        mgr = self.manager
-        
-        def _to_var_value(x):
-            """Internal function, converts dimacs literal to a variable"""
-            try:
-                k = self.at_index[mgr.cnf_literal_to_index(abs(x))]
-                v = x > 0
-                return (k,v)
-            except:
-                return (None,None)
-        
-        def _group_by_time(valuation):
-            """Internal function, groups the variables in time blocks"""
-            result = {}
-            for k,v in valuation:
-                if k is None:
-                    continue
-                if k.time not in result:
-                    result[k.time] = []    
-                result[k.time].append((k, v))
-            return result
-        
-        def _group_by_scalar(timed):
-            """
-            Internal function, inside each block, group bits by scalar to which
-            they relate
-            """
-            result = {}
-            for tm in timed.keys():
-                result[tm] = {}
-                for var,value in timed[tm]:
-                    scalar = str(var.scalar)
-                    if scalar not in result[tm]:
-                        result[tm][scalar] = [(var, value)]
-                    else:
-                        result[tm][scalar].append((var,value))
-            return result
-        
-        def _decode(by_time_and_scalar):
-            """
-            Internal function, decodes the bits of each scalar var within each
-            time block
-            """
-            result = {}
-            for tm in by_time_and_scalar.keys():
-                result[tm] = {}
-                for scalar in by_time_and_scalar[tm].keys(): 
-                    result[tm][scalar] = self.decode_value(by_time_and_scalar[tm][scalar])
-            return result
-        
-        # use the above internal functions
-        valuation = [_to_var_value(x) for x in sat_model]
-        by_time   = _group_by_time(valuation)
-        by_scalar = _group_by_scalar(by_time)
-        decoded   = _decode(by_scalar)
-               
-        return decoded
+        literals = list(sat_model)
+        max_var  = max(map(abs, literals), default=0)
+        times, untimed = self._cnf_decoding_table(max_var)
+        
+        result = {}
+        bits   = {}  # (time, scalar) -> (scalar node, list of (bit, value))
+        for literal in literals:
+            var   = abs(literal)
+            index = untimed[var]
+            if index < 0:
+                continue
+            time  = times[var]
+            scalar, node, bit = self._decoding_var(index)
+            block = result.setdefault(time, {})
+            if bit is None:
+                block[scalar] = literal > 0
+            else:
+                if scalar not in block:
+                    block[scalar] = None   # keeps the order of the scalars
+                    bits[(time, scalar)] = (node, [])
+                bits[(time, scalar)][1].append((bit, literal > 0))
+        
+        for (time, scalar), (node, values) in bits.items():
+            result[time][scalar] = self._decode_bits(node, values)
+        return result
+    
+    def _cnf_decoding_table(self, max_var):
+        """
+        Returns the table locating the cnf variables 0 to `max_var` in this
+        encoding (see `enc_cnf_decoding_table` in bmc_utils). The table is 
+        rebuilt when the max time of the encoder grew since it was last built
+        or when it is too small to hold `max_var`.
+        
+        :return: a pair (times, untimed) of int32 arrays indexed by cnf variable
+        """
+        max_time = self.max_time
+        table    = self._decoding_table
+        if table is None or self._decoding_time != max_time \
+        or len(table[0]) <= max_var:
+            size  = max_var + 1 if table is None else max(max_var+1, len(table[0]))
+            table = (int32_zeros(size), int32_zeros(size))
+            _bmc_utils.enc_cnf_decoding_table(self._ptr, table[0], table[1])
+            self._decoding_table = table
+            self._decoding_time  = max_time
+            self._decoding_vars  = {}
+        return table
+    
+    def _decoding_var(self, index):
+        """
+        :return: a triple (scalar name, scalar node, bit index) describing the
+          untimed variable at `index`. The bit index is None when the variable
+          is not a bit of a scalar variable.
+        """
+        info = self._decoding_vars.get(index)
+        if info is None:
+            var  = BeVar(self, index)
+            if var.is_bit:
+                scalar = var.scalar
+                bit    = _bool.BoolEnc_get_index_from_bit(self._bool_enc, 
+                                                          var.name._ptr)
+                info   = (str(scalar), scalar, bit)
+            else:
+                info   = (str(var.name), var.name, None)
+            self._decoding_vars[index] = info
+        return info
+    
+    def _decode_bits(self, scalar, values):
+        """
+        :return: the (memoized) value node of the `scalar` variable (a node)
+          whose bits have the given `values` (a list of pairs (bit index, bool))
+        """
+        key    = (str(scalar), tuple(sorted(values)))
+        result = self._decoded_values.get(key)
+        if result is None:
+            bool_enc = self._bool_enc
+            bv = _bool.BitValues_create(bool_enc, scalar._ptr)
+            for bit, val in values:
+                _bool.BitValues_set(bv, bit, val)
+            result = Node.from_ptr(_bool.BoolEnc_get_value_from_var_bits(bool_enc, bv))
+            _bool.BitValues_destroy(bv)
+            self._decoded_values[key] = result
+        return result
+    
+    # =========================================================================
+    # ========== Layers =======================================================
+    # =========================================================================
+    def commit_layer(self, layer_name):
+        """
+        Commits the layer `layer_name` of the symbol table to this encoder: its
+        variables get encoded. The lookup tables of the encoder are dropped.
+        
+        :param layer_name: the name of the layer to commit
+        """
+        _casted = _be.BeEnc_ptr_to_BaseEnc_ptr(self._ptr)
+        _base.BaseEnc_commit_layer(_casted, layer_name)
+        self._clear_all_caches()
+    
+    def remove_layer(self, layer_name):
+        """
+        Removes the (previously committed) layer `layer_name` from this encoder.
+        The lookup tables of the encoder are dropped.
+        
+        :param layer_name: the name of the layer to remove
+        """
+        _casted = _be.BeEnc_ptr_to_BaseEnc_ptr(self._ptr)
+        _base.BaseEnc_remove_layer(_casted, layer_name)
+        self._clear_all_caches()
+    
+    # =========================================================================
+    # ========== Lookup caches ================================================
+    # =========================================================================
+    def clear_caches(self):
+        """
+        Drops all the lookup tables lazily built by this encoder (name -> 
+        untimed variable, timed variable indices, sat model decoding tables).
+        
+        The tables of all the encoders wrapping the same NuSMV encoder are 
+        dropped when a layer is committed or removed with :meth:`commit_layer`
+        or :meth:`remove_layer`. This method only needs to be called when the
+        layers of the encoder are changed by other means (directly in NuSMV).
+        """
+        self._by_name         = None  # name -> untimed BeVar
+        self._untimed_lists   = {}    # var type -> tuple of untimed BeVar
+        self._untimed         = {}    # index -> untimed index
+        self._timed           = {}    # (untimed index, time) -> timed index
+        # tables used to decode the sat models (see decode_sat_model)
+        self._decoding_time   = None  # max_time when the table was built
+        self._decoding_table  = None  # pair (times, untimed) of int32 arrays
+        self._decoding_vars   = {}    # untimed index -> (scalar, node, bit)
+        self._decoded_values  = {}    # (scalar, bits values) -> value node
+    
+    def _clear_all_caches(self):
+        """
+        Drops the lookup tables of all the live encoders wrapping the same 
+        NuSMV encoder as this one.
+        """
+        for enc in list(BeEnc._instances.values()):
+            if enc._ptr == self._ptr:
+                enc.clear_caches()
+    
+    def _var(self, index):
+        """:return: the (cached) BeVar denoting the variable at `index`"""
+        var = self._vars.get(index)
+        if var is None:
+            var = self._vars[index] = BeVar(self, index)
+        return var
+    
+    def _untimed_vars(self, var_type):
+        """
+        :return: the (cached) tuple of the untimed variables of the given
+          `var_type` in the order of the encoder
+        """
+        result = self._untimed_lists.get(var_type)
+        if result is None:
+            result = []
+            idx    = _be.BeEnc_get_first_untimed_var_index(self._ptr, var_type)
+            while _be.BeEnc_is_var_index_valid(self._ptr, idx):
+                result.append(self._var(idx))
+                idx = _be.BeEnc_get_next_var_index(self._ptr, idx, var_type)
+            result = self._untimed_lists[var_type] = tuple(result)
+        return result
+    
+    def _untimed_index(self, index):
+        """
+        :return: the (cached) index of the untimed variable corresponding to 
+          the variable at `index`
+        """
+        result = self._untimed.get(index)
+        if result is None:
+            if _be.BeEnc_is_index_untimed(self._ptr, index):
+                result = index
+            else:
+                result = _be.BeEnc_index_to_untimed_index(self._ptr, index)
+            self._untimed[index] = result
+        return result
+    
+    def _timed_index(self, untimed_index, time):
+        """
+        :return: the (cached) index of the untimed variable at `untimed_index` 
+          shifted at `time` (this extends the max time of the encoder when 
+          needed)
+        """
+        key    = (untimed_index, time)
+        result = self._timed.get(key)
+        if result is None:
+            var    = _be.BeEnc_index_to_timed(self._ptr, untimed_index, time)
+            result = self._timed[key] = _be.BeEnc_var_to_index(self._ptr, var)
+        return result
     
     # =========================================================================
     # ========== Magic methods ======================================================
@@ -1016,7 +1168,7 @@ class BeEnc(PointerWrapper):
         result+= "| Be index | Cnf index |  Time | Model variable |\n"
         result+= "+----------+-----------+-------+----------------+\n"
         for v in self.untimed_variables:
-            timed = v.at_time[t]
+            timed = self._var(self._timed_index(v.index, t))
             result +="| {:8d} | {:9d} | {:5d} | {:14s} |\n".format(
                                             timed.index, 
                                             timed.cnf_literal, 
@@ -6,19 +6,52 @@ In particular it contains:
 
 + :class:`Be`
 + :class:`BeCnf`
++ :class:`CnfEncoding` and :class:`CnfStats`
 + other utility functions
 """
-from pynusmv.sat import Polarity
+from pynusmv.sat import Polarity, int32_zeros
 from pynusmv_lower_interface.nusmv.utils.utils import _utils
-__all__ = ['Be', 'BeCnf']
+__all__ = ['Be', 'BeCnf', 'CnfEncoding', 'CnfStats']
 
+from collections         import namedtuple
+from enum                import IntEnum
 from pynusmv.collections import Slist, IntConversion, Conversion
 
 import pynusmv_lower_interface.nusmv.be.be as _be
+import pynusmv_lower_interface.bmc_utils.bmc_utils as _bmc_utils
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # ==============================================================================
 # ===== Useful classes =========================================================
 # ==============================================================================
+class CnfEncoding(IntEnum):
+    """
+    The encodings which can be used to convert a :class:`Be` to CNF (see
+    :meth:`Be.to_cnf`).
+
+        - NUSMV uses the conversion of NuSMV itself (the algorithm is selected
+          by the `rbc_rbc2cnf_algorithm` option);
+        - TSEITIN defines every connective with the clauses of both polarities;
+        - PLAISTED_GREENBAUM only emits the clauses of the polarities in which
+          each connective is actually used;
+        - COMPACT is PLAISTED_GREENBAUM where the conjunctions which are used
+          only once are merged into their father (and hence get no variable).
+    """
+    NUSMV              = 0
+    TSEITIN            = 1
+    PLAISTED_GREENBAUM = 2
+    COMPACT            = 3
+
+CnfStats = namedtuple('CnfStats', ('clauses', 'variables', 'literals'))
+CnfStats.__doc__ = """
+The size of a :class:`BeCnf`: the number of `clauses`, the number of distinct
+`variables` occurring in these clauses and the total number of `literals`.
+"""
+
 class Be:
     """
     This is the interface of the boolean expression type.
@@ -227,6 +260,74 @@ class Be:
         """
         return Be(_be.Be_apply_inlining(self._manager._ptr, self._ptr, add_conj), self._manager)
 
+    # ==============================================================================
+    # ===== DAG metrics ============================================================
+    # ==============================================================================
+    @property
+    def size(self) -> 'int':
+        """
+        :return: the number of distinct connectives (AND, IFF, ITE nodes) in the
+            reduced boolean circuit of this expression. Shared sub expressions
+            are only counted once.
+        """
+        return _bmc_utils.be_size(self._manager._ptr, self._ptr)
+
+    @property
+    def depth(self) -> 'int':
+        """
+        :return: the number of connectives on the longest path from the root of
+            this expression to one of its leaves (variables and constants have
+            a depth of 0).
+        """
+        return _bmc_utils.be_depth(self._manager._ptr, self._ptr)
+
+    @property
+    def num_vars(self) -> 'int':
+        """
+        :return: the number of distinct variables occurring in this expression
+        """
+        return _bmc_utils.be_num_vars(self._manager._ptr, self._ptr)
+
+    def cone_of_influence(self, seed) -> 'Be':
+        """
+        Restricts this expression to the cone of influence of `seed`: the top
+        level conjuncts of this expression are grouped according to the
+        variables they share and only the groups sharing some variable with
+        `seed` are kept.
+
+        .. note::
+
+            The restriction preserves the satisfiability of `self & seed`
+            as long as the dropped conjuncts are satisfiable on their own. This
+            is typically the case of the unrolling of a total transition
+            relation, for instance::
+
+                problem = property & model.path(k).cone_of_influence(property)
+
+        :param seed: the expression whose variables define the cone
+        :return: the conjunction of the top level conjuncts of `self` which
+            are in the cone of influence of `seed`
+        """
+        return Be(_bmc_utils.be_cone_of_influence(self._manager._ptr, self._ptr,
+                                                  seed._ptr),
+                  self._manager)
+
+    def rewrite(self) -> 'Be':
+        """
+        Simplifies this expression with AIG-style local rewriting: the chains
+        of conjunctions which are not shared are flattened, cleared from their
+        duplicate and constant conjuncts, folded to False when they contain
+        both a literal and its negation and rebuilt as balanced trees.
+
+        The rewritten expression is equivalent to this one. The number of
+        nodes folded and conjuncts merged by the rewriting is reported by
+        :meth:`pynusmv.be.manager.BeManager.stats`.
+
+        :return: a simplified expression equivalent to `self`
+        """
+        return Be(_bmc_utils.be_rewrite(self._manager._ptr, self._ptr),
+                  self._manager)
+
     # ==============================================================================
     # ===== pythonic equivalent of the above =======================================
     # ==============================================================================
@@ -325,7 +426,8 @@ class Be:
     #     return _be.Be_Manager_Be2Spec(self._manager._ptr, self._ptr)
     ################################################################################
 
-    def to_cnf(self, polarity=Polarity.POSITIVE):
+    def to_cnf(self, polarity=Polarity.POSITIVE, rewrite=False,
+               encoding=CnfEncoding.NUSMV, cone_of_influence=None):
         """
         Converts this boolean expression to a corresponding CNF
 
@@ -345,9 +447,27 @@ class Be:
         
         :param polarity: the polarity of the expression
         :type  polarity: integer
+        :param rewrite: when this flag is on, the expression is simplified with
+            :meth:`rewrite` before it is converted.
+        :param encoding: the :class:`CnfEncoding` used to perform the
+            conversion. The size of the resulting CNF is reported by
+            :attr:`BeCnf.stats`.
+        :param cone_of_influence: when it is not None, the expression is
+            restricted to the cone of influence of this Be (see
+            :meth:`cone_of_influence`) before it is converted.
         :return: a CNF equivalent of this boolean expression
         """
-        return BeCnf(_be.Be_ConvertToCnf(self._manager._ptr, self._ptr, polarity), self._manager)
+        be = self
+        if cone_of_influence is not None:
+            be = be.cone_of_influence(cone_of_influence)
+        if rewrite:
+            be = be.rewrite()
+        if encoding == CnfEncoding.NUSMV:
+            ptr = _be.Be_ConvertToCnf(self._manager._ptr, be._ptr, polarity)
+        else:
+            ptr = _bmc_utils.be_convert_to_cnf(self._manager._ptr, be._ptr,
+                                               polarity, encoding)
+        return BeCnf(ptr, self._manager)
 
    
 class BeCnf:
@@ -456,6 +576,50 @@ class BeCnf:
         """
         _be.Be_Cnf_SetFormulaLiteral(self._ptr, literal)
 
+    @property
+    def stats(self):
+        """
+        :return: a :class:`CnfStats` describing the size of this CNF
+        """
+        return CnfStats(self.clauses_number,
+                        _bmc_utils.cnf_variables_count(self._ptr),
+                        _bmc_utils.cnf_literals_count(self._ptr))
+
+    def to_arrays(self):
+        """
+        Exports all the clauses of this CNF at once in two flat NumPy arrays of
+        int32 (this is much faster than iterating over :attr:`clauses_list`):
+        
+            - `literals` holds the literals of all the clauses one after the
+              other;
+            - `offsets` holds the position of the first literal of each clause
+              in `literals`, followed by the total number of literals.
+        
+        Hence, the ith clause is `literals[offsets[i]:offsets[i+1]]`. These 
+        arrays can be fed back to a solver with 
+        :meth:`pynusmv.sat.SatSolver.add_clauses`.
+        
+        :return: a pair (literals, offsets) of NumPy int32 arrays
+        :raise ImportError: when NumPy is not installed
+        """
+        if numpy is None:
+            raise ImportError("NumPy is required to export a CNF to arrays")
+        return self._flatten(lambda n: numpy.empty(n, dtype=numpy.int32))
+    
+    def _flatten(self, allocate):
+        """
+        Exports the clauses of this CNF to the flat buffers of int32 created by
+        the `allocate` function (see :meth:`to_arrays`).
+        
+        :param allocate: a function returning a writable buffer of n int32
+        :return: a pair (literals, offsets) of buffers
+        """
+        literals = allocate(_bmc_utils.cnf_literals_count(self._ptr))
+        offsets  = allocate(self.clauses_number + 1)
+        if _bmc_utils.cnf_to_arrays(self._ptr, literals, offsets) != 0:
+            raise ValueError("The CNF changed while it was being exported")
+        return (literals, offsets)
+    
     # ==========================================================================
     # ===== CNF operations =====================================================
     # ==========================================================================
@@ -493,7 +657,9 @@ class BeCnf:
             lits = [ "X"+str(x) if x >= 0 else "!X"+str(-1*x) for x in clause if abs(x) != f_lit]
             return "("+ " | ".join(lits) +")"
         
-        conj = " & ".join(list(map(clause2str, list(self.clauses_list))))
+        literals, offsets = self._flatten(int32_zeros)
+        clauses = (literals[offsets[i]:offsets[i+1]] for i in range(len(offsets)-1))
+        conj = " & ".join(map(clause2str, clauses))
         return "formula literal = X{} <-> {}".format(f_lit, conj)
     
 class ArrayOfClauses(Conversion):
@@ -6,16 +6,44 @@ In particular it contains:
 
 * :class:`BeManager` which is the abstract interface of a manager
 * :class:`BeRbcManager` which is the sole implementation of the BE manager
+* :class:`BeManagerStats` which describes the usage of a manager
 """
 
-__all__ = ['BeManager', 'BeRbcManager']
+__all__ = ['BeManager', 'BeRbcManager', 'BeManagerStats']
+
+from collections            import namedtuple
 
 from pynusmv_lower_interface.nusmv.be       import be as _be
+from pynusmv_lower_interface.bmc_utils      import bmc_utils as _bmc_utils
 from pynusmv.utils          import PointerWrapper
 from pynusmv.collections    import Slist, IntConversion
 from pynusmv.be.expression  import Be
 
 
+BeManagerStats = namedtuple('BeManagerStats', ('nodes', 'load', 'created',
+                                               'collected', 'variables',
+                                               'folds', 'merges'))
+BeManagerStats.__doc__ = """
+A :class:`BeManagerStats` is a snapshot of the usage of a :class:`BeManager`:
+
+    - `nodes` is the number of nodes currently stored in the DAG of the manager;
+    - `load` is the load factor (nodes per bin) of the hash table indexing
+      these nodes;
+    - `created` and `collected` are the number of nodes ever created and
+      garbage collected in the DAG;
+    - `variables` is the number of variables created in the manager;
+    - `folds` is the number of nodes folded into a constant by
+      :meth:`pynusmv.be.expression.Be.rewrite` in this manager;
+    - `merges` is the number of duplicate conjuncts removed by
+      :meth:`pynusmv.be.expression.Be.rewrite` in this manager.
+
+.. note::
+
+    The constant folding performed by NuSMV itself when a node is built is
+    not instrumented: `folds` and `merges` only account for the rewriting.
+"""
+
+
 class BeManager(PointerWrapper):
     """
     The manager is the data structure that serves to physically store the 
@@ -212,6 +240,21 @@ class BeManager(PointerWrapper):
         
         return self.be_literal_to_index(self.cnf_literal_to_be_literal(literal))
 
+    def stats(self):
+        """
+        :return: a :class:`BeManagerStats` describing the current usage of this
+            manager.
+        """
+        nodes = _bmc_utils.be_manager_get_nodes(self._ptr)
+        bins  = _bmc_utils.be_manager_get_bins(self._ptr)
+        return BeManagerStats(nodes,
+                              nodes / bins if bins else 0.0,
+                              _bmc_utils.be_manager_get_created(self._ptr),
+                              _bmc_utils.be_manager_get_collected(self._ptr),
+                              _bmc_utils.be_manager_get_vars(self._ptr),
+                              _bmc_utils.be_rewrite_get_folds(self._ptr),
+                              _bmc_utils.be_rewrite_get_merges(self._ptr))
+
     def dump_davinci(self, be, file):
         """
         Dumps the BE to the given `file` in davinci format
@@ -302,6 +345,7 @@ class BeRbcManager(BeManager):
         See ``pynusmv.utils.PointerWrapper`` for more info about this api
         """
         if self._freeit and self._ptr is not None:
+            _bmc_utils.be_rewrite_forget_stats(self._ptr)
             _be.Be_RbcManager_Delete(self._ptr)
             self._freeit = False
             self._ptr = None
@@ -13,6 +13,14 @@ following modules:
 - :mod:`invarspec <pynusmv.bmc.invarspec>` which provides a set of features 
   relative to *temporal induction* using sat solvers which is a technique 
   conceptually close to BMC. (For the full details, check [ES03]_ ).
+- :mod:`ic3 <pynusmv.bmc.ic3>` which implements the verification of invariants
+  by property directed reachability (IC3).
+- :mod:`interpolation <pynusmv.bmc.interpolation>` which implements the
+  verification of invariants by interpolation (McMillan's method).
+- :mod:`portfolio <pynusmv.bmc.portfolio>` which dispatches independent BMC 
+  problems (bounds or loop positions) to a pool of worker processes.
+- :mod:`dimacs <pynusmv.bmc.dimacs>` which gathers the helpers shared by the
+  writers of problems in the DIMACS format.
 
 
 References
@@ -35,10 +43,16 @@ __all__ = [
     'glob', 
     'utils',
     'ltlspec',
-    'invarspec'
+    'invarspec',
+    'ic3',
+    'interpolation',
+    'portfolio'
 ]
 
 from . import glob
 from . import utils
 from . import ltlspec
 from . import invarspec
+from . import ic3
+from . import interpolation
+from . import portfolio
@@ -0,0 +1,22 @@
+"""
+The :mod:`pynusmv.bmc.dimacs` module contains the helpers shared by the
+writers of problems in the DIMACS format: the problem dumpers of
+:mod:`pynusmv.bmc.utils` and the external solver bridge of :mod:`pynusmv.sat`.
+"""
+
+__all__ = ['CONSTANT_LITERAL', 'CHUNK_SIZE', 'format_clauses']
+
+# The formula literal of a CNF whose original problem is a constant
+# (limits.h / INT_MAX)
+CONSTANT_LITERAL = 2**31 - 1
+
+# The number of clauses formatted at once when a problem is written in DIMACS
+CHUNK_SIZE = 65536
+
+def format_clauses(literals, offsets, start, stop):
+    """
+    :return: the DIMACS text of the clauses `start` to `stop` (excluded) of the
+        flat clauses buffers `literals` and `offsets`
+    """
+    return "".join(" ".join(map(str, literals[offsets[i]:offsets[i+1]]))+" 0\n"
+                   for i in range(start, stop))
@@ -103,6 +103,7 @@ def bmc_exit():
     __be_fsm = None
     
     _lower.MEMOIZER_clear()
+    _lower.be_rewrite_reset_stats()
 
 def build_master_be_fsm():
     """
@@ -123,12 +124,12 @@ def build_master_be_fsm():
     if _symb_table.SymbTable_get_layer(sym_table._ptr, "inlining") is not None:
         # commits the determ layer if not previously committed
         if not _baseenc.BaseEnc_layer_occurs(be_enc._ptr, "determ"):
-            _baseenc.BaseEnc_commit_layer(be_enc._ptr, "determ")
+            be_enc.commit_layer("determ")
             
         # commits the inlining layer if not previously committed
         # note: I find this a little bit weird, but that's the way NuSMV proceeds
         if not _baseenc.BaseEnc_layer_occurs(be_enc._ptr, "inlining"):
-            _baseenc.BaseEnc_commit_layer(be_enc._ptr, "inlining")
+            be_enc.commit_layer("inlining")
     
     # actual fsm creation
     __be_fsm = BeFsm.create_from_sexp(be_enc, glob.master_bool_sexp_fsm())
@@ -196,4 +197,103 @@ class BmcSupport:
     
     def __exit__(self, typ, value, traceback):
         """Magic method for the de-initialisation"""
-        bmc_exit()
\ No newline at end of file
+        bmc_exit()
+
+class ScratchManager:
+    """
+    This class implements a context manager (an object that can be used with a
+    'with' statement) delimiting a scratch region of the boolean expressions
+    manager used by the bmc sub system.
+
+    NuSMV never reclaims the nodes of its boolean expressions: when the
+    problems of many properties are generated one after the other, the memory
+    used by the manager only grows. All the expressions created while a scratch
+    region is active are reclaimed when it is left, except the ones which are
+    explicitly kept (see :meth:`keep` and :func:`keep`). The expressions which
+    existed before the region was entered are not affected.
+
+    Example::
+
+        with BmcSupport():
+            model = BmcModel()
+            for prop in prop_database():
+                with scratch_manager():
+                    # generate, solve the problem of prop and decode its trace
+
+    .. warning::
+
+        The expressions (:class:`pynusmv.be.expression.Be`,
+        :class:`pynusmv.be.expression.BeCnf`) created in the region and not
+        kept must not be used once the region is left. The results which
+        outlive the region (verdicts, traces, ...) must be extracted before
+        that. The LTL memoization cache
+        (see :func:`pynusmv.bmc.ltlspec.memoizer_stats`) is cleared when the
+        region is left.
+    """
+    # the regions which are currently entered
+    _active = []
+
+    def __init__(self, capacity=None):
+        """
+        Creates a new scratch region.
+
+        :param capacity: when it is not None, the manager is made able to
+            handle at least that many variables when the region is entered
+            (see :meth:`pynusmv.be.manager.BeRbcManager.reserve`).
+        """
+        self._capacity = capacity
+        self._scratch  = None
+        self.collected = 0
+
+    @property
+    def active(self):
+        """:return: True iff the region is currently entered"""
+        return self._scratch is not None
+
+    def keep(self, be):
+        """
+        Protects `be` from being reclaimed when this region is left.
+
+        :param be: the expression to keep
+        :return: `be`
+        """
+        _lower.be_scratch_keep(self._scratch, be._ptr)
+        return be
+
+    def __enter__(self):
+        """Magic method for the initialisation"""
+        encoding = master_be_fsm().encoding
+        if self._capacity is not None:
+            encoding.manager.reserve(self._capacity)
+        self._scratch = _lower.be_scratch_open(encoding._ptr)
+        ScratchManager._active.append(self)
+        return self
+
+    def __exit__(self, typ, value, traceback):
+        """Magic method for the de-initialisation"""
+        ScratchManager._active.remove(self)
+        _lower.MEMOIZER_clear()
+        self.collected = _lower.be_scratch_close(self._scratch)
+        self._scratch  = None
+
+def scratch_manager(capacity=None):
+    """
+    :param capacity: the minimum number of variables the manager must be able
+        to handle in the region (None leaves the capacity unchanged).
+    :return: a new :class:`ScratchManager` to be used in a 'with' statement.
+    """
+    return ScratchManager(capacity)
+
+def keep(be):
+    """
+    Protects `be` from being reclaimed when the active scratch regions (see
+    :class:`ScratchManager`) are left. This is typically used by the caches of
+    expressions which are shared between the problems of several properties.
+    Nothing happens when no scratch region is active.
+
+    :param be: the expression to keep
+    :return: `be`
+    """
+    for scratch in ScratchManager._active:
+        scratch.keep(be)
+    return be
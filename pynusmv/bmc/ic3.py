@@ -0,0 +1,425 @@
+"""
+The :mod:`pynusmv.bmc.ic3` module implements the verification of invariant
+properties (INVARSPEC) by property directed reachability, also known as IC3
+(see [Bra11]_ and [EMB11]_ for the full details).
+
+Unlike BMC, IC3 never unrolls the transition relation more than once. Instead,
+it maintains a sequence of frames :math:`F_0 = I, F_1, \\dots, F_k` where each
+frame over approximates the states reachable in at most i steps. The frames are
+refined by blocking the cubes (partial states) which can reach a violation of
+the property. The algorithm stops when two consecutive frames become equal
+(the frame is then an inductive invariant which proves the property) or when a
+chain of cubes leads back to an initial state (a counter example was found).
+
+This module provides:
+
+    - :class:`Ic3Checker` which implements the algorithm with one incremental
+      sat solver per frame;
+    - :class:`Ic3Verdict`, :class:`Ic3Result` and :class:`FrameStats` which
+      describe the outcome of a verification;
+    - :func:`check_invar_ic3` which is a shortcut to verify one property.
+
+.. [Bra11] Aaron R. Bradley.
+    "SAT-based model checking without unrolling."
+    In Verification, Model Checking, and Abstract Interpretation, volume 6538
+    of LNCS. Springer, 2011.
+
+.. [EMB11] Niklas Een, Alan Mishchenko and Robert Brayton.
+    "Efficient implementation of property directed reachability."
+    In Formal Methods in Computer-Aided Design. 2011.
+"""
+
+__all__ = ['Ic3Verdict', 'Ic3Result', 'FrameStats', 'Ic3Checker',
+           'check_invar_ic3']
+
+import heapq
+
+from collections           import namedtuple
+from enum                  import IntEnum
+
+from pynusmv_lower_interface.nusmv.enc.bdd import bdd as _bddenc
+
+from pynusmv               import glob
+from pynusmv.dd            import BDD
+from pynusmv.wff           import Wff
+from pynusmv.sat           import SatSolverFactory, SatSolverResult, Polarity
+from pynusmv.be.expression import Be
+from pynusmv.exception     import NuSmvSatSolverError
+from pynusmv.bmc           import utils
+from pynusmv.bmc           import glob as bmcglob
+
+
+class Ic3Verdict(IntEnum):
+    """
+    The possible outcomes of a verification performed with an
+    :class:`Ic3Checker`
+    """
+    PROVED   = 0
+    VIOLATED = 1
+    UNKNOWN  = 2
+
+Ic3Result = namedtuple('Ic3Result', ('verdict', 'frames', 'trace'))
+"""
+An :class:`Ic3Result` is the outcome of :meth:`Ic3Checker.check`:
+
+    - `verdict` is an :class:`Ic3Verdict`;
+    - `frames` is the number of frames that were opened (when the property is
+      violated, the counter example is at most that long);
+    - `trace` is the counter example (:class:`pynusmv.trace.Trace`) when the
+      property is violated and `None` otherwise.
+"""
+
+FrameStats = namedtuple('FrameStats', ('level', 'lemmas', 'sat_calls'))
+"""
+A :class:`FrameStats` describes one frame of an :class:`Ic3Checker`: its
+`level`, the number of `lemmas` (blocked cubes) which hold exactly up to this
+frame and the number of `sat_calls` answered by the solver of the frame.
+"""
+
+
+class Ic3Checker:
+    """
+    An :class:`Ic3Checker` verifies one invariant property of a BeFsm by
+    property directed reachability.
+
+    Each frame :math:`F_i` is backed by one incremental sat solver holding the
+    transition relation (from time 0 to time 1), the invariants of the model
+    and the lemmas of all the frames :math:`F_j` with :math:`j \\geq i` (the
+    lemmas are stored in a delta encoded fashion). The queries of the algorithm
+    only live in a temporary group of these solvers.
+
+    Once the property is proved, the inductive invariant which certifies the
+    proof can be exported either as a :class:`pynusmv.be.expression.Be` (see
+    :meth:`invariant`) or as a BDD (see :meth:`invariant_bdd`).
+    """
+
+    def __init__(self, prop_node, fsm=None, solver_name='MiniSat'):
+        """
+        Creates a new checker for the invariant `prop_node`.
+
+        :param prop_node: the invariant to verify represented in a 'node'
+            format (subclass of :class:`pynusmv.node.Node`), for instance the
+            `expr` of an INVARSPEC property.
+        :param fsm: the BeFsm against which the property is verified. When it
+            is None, the global master be fsm is used.
+        :param solver_name: the name of the incremental sat solver to use.
+        """
+        self._fsm    = fsm if fsm is not None else bmcglob.master_be_fsm()
+        self._enc    = self._fsm.encoding
+        self._mgr    = self._enc.manager
+        self._model  = utils.BmcModel(self._fsm)
+        self._solver_name = solver_name
+
+        self._node   = prop_node
+        self._prop   = Wff.decorate(prop_node).to_boolean_wff().to_be(self._enc)
+        self._vars   = {v.index: v for v in self._enc.curr_variables
+                                           + self._enc.frozen_variables}
+
+        self._init   = self._new_solver()
+        self._assert(self._init, self._model.init[0])
+
+        # frames[i] holds the cubes blocked exactly up to F_i (F_0 = I)
+        self._frames   = [set()]
+        self._solvers  = [self._frame_solver(0)]
+        self._calls    = [0]
+        self._result   = None
+        self._invariant= None
+        self._last_model = set()
+
+    ###########################################################################
+    # Public API
+    ###########################################################################
+    @property
+    def stats(self):
+        """:return: the list of the :class:`FrameStats` of all the frames"""
+        return [FrameStats(i, len(self._frames[i]), self._calls[i])
+                for i in range(len(self._frames))]
+
+    def check(self, max_frames=None):
+        """
+        Verifies the property, opening at most `max_frames` frames.
+
+        :param max_frames: the maximum number of frames to open (None means
+            that the algorithm runs until it reaches a verdict).
+        :return: an :class:`Ic3Result`
+        :raises ValueError: when `max_frames` is negative
+        :raises NuSmvSatSolverError: when a solver fails with an internal error
+        """
+        if max_frames is not None and max_frames < 0:
+            raise ValueError("The number of frames may not be negative")
+
+        if self._result is None and len(self._frames) == 1:
+            if self._intersects_init(self._at(~self._prop, 0)):
+                self._result = self._violation(0)
+
+        while self._result is None:
+            k = len(self._frames) - 1
+            if max_frames is not None and k >= max_frames:
+                return Ic3Result(Ic3Verdict.UNKNOWN, k, None)
+
+            # blocking phase: exclude the states of F_k with a bad successor
+            while self._result is None:
+                bad = self._bad_state(k)
+                if bad is None:
+                    break
+                depth = self._block(bad, k)
+                if depth is not None:
+                    self._result = self._violation(depth)
+
+            if self._result is None:
+                self._open_frame()
+                self._propagate()
+
+        return self._result
+
+    def invariant(self):
+        """
+        :return: an (untimed) Be representing the inductive invariant which
+            certifies that the property holds or None when the property was not
+            proved (yet).
+        """
+        if self._invariant is None:
+            return None
+        level = self._invariant
+        invar = self._prop
+        for frame in self._frames[level:]:
+            for cube in frame:
+                invar = invar & ~self._cube_be(cube)
+        return invar
+
+    def invariant_bdd(self, bdd_fsm=None):
+        """
+        :param bdd_fsm: the BDD fsm whose encoding is used to build the BDD.
+            When it is None, the master BDD fsm is used.
+        :return: the BDD (:class:`pynusmv.dd.BDD`) of the inductive invariant
+            which certifies that the property holds or None when the property
+            was not proved (yet).
+        """
+        if self._invariant is None:
+            return None
+        if bdd_fsm is None:
+            bdd_fsm = glob.prop_database().master.bddFsm
+        enc   = bdd_fsm.bddEnc
+        invar = BDD(_bddenc.BddEnc_expr_to_bdd(enc._ptr, self._node._ptr, None),
+                    enc.DDmanager)
+        for frame in self._frames[self._invariant:]:
+            for cube in frame:
+                clause = BDD.false(enc.DDmanager)
+                for index, value in cube:
+                    name = self._vars[index].name
+                    lit  = BDD(_bddenc.BddEnc_expr_to_bdd(enc._ptr, name._ptr, None),
+                               enc.DDmanager)
+                    clause = clause | (~lit if value else lit)
+                invar = invar & clause
+        return invar
+
+    ###########################################################################
+    # Algorithm
+    ###########################################################################
+    def _bad_state(self, k):
+        """:return: a state of F_k having a successor violating the property"""
+        bad = self._at(~self._prop, 1)
+        if self._query(k, bad) == SatSolverResult.UNSATISFIABLE:
+            return None
+        return self._extract_cube()
+
+    def _block(self, cube, k):
+        """
+        Blocks `cube` (which can reach a violation of the property in one step)
+        at level k and recursively blocks its predecessors.
+
+        :return: None if the cube could be blocked and the length of the
+            counter example otherwise.
+        """
+        queue = [(k, 1, 0, cube)]
+        order = 1
+        while queue:
+            level, depth, _, cube = heapq.heappop(queue)
+            if level == 0 or self._intersects_init(self._cube_at(cube, 0)):
+                return depth
+
+            if self._is_blocked(cube, level):
+                continue
+
+            if self._relative_induction(cube, level):
+                self._add_lemma(self._generalize(cube, level), level)
+                if level < k:
+                    heapq.heappush(queue, (level+1, depth, order, cube))
+                    order += 1
+            else:
+                pred = self._extract_cube()
+                heapq.heappush(queue, (level-1, depth+1, order, pred))
+                heapq.heappush(queue, (level, depth, order+1, cube))
+                order += 2
+        return None
+
+    def _is_blocked(self, cube, level):
+        """:return: True iff `cube` is already excluded from the frame `level`"""
+        return self._query(level, self._cube_at(cube, 0)) == \
+                                                   SatSolverResult.UNSATISFIABLE
+
+    def _relative_induction(self, cube, level):
+        """
+        :return: True iff `cube` is inductive relative to the frame `level-1`
+            (that is to say: :math:`F_{level-1} \\wedge \\neg c \\wedge T \\wedge c'`
+            is unsatisfiable).
+        """
+        be = ~self._cube_at(cube, 0) & self._cube_at(cube, 1)
+        return self._query(level-1, be) == SatSolverResult.UNSATISFIABLE
+
+    def _generalize(self, cube, level):
+        """
+        Drops as many literals of `cube` as possible while keeping it disjoint
+        from the initial states and inductive relative to frame `level-1`.
+        """
+        cube = tuple(cube)
+        for literal in list(cube):
+            if len(cube) == 1:
+                break
+            candidate = tuple(l for l in cube if l != literal)
+            if self._intersects_init(self._cube_at(candidate, 0)):
+                continue
+            if self._relative_induction(candidate, level):
+                cube = candidate
+        return frozenset(cube)
+
+    def _add_lemma(self, cube, level):
+        """Adds the clause forbidding `cube` to the frames 1 to `level`"""
+        self._frames[level].add(cube)
+        clause = ~self._cube_at(cube, 0)
+        for i in range(1, level+1):
+            self._assert(self._solvers[i], clause)
+
+    def _open_frame(self):
+        """Opens a new frame at the top of the sequence"""
+        level = len(self._frames)
+        self._frames.append(set())
+        self._calls.append(0)
+        self._solvers.append(self._frame_solver(level))
+
+    def _propagate(self):
+        """
+        Pushes the lemmas forward as long as possible. When a frame becomes
+        empty, the next frame is an inductive invariant and the property holds.
+        """
+        top = len(self._frames) - 1
+        for level in range(1, top):
+            for cube in list(self._frames[level]):
+                be = self._cube_at(cube, 1)
+                if self._query(level, be) == SatSolverResult.UNSATISFIABLE:
+                    self._frames[level].discard(cube)
+                    self._frames[level+1].add(cube)
+                    self._assert(self._solvers[level+1], ~self._cube_at(cube, 0))
+            if not self._frames[level]:
+                self._invariant = level+1
+                self._result    = Ic3Result(Ic3Verdict.PROVED, top, None)
+                return
+
+    def _violation(self, depth):
+        """
+        Builds the result describing a violation of the property after `depth`
+        steps. The trace is obtained by solving the corresponding BMC problem.
+        """
+        problem = self._model.path(depth) & self._at(~self._prop, depth)
+        cnf     = problem.to_cnf(Polarity.POSITIVE)
+        solver  = SatSolverFactory.create(self._solver_name, incremental=False,
+                                          proof=False)
+        solver += cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        if solver.solve() != SatSolverResult.SATISFIABLE:
+            raise NuSmvSatSolverError("Could not reconstruct the counter example")
+        trace = utils.generate_counter_example(self._fsm, problem, solver, depth,
+                                               "IC3 counter example")
+        return Ic3Result(Ic3Verdict.VIOLATED, len(self._frames), trace)
+
+    ###########################################################################
+    # Solvers management
+    ###########################################################################
+    def _new_solver(self):
+        """:return: a new incremental solver"""
+        return SatSolverFactory.create(self._solver_name, incremental=True,
+                                       proof=False)
+
+    def _frame_solver(self, level):
+        """:return: a new solver for the frame `level`"""
+        solver = self._new_solver()
+        if level == 0:
+            self._assert(solver, self._model.init[0])
+        else:
+            self._assert(solver, self._model.invar[0] & self._at(self._prop, 0))
+        self._assert(solver, self._model.trans[0] & self._model.invar[1])
+        return solver
+
+    def _at(self, be, time):
+        """:return: the untimed `be` shifted at `time`"""
+        return self._enc.shift_to_time(be, time)
+
+    def _assert(self, solver, be):
+        """Adds `be` to the permanent group of `solver`"""
+        cnf    = be.to_cnf(Polarity.POSITIVE)
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+
+    def _query(self, level, be):
+        """Solves the frame `level` together with the temporary formula `be`"""
+        self._calls[level] += 1
+        return self._solve(self._solvers[level], be)
+
+    def _intersects_init(self, be):
+        """:return: True iff `be` (at time 0) contains an initial state"""
+        return self._solve(self._init, be) == SatSolverResult.SATISFIABLE
+
+    def _solve(self, solver, be):
+        """Solves `solver` with the formula `be` added in a temporary group"""
+        cnf   = be.to_cnf(Polarity.POSITIVE)
+        group = solver.create_group()
+        solver.add_to_group(cnf, group)
+        solver.polarity(cnf, Polarity.POSITIVE, group)
+        status = solver.solve_groups([group])
+        if status == SatSolverResult.INTERNAL_ERROR:
+            raise NuSmvSatSolverError("The sat solver failed with an internal error")
+        if status == SatSolverResult.SATISFIABLE:
+            self._last_model = set(solver.model)
+        solver.destroy_group(group)
+        return status
+
+    ###########################################################################
+    # Cubes
+    ###########################################################################
+    def _extract_cube(self):
+        """
+        :return: the (full) cube of the state at time 0 in the last model found
+        """
+        model = self._last_model
+        return frozenset((index, var.at_time[0].cnf_literal in model)
+                         for index, var in self._vars.items())
+
+    def _cube_be(self, cube):
+        """:return: the untimed Be corresponding to `cube`"""
+        be = Be.true(self._mgr)
+        for index, value in sorted(cube):
+            literal = self._vars[index].boolean_expression
+            be = be & (literal if value else ~literal)
+        return be
+
+    def _cube_at(self, cube, time):
+        """:return: the Be corresponding to `cube` shifted at `time`"""
+        return self._at(self._cube_be(cube), time)
+
+
+def check_invar_ic3(invar_prop, max_frames=None, solver_name='MiniSat'):
+    """
+    Verifies the INVARSPEC property `invar_prop` against the master be fsm
+    using IC3 (see :class:`Ic3Checker`).
+
+    :param invar_prop: the property to be verified. This should be an instance
+        of Prop similar to what you obtain querying PropDb
+        (:func:`pynusmv.glob.prop_database()`)
+    :param max_frames: the maximum number of frames to open (None means that
+        the algorithm runs until it reaches a verdict).
+    :param solver_name: the name of the incremental sat solver to use.
+    :return: an :class:`Ic3Result`
+    :raises ValueError: when `max_frames` is negative
+    :raises NuSmvSatSolverError: when a solver fails with an internal error
+    """
+    return Ic3Checker(invar_prop.expr, solver_name=solver_name).check(max_frames)
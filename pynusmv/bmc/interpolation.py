@@ -0,0 +1,285 @@
+"""
+The :mod:`pynusmv.bmc.interpolation` module implements the verification of
+invariant properties (INVARSPEC) by interpolation (see [McM03]_ for the full
+details).
+
+The idea is to use the proofs of unsatisfiability of bounded model checking
+problems to compute an over approximation of the image of a set of states.
+Let R be a set of states (initially the set of initial states) and k a bound.
+The BMC problem of depth k starting from R is split in two parts:
+
+    - A = R(0) & T(0, 1): the first transition;
+    - B = T(1, k) & (!P(1) | ... | !P(k)): the remainder of the path reaching
+      a violation of the property P.
+
+When A & B is unsatisfiable, the interpolant of A and B only refers to the
+variables at time 1, it contains all the successors of R and none of its
+states can reach a violation in less than k steps. It is thus added to R and
+the process is repeated until R reaches a fixpoint (in which case R is an
+inductive invariant proving the property) or until the problem becomes
+satisfiable. When that happens with R being the initial states, the property
+is violated. Otherwise the over approximation was too coarse and the whole
+process is restarted with a deeper bound.
+
+This module provides:
+
+    - :class:`InterpolationChecker` which implements the algorithm;
+    - :class:`ItpVerdict` and :class:`ItpResult` which describe the outcome of
+      a verification;
+    - :func:`check_invar_itp` which is a shortcut to verify one property.
+
+.. note::
+
+    The computation of the interpolants requires a proof logging MiniSat
+    (see :attr:`pynusmv.sat.SatSolver.supports_interpolation`). A
+    :class:`pynusmv.exception.NuSmvSatSolverError` is raised when it is not
+    available.
+
+.. [McM03] Kenneth L. McMillan.
+    "Interpolation and SAT-based model checking."
+    In Computer Aided Verification, volume 2725 of LNCS. Springer, 2003.
+"""
+
+__all__ = ['ItpVerdict', 'ItpResult', 'InterpolationChecker',
+           'check_invar_itp']
+
+from collections           import namedtuple
+from enum                  import IntEnum
+
+from pynusmv_lower_interface.bmc_utils import bmc_utils as _lower
+
+from pynusmv.wff           import Wff
+from pynusmv.sat           import SatSolverFactory, SatSolverResult, Polarity
+from pynusmv.be.expression import Be, CnfEncoding
+from pynusmv.exception     import NuSmvSatSolverError
+from pynusmv.bmc           import utils
+from pynusmv.bmc           import glob as bmcglob
+
+
+class ItpVerdict(IntEnum):
+    """
+    The possible outcomes of a verification performed with an
+    :class:`InterpolationChecker`
+    """
+    PROVED   = 0
+    VIOLATED = 1
+    UNKNOWN  = 2
+
+ItpResult = namedtuple('ItpResult', ('verdict', 'bound', 'iterations', 'trace'))
+"""
+An :class:`ItpResult` is the outcome of :meth:`InterpolationChecker.check`:
+
+    - `verdict` is an :class:`ItpVerdict`;
+    - `bound` is the depth k of the BMC problems used to compute the over
+      approximated images (when the property is violated, the counter example
+      is at most that long);
+    - `iterations` is the number of images computed with that bound;
+    - `trace` is the counter example (:class:`pynusmv.trace.Trace`) when the
+      property is violated and `None` otherwise.
+"""
+
+
+class InterpolationChecker:
+    """
+    An :class:`InterpolationChecker` verifies one invariant property of a BeFsm
+    by interpolation.
+
+    Every image computation solves one BMC problem of the current bound with a
+    fresh proof logging solver where the first transition (A) and the rest of
+    the path (B) live in two distinct interpolation groups. The over
+    approximation of the reachable states is kept as a Be timed at 0.
+
+    Once the property is proved, the inductive invariant which certifies the
+    proof can be exported as a :class:`pynusmv.be.expression.Be` (see
+    :meth:`invariant`).
+    """
+
+    def __init__(self, prop_node, fsm=None, solver_name='MiniSat'):
+        """
+        Creates a new checker for the invariant `prop_node`.
+
+        :param prop_node: the invariant to verify represented in a 'node'
+            format (subclass of :class:`pynusmv.node.Node`), for instance the
+            `expr` of an INVARSPEC property.
+        :param fsm: the BeFsm against which the property is verified. When it
+            is None, the global master be fsm is used.
+        :param solver_name: the name of the proof logging sat solver to use.
+        """
+        self._fsm    = fsm if fsm is not None else bmcglob.master_be_fsm()
+        self._enc    = self._fsm.encoding
+        self._mgr    = self._enc.manager
+        self._model  = utils.BmcModel(self._fsm)
+        self._solver_name = solver_name
+
+        self._prop   = Wff.decorate(prop_node).to_boolean_wff().to_be(self._enc)
+        self._bound  = 1
+        self._iterations = 0
+        self._result = None
+        self._reached= None
+
+    ###########################################################################
+    # Public API
+    ###########################################################################
+    @property
+    def bound(self):
+        """:return: the depth of the BMC problems currently used"""
+        return self._bound
+
+    def check(self, max_bound=None):
+        """
+        Verifies the property, using BMC problems of depth at most `max_bound`.
+
+        :param max_bound: the maximum depth of the BMC problems (None means
+            that the algorithm runs until it reaches a verdict).
+        :return: an :class:`ItpResult`
+        :raises ValueError: when `max_bound` is negative
+        :raises NuSmvSatSolverError: when a solver fails with an internal error
+            or does not support interpolation
+        """
+        if max_bound is not None and max_bound < 0:
+            raise ValueError("The bound value must be greater or equal to zero")
+
+        if self._result is None:
+            if self._is_sat(self._model.init[0] & self._at(~self._prop, 0)):
+                self._result = self._violation(self._bound)
+
+        while self._result is None:
+            k = self._bound
+            if max_bound is not None and k > max_bound:
+                return ItpResult(ItpVerdict.UNKNOWN, max_bound,
+                                 self._iterations, None)
+
+            reached = self._model.init[0]
+            self._iterations = 0
+            while self._result is None:
+                image = self._image(reached, k)
+                if image is None:
+                    if self._iterations == 0:
+                        self._result = self._violation(k)
+                    else:
+                        self._bound += 1
+                    break
+                self._iterations += 1
+                if not self._is_sat(image & ~reached):
+                    self._reached = reached
+                    self._result  = ItpResult(ItpVerdict.PROVED, k,
+                                              self._iterations, None)
+                else:
+                    reached = reached | image
+
+        return self._result
+
+    def invariant(self):
+        """
+        :return: an (untimed) Be representing the inductive invariant which
+            certifies that the property holds or None when the property was not
+            proved (yet).
+        """
+        if self._reached is None:
+            return None
+        return Be(_lower.shift_timed_expr(self._enc._ptr, self._reached._ptr,
+                                          0, -1),
+                  self._mgr)
+
+    ###########################################################################
+    # Algorithm
+    ###########################################################################
+    def _image(self, reached, k):
+        """
+        Computes an over approximation of the image of `reached` (timed at 0)
+        from which no violation is reachable in less than `k` steps.
+
+        :return: the over approximated image timed at 0 or None when the BMC
+            problem of depth `k` starting from `reached` is satisfiable.
+        """
+        bad = Be.false(self._mgr)
+        for i in range(1, k+1):
+            bad = bad | self._at(~self._prop, i)
+
+        solver = SatSolverFactory.create(self._solver_name, incremental=False,
+                                         proof=True)
+        group_a= solver.new_itp_group()
+        self._assert(solver, reached & self._model.unrolling(0, 1))
+        solver.new_itp_group()
+        self._assert(solver, self._model.unrolling(1, k) & bad)
+
+        status = solver.solve()
+        if status == SatSolverResult.INTERNAL_ERROR:
+            raise NuSmvSatSolverError("The sat solver failed with an internal error")
+        if status == SatSolverResult.SATISFIABLE:
+            return None
+
+        itp = solver.interpolant([group_a], self._mgr)
+        return Be(_lower.shift_timed_expr(self._enc._ptr, itp._ptr, 1, 0),
+                  self._mgr)
+
+    def _violation(self, bound):
+        """
+        Builds the result describing the shortest violation of the property
+        in at most `bound` steps. The trace is obtained by solving the
+        corresponding BMC problem.
+        """
+        for depth in range(bound+1):
+            problem = self._model.path(depth) & self._at(~self._prop, depth)
+            cnf     = problem.to_cnf(Polarity.POSITIVE)
+            solver  = SatSolverFactory.create(self._solver_name,
+                                              incremental=False, proof=False)
+            solver += cnf
+            solver.polarity(cnf, Polarity.POSITIVE)
+            if solver.solve() == SatSolverResult.SATISFIABLE:
+                trace = utils.generate_counter_example(self._fsm, problem,
+                                                       solver, depth,
+                                                       "ITP counter example")
+                return ItpResult(ItpVerdict.VIOLATED, bound, self._iterations,
+                                 trace)
+        raise NuSmvSatSolverError("Could not reconstruct the counter example")
+
+    ###########################################################################
+    # Solvers management
+    ###########################################################################
+    def _at(self, be, time):
+        """:return: the untimed `be` shifted at `time`"""
+        return self._enc.shift_to_time(be, time)
+
+    def _assert(self, solver, be):
+        """
+        Adds `be` to the current interpolation group of `solver`. The A and B
+        parts share subformulas (invar[1] for instance) hence the CNF must
+        define their variables with equivalences (see 
+        :meth:`pynusmv.sat.SatSolver.interpolant`).
+        """
+        cnf    = be.to_cnf(Polarity.POSITIVE, encoding=CnfEncoding.TSEITIN)
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+
+    def _is_sat(self, be):
+        """:return: True iff `be` is satisfiable"""
+        cnf    = be.to_cnf(Polarity.POSITIVE)
+        solver = SatSolverFactory.create(self._solver_name, incremental=False,
+                                         proof=False)
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        status = solver.solve()
+        if status == SatSolverResult.INTERNAL_ERROR:
+            raise NuSmvSatSolverError("The sat solver failed with an internal error")
+        return status == SatSolverResult.SATISFIABLE
+
+
+def check_invar_itp(invar_prop, max_bound=None, solver_name='MiniSat'):
+    """
+    Verifies the INVARSPEC property `invar_prop` against the master be fsm
+    using interpolation (see :class:`InterpolationChecker`).
+
+    :param invar_prop: the property to be verified. This should be an instance
+        of Prop similar to what you obtain querying PropDb
+        (:func:`pynusmv.glob.prop_database()`)
+    :param max_bound: the maximum depth of the BMC problems (None means that
+        the algorithm runs until it reaches a verdict).
+    :param solver_name: the name of the proof logging sat solver to use.
+    :return: an :class:`ItpResult`
+    :raises ValueError: when `max_bound` is negative
+    :raises NuSmvSatSolverError: when a solver fails with an internal error or
+        does not support interpolation
+    """
+    return InterpolationChecker(invar_prop.expr,
+                                solver_name=solver_name).check(max_bound)
@@ -16,11 +16,22 @@ exposed hereunder.
  
 """
 from enum                  import IntEnum
+from collections           import namedtuple
 
 from pynusmv_lower_interface.nusmv.bmc     import bmc as _bmc
-
+from pynusmv_lower_interface.nusmv.node    import node as _node
+from pynusmv_lower_interface.nusmv.parser  import parser as _parser
+from pynusmv_lower_interface.nusmv.enc.bdd import bdd as _bddenc
+
+from pynusmv               import glob
+from pynusmv.dd            import BDD
+from pynusmv.node          import Node
+from pynusmv.wff           import Wff
+from pynusmv.sat           import SatSolverFactory, SatSolverResult, Polarity
 from pynusmv.be.expression import Be
 from pynusmv.bmc           import utils
+from pynusmv.bmc           import ltlspec
+from pynusmv.bmc           import glob as bmcglob
 from pynusmv.exception     import NuSmvSatSolverError
 
 ##############################################################################
@@ -285,6 +296,304 @@ def check_invar_incrementally_falsification(invar_prop, max_bound):
         raise NuSmvSatSolverError("The sat solver could not be created")
 
 
+##############################################################################
+# K-INDUCTION ENGINE
+##############################################################################
+class KInductionVerdict(IntEnum):
+    """
+    The possible outcomes of a verification performed with a 
+    :class:`KInductionChecker`
+    """
+    PROVED   = 0
+    VIOLATED = 1
+    UNKNOWN  = 2
+
+KInductionResult = namedtuple('KInductionResult', ('verdict', 'bound', 'trace',
+                                                   'simple_path_constraints'))
+"""
+A :class:`KInductionResult` is the outcome of a :meth:`KInductionChecker.check`:
+
+    - `verdict` is a :class:`KInductionVerdict`;
+    - `bound` is the value of k at which the property was proved or violated
+      (or the maximum bound that was explored when the verdict is UNKNOWN);
+    - `trace` is the counter example (:class:`pynusmv.trace.Trace`) when the 
+      property is violated and `None` otherwise;
+    - `simple_path_constraints` is the number of simple path constraints that
+      were added to the induction step to discard spurious counter examples.
+"""
+
+def safety_monitor(prop_node):
+    """
+    Converts the safety property `prop_node` into a monitor that can be checked
+    by k-induction. The accepted properties are:
+    
+        - the invariants (propositional formulas, as those of INVARSPEC);
+        - the LTL properties of the form :math:`G \\phi` where :math:`\\phi` is
+          built from propositions, boolean connectives and the X operator only.
+    
+    The monitor is the formula :math:`\\phi` (which must hold at each time t)
+    together with its depth d, that is to say the number of states after t 
+    which are needed to evaluate :math:`\\phi` at time t (its X-nesting depth).
+    
+    :param prop_node: the property to convert represented in a 'node' format 
+        (subclass of :class:`pynusmv.node.Node`)
+    :return: a tuple (formula, depth) where formula is the boolean NNF 
+        :class:`pynusmv.wff.Wff` of :math:`\\phi`
+    :raises ValueError: when the property is not of one of the accepted forms
+        (for instance :math:`X p`, which is not an invariant)
+    """
+    formula = utils.make_nnf_boolean_wff(prop_node)
+    body    = formula.to_node()
+    always  = body.type == _parser.OP_GLOBAL
+    if always:
+        body = Node.from_ptr(_node.car(body._ptr))
+    
+    def _depth(node):
+        """Internal function, computes the X-nesting depth of `node`"""
+        kind = utils.operator_class(node)
+        if kind == utils.OperatorType.TIME_OPERATOR:
+            if node.type != _parser.OP_NEXT:
+                raise ValueError("Only G of a formula using X as its sole "
+                                 "temporal operator can be checked by "
+                                 "k-induction")
+            return 1 + _depth(Node.from_ptr(_node.car(node._ptr)))
+        if kind == utils.OperatorType.PROP_CONNECTIVE:
+            return max(_depth(Node.from_ptr(_node.car(node._ptr))), 
+                       _depth(Node.from_ptr(_node.cdr(node._ptr))))
+        if node.type == _parser.NOT:
+            return _depth(Node.from_ptr(_node.car(node._ptr)))
+        return 0
+    
+    depth = _depth(body)
+    if not always and depth > 0:
+        # phi only constrains the states following the initial one: checking
+        # it at every time would not be the same property
+        raise ValueError("A temporal property must be of the form G phi to "
+                         "be checked by k-induction")
+    return (Wff.decorate(body), depth)
+
+def lemma_from_bdd(bdd, bdd_enc=None):
+    """
+    Converts the set of states represented by `bdd` into an expression which
+    can be used as a strengthening lemma by a :class:`KInductionChecker`. 
+    
+    A typical BDD-derived lemma is the set of reachable states (or any over 
+    approximation of it) computed with the BDD based engine.
+    
+    :param bdd: the BDD (:class:`pynusmv.dd.BDD`) to convert
+    :param bdd_enc: the BDD encoding of the model. When it is None, the 
+        encoding of the master BDD fsm is used.
+    :return: a :class:`pynusmv.node.Node` representing the same set of states
+        as `bdd`.
+    """
+    if bdd_enc is None:
+        bdd_enc = glob.prop_database().master.bddFsm.bddEnc
+    return Node.from_ptr(_bddenc.BddEnc_bdd_to_expr(bdd_enc._ptr, bdd._ptr))
+
+class KInductionChecker:
+    """
+    A :class:`KInductionChecker` verifies a safety property by k-induction 
+    [ES03]_ using two incremental sat solvers: one for the base case and one 
+    for the induction step. Both are kept alive between the calls to 
+    :meth:`check` which resumes the verification where the previous one 
+    stopped. 
+    
+    The induction step can be strengthened with lemmas: expressions over the 
+    state variables that are known to be invariants of the model (either 
+    supplied by the user or derived from a BDD with :func:`lemma_from_bdd`). 
+    These are assumed on every state of the induction step.
+    
+    .. warning::
+    
+        The lemmas are trusted: a lemma which is not an invariant of the model
+        may lead to an unsound proof.
+    
+    Simple path constraints (the states of the induction step are pairwise 
+    distinct) are only added lazily: whenever the induction step finds a 
+    counter example that visits the same state twice, the constraint 
+    forbidding that very repetition is added and the step is solved again.
+    
+    Example::
+    
+        checker = KInductionChecker(spec, lemmas=[lemma_from_bdd(reachable)])
+        result  = checker.check(10)
+        if result.verdict == KInductionVerdict.PROVED:
+            print("proved at k =", result.bound)
+    """
+    
+    def __init__(self, prop_node, fsm=None, lemmas=(), solver_name='MiniSat'):
+        """
+        Creates a new checker for the safety property `prop_node`.
+        
+        :param prop_node: the property to verify represented in a 'node' 
+            format (subclass of :class:`pynusmv.node.Node`). See 
+            :func:`safety_monitor` for the accepted properties.
+        :param fsm: the BeFsm against which the property is verified. When it
+            is None, the global master be fsm is used.
+        :param lemmas: an iterable of strengthening lemmas (nodes or BDDs)
+        :param solver_name: the name of the incremental sat solver to use.
+        :raises ValueError: when the property cannot be checked by k-induction
+        """
+        self._fsm   = fsm if fsm is not None else bmcglob.master_be_fsm()
+        self._enc   = self._fsm.encoding
+        self._model = utils.BmcModel(self._fsm)
+        self._formula, self._depth = safety_monitor(prop_node)
+        
+        self._base  = SatSolverFactory.create(solver_name, incremental=True, 
+                                              proof=False)
+        self._step  = SatSolverFactory.create(solver_name, incremental=True, 
+                                              proof=False)
+        self._base_time   = -1  # last time block unrolled in the base solver
+        self._step_time   = -1  # last time block unrolled in the step solver
+        self._next        = 0
+        self._result      = None
+        self._simple_path = 0
+        self._lemmas      = []
+        for lemma in lemmas:
+            self.add_lemma(lemma)
+    
+    @property
+    def depth(self):
+        """:return: the number of states needed after t to evaluate the monitor"""
+        return self._depth
+    
+    @property
+    def next_bound(self):
+        """:return: the first bound that will be explored by the next check"""
+        return self._next
+    
+    def add_lemma(self, lemma):
+        """
+        Adds a strengthening lemma to the induction step.
+        
+        :param lemma: an expression (:class:`pynusmv.node.Node`) over the state 
+            variables or a BDD (:class:`pynusmv.dd.BDD`) which denotes an 
+            invariant of the model.
+        """
+        if isinstance(lemma, BDD):
+            lemma = lemma_from_bdd(lemma)
+        untimed = Wff.decorate(lemma).to_boolean_wff().to_be(self._enc)
+        self._lemmas.append(untimed)
+        for time in range(self._step_time+1):
+            self._assert(self._step, self._enc.shift_to_time(untimed, time))
+    
+    def check(self, max_bound):
+        """
+        Explores the bounds from :attr:`next_bound` up to `max_bound` (included)
+        until the property is either proved or violated.
+        
+        :param max_bound: the maximum value of k to explore
+        :return: a :class:`KInductionResult`
+        :raises ValueError: when `max_bound` is negative
+        :raises NuSmvSatSolverError: when a solver fails with an internal error
+        """
+        if max_bound < 0:
+            raise ValueError("Infeasible maximal bound")
+        
+        while self._result is None and self._next <= max_bound:
+            k   = self._next
+            bad = ~self._property(k)
+            self._unroll(k + self._depth)
+            
+            # base case: is there a violation at time k ?
+            group  = self._add_group(self._base, bad)
+            status = self._solve(self._base, group)
+            if status == SatSolverResult.SATISFIABLE:
+                trace = utils.generate_counter_example(self._fsm, bad, 
+                                                       self._base, 
+                                                       k + self._depth,
+                                                       "k-induction counter example")
+                self._base.destroy_group(group)
+                self._result = KInductionResult(KInductionVerdict.VIOLATED, 
+                                                k, trace, self._simple_path)
+                break
+            self._base.destroy_group(group)
+            self._assert(self._base, self._property(k))
+            
+            # induction step: do k valid states always lead to a valid one ?
+            group = self._add_group(self._step, bad)
+            while True:
+                status = self._solve(self._step, group)
+                if status == SatSolverResult.UNSATISFIABLE:
+                    self._result = KInductionResult(KInductionVerdict.PROVED, 
+                                                    k, None, self._simple_path)
+                    break
+                loop = self._repeated_states(k)
+                if loop is None:
+                    break
+                self._assert(self._step, ~utils.loop_condition(self._enc, *loop))
+                self._simple_path += 1
+            self._step.destroy_group(group)
+            self._assert(self._step, self._property(k))
+            self._next += 1
+        
+        if self._result is not None:
+            return self._result
+        return KInductionResult(KInductionVerdict.UNKNOWN, max_bound, None, 
+                                self._simple_path)
+    
+    def _property(self, time):
+        """:return: the Be stating that the monitor holds at `time`"""
+        return ltlspec.bounded_semantics_without_loop_at_offset(self._fsm, 
+                                                                self._formula,
+                                                                0, self._depth,
+                                                                time)
+    
+    def _unroll(self, time):
+        """Unrolls the model up to `time` in both solvers"""
+        while self._base_time < time:
+            self._base_time += 1
+            self._assert(self._base, 
+                         self._model.unrolling_fragment[self._base_time])
+        while self._step_time < time:
+            self._step_time += 1
+            t = self._step_time
+            if t == 0:
+                self._assert(self._step, self._model.invar[0])
+            else:
+                self._assert(self._step, 
+                             self._model.trans[t-1] & self._model.invar[t])
+            for lemma in self._lemmas:
+                self._assert(self._step, self._enc.shift_to_time(lemma, t))
+    
+    def _repeated_states(self, k):
+        """
+        :return: a pair (j, i) with i < j <= k of times at which the model of the 
+            step solver visits the same state or None if there is no such pair. 
+        """
+        model  = set(self._step.model)
+        curvar = self._enc.curr_variables
+        states = {}
+        for time in range(k+1):
+            state = tuple(var.at_time[time].cnf_literal in model 
+                          for var in curvar)
+            if state in states:
+                return (time, states[state])
+            states[state] = time
+        return None
+    
+    def _assert(self, solver, be):
+        """Adds `be` to the permanent group of `solver`"""
+        cnf    = be.to_cnf(Polarity.POSITIVE)
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+    
+    def _add_group(self, solver, be):
+        """Adds `be` to a new group of `solver` and returns that group"""
+        cnf   = be.to_cnf(Polarity.POSITIVE)
+        group = solver.create_group()
+        solver.add_to_group(cnf, group)
+        solver.polarity(cnf, Polarity.POSITIVE, group)
+        return group
+    
+    def _solve(self, solver, group):
+        """Solves the permanent group of `solver` together with `group`"""
+        status = solver.solve_groups([group])
+        if status == SatSolverResult.INTERNAL_ERROR:
+            raise NuSmvSatSolverError("The sat solver failed with an internal error")
+        return status
+
+
 ##############################################################################
 # PROBLEM GENERATION
 ##############################################################################
@@ -5,6 +5,9 @@ to the translation of formulas to boolean expressions corresponding to the
 SAT problem necessary to verify these using LTL bounded semantics of the dumping
 of problem to file (in DIMACS format)
 """
+import time
+from collections import namedtuple
+
 from pynusmv_lower_interface.nusmv.bmc  import bmc as _bmc
 from pynusmv_lower_interface.nusmv.node import node as _node
 from pynusmv_lower_interface.bmc_utils  import bmc_utils as _lower
@@ -12,10 +15,13 @@ from pynusmv_lower_interface.bmc_utils  import bmc_utils as _lower
 from pynusmv.node                import Node
 from pynusmv.be.expression       import Be
 from pynusmv.exception           import NuSmvSatSolverError
+from pynusmv.sat                 import SatSolverFactory, SatSolverResult, Polarity
 from pynusmv.bmc                 import utils
 
 __all__ = ['check_ltl',
            'check_ltl_incrementally',
+           'BoundResult',
+           'IncrementalLtlChecker',
            'generate_ltl_problem',
            'bounded_semantics',
            'bounded_semantics_without_loop',
@@ -25,6 +31,11 @@ __all__ = ['check_ltl',
            'bounded_semantics_without_loop_at_offset',
            'bounded_semantics_with_loop_at_offset',
            'bounded_semantics_at_offset',
+           'MemoizerStats',
+           'memoizer_stats',
+           'memoizer_clear',
+           'get_memoizer_capacity',
+           'set_memoizer_capacity',
            'dump_dimacs_filename',
            'dump_dimacs'
            ]
@@ -175,6 +186,169 @@ def check_ltl_incrementally(ltl_prop,
     if result == 1:
         raise NuSmvSatSolverError("The sat solver could not be created")
 
+BoundResult = namedtuple('BoundResult', ('bound', 'loop', 'result',
+                                         'solve_time', 'clauses', 'variables',
+                                         'trace'))
+"""
+A :class:`BoundResult` is the outcome of the verification of an LTL property
+for one bound by an :class:`IncrementalLtlChecker`:
+
+    - `bound` is the bound `k` of the problem;
+    - `loop` is the absolute loop used to build the problem (or one of the 
+      special values :func:`pynusmv.bmc.utils.all_loopbacks()` and
+      :func:`pynusmv.bmc.utils.no_loopback()`);
+    - `result` is the :class:`pynusmv.sat.SatSolverResult` of the solving (a
+      satisfiable problem means that a counter example was found);
+    - `solve_time` is the wall clock time spent in the solver, in seconds;
+    - `clauses` and `variables` are the number of clauses and variables of 
+      the CNF added to the solver for this bound (unrolling fragment and 
+      bounded semantics of the property);
+    - `trace` is the counter example (:class:`pynusmv.trace.Trace`) when one
+      was found and `None` otherwise.
+"""
+
+class IncrementalLtlChecker:
+    """
+    An :class:`IncrementalLtlChecker` performs the incremental bounded model 
+    checking of one LTL property and reports the outcome of each bound in a 
+    :class:`BoundResult` instead of printing it.
+    
+    It plays the same role as :func:`check_ltl_incrementally` but is written 
+    on top of :class:`pynusmv.bmc.utils.BmcModel` and of an incremental SAT 
+    solver: the unrolling fragments of the model are added permanently to the 
+    solver while the bounded semantics of the negated property at each bound
+    lives in its own group, which is destroyed once that bound is solved. 
+    
+    The solver is kept alive between the calls to :meth:`check`, so that a 
+    later call resumes the verification where the previous one stopped.
+    
+    Example::
+    
+        checker = IncrementalLtlChecker(spec)
+        checker.check(10)   # solves the bounds 0 to 10 
+        checker.check(20)   # resumes at bound 11
+    """
+    
+    def __init__(self, prop_node, fsm=None, loop=utils.all_loopbacks(), 
+                 solver_name='MiniSat'):
+        """
+        Creates a new checker for the property `prop_node`.
+        
+        :param prop_node: the property to verify represented in a 'node' 
+            format (subclass of :class:`pynusmv.node.Node`) which corresponds
+            to the format obtained from the ast.
+        :param fsm: the BeFsm against which the property is verified. When it
+            is None, the global master be fsm is used.
+        :param loop: a loop definition (absolute, relative or one of the 
+            special values, see :func:`check_ltl`).
+        :param solver_name: the name of the incremental sat solver to use.
+        :raises ValueError: when the solver is not available.
+        """
+        self._model  = utils.BmcModel(fsm)
+        self._fsm    = self._model._fsm
+        self._loop   = loop
+        self._wff    = utils.make_negated_nnf_boolean_wff(prop_node)
+        self._solver = SatSolverFactory.create(solver_name, 
+                                               incremental=True, 
+                                               proof=False)
+        self._next   = 0
+        self.results = []
+    
+    @property
+    def solver(self):
+        """:return: the incremental sat solver used by this checker"""
+        return self._solver
+    
+    @property
+    def next_bound(self):
+        """:return: the first bound that will be solved by the next check"""
+        return self._next
+    
+    @property
+    def counter_example(self):
+        """
+        :return: the first (hence shortest) counter example found by this 
+            checker or None when no counter example has been found yet.
+        """
+        for result in self.results:
+            if result.trace is not None:
+                return result.trace
+        return None
+    
+    def check(self, bound, stop_at_counter_example=True):
+        """
+        Solves the problems for all the bounds from :attr:`next_bound` up to 
+        `bound` (included) and returns their results. 
+        
+        :param bound: the last bound to solve.
+        :param stop_at_counter_example: a flag telling whether or not to stop
+            as soon as a counter example is found. 
+        :return: the list of the :class:`BoundResult` of the bounds solved 
+            during this call (they are also appended to :attr:`results`).
+        :raises ValueError: when the bound is negative
+        :raises NuSmvSatSolverError: when the solver fails with an internal 
+            error.
+        """
+        if bound < 0:
+            raise ValueError("The bound value must be greater or equal to zero")
+        
+        results = []
+        while self._next <= bound:
+            result = self._solve(self._next)
+            self._next += 1
+            if result is None:
+                continue
+            results.append(result)
+            self.results.append(result)
+            if stop_at_counter_example and result.trace is not None:
+                break
+        return results
+    
+    def _solve(self, k):
+        """
+        Extends the unrolling to `k`, solves the problem for that bound and
+        returns its result (or None when `loop` is not compatible with `k`).
+        """
+        solver  = self._solver
+        manager = self._fsm.encoding.manager
+        
+        fragment = self._model.unrolling_fragment[k].to_cnf(Polarity.POSITIVE)
+        solver  += fragment
+        solver.polarity(fragment, Polarity.POSITIVE)
+        clauses  = fragment.clauses_number
+        variables= fragment.vars_number
+        
+        loop = _bmc.Bmc_Utils_RelLoop2AbsLoop(self._loop, k)
+        if (not utils.is_all_loopbacks(loop) and not utils.is_no_loopback(loop)
+            and (loop >= k or loop < 0)):
+            return None
+        
+        tableau = Be(_bmc.Bmc_Tableau_GetLtlTableau(self._fsm._ptr, 
+                                                    self._wff._ptr, 
+                                                    k, loop), 
+                     manager)
+        cnf   = tableau.to_cnf(Polarity.POSITIVE)
+        group = solver.create_group()
+        solver.add_to_group(cnf, group)
+        solver.polarity(cnf, Polarity.POSITIVE, group)
+        clauses  += cnf.clauses_number
+        variables+= cnf.vars_number
+        
+        start  = time.perf_counter()
+        status = solver.solve_groups([group])
+        elapsed= time.perf_counter() - start
+        
+        if status == SatSolverResult.INTERNAL_ERROR:
+            raise NuSmvSatSolverError("The sat solver failed with an internal error")
+        
+        trace = None
+        if status == SatSolverResult.SATISFIABLE:
+            trace = utils.generate_counter_example(self._fsm, tableau, 
+                                                   solver, k,
+                                                   "BMC Counterexample")
+        solver.destroy_group(group)
+        return BoundResult(k, loop, status, elapsed, clauses, variables, trace)
+
 ##############################################################################
 # PROBLEM GENERATION
 ##############################################################################
@@ -655,19 +829,75 @@ def bounded_semantics_at_offset(fsm, formula, bound, offset, fairness=True):
     if offset<0:
         raise ValueError("The offset must be a positive integer")
     
-    enc = fsm.encoding
-    straight = bounded_semantics_without_loop_at_offset(fsm, formula, 0, bound, offset)
-    k_loop   = Be.false(enc.manager)
-    for i in range(bound): 
-        fairness_cond = utils.fairness_constraint(fsm, offset+bound, offset+i) \
-                                 if fairness \
-                                 else Be.true(enc.manager)
-        k_loop |= ( utils.loop_condition(enc, offset+bound, offset+i) \
-                  & fairness_cond \
-                  & bounded_semantics_with_loop_at_offset(fsm, formula, 0, bound, i, offset))
-    
-    # this is just the sem of the formula
-    return straight | k_loop    
+    # Note: the disjunction over all the loop positions is built in one single
+    #       C call which shares the fairness constraints among the loop positions
+    _ptr = _lower.sem_at_offset(fsm._ptr, formula._ptr, bound, offset, int(fairness))
+    return Be(_ptr, fsm.encoding.manager)
+
+###############################################################################
+################ Memoization of the offset-ed bounded semantics ###############
+###############################################################################
+
+MemoizerStats = namedtuple('MemoizerStats', ('size', 'capacity', 'hits', 
+                                             'misses', 'evictions'))
+"""
+A :class:`MemoizerStats` is a snapshot of the usage of the cache behind the
+offset-ed bounded semantics (:func:`bounded_semantics_without_loop_at_offset` 
+and :func:`bounded_semantics_with_loop_at_offset`):
+
+    - `size` is the number of entries currently stored in the cache;
+    - `capacity` is its maximum number of entries (0 means unbounded);
+    - `hits` and `misses` count the lookups that did (or did not) find a 
+      memoized value since the last :func:`memoizer_clear`;
+    - `evictions` counts the entries dropped to respect the capacity since
+      the last :func:`memoizer_clear`.
+"""
+
+def memoizer_stats():
+    """
+    :return: a :class:`MemoizerStats` describing the current usage of the 
+        cache of the offset-ed bounded semantics.
+    """
+    return MemoizerStats(_lower.MEMOIZER_get_size(),
+                         _lower.MEMOIZER_get_capacity(),
+                         _lower.MEMOIZER_get_hits(),
+                         _lower.MEMOIZER_get_misses(),
+                         _lower.MEMOIZER_get_evictions())
+
+def memoizer_clear():
+    """
+    Empties the cache of the offset-ed bounded semantics and resets its usage 
+    statistics (the capacity of the cache is preserved). 
+    
+    This is typically useful between two unrelated problems of a long running
+    session (the cache is anyway cleared when the BMC sub system is 
+    deinitialized).
+    """
+    _lower.MEMOIZER_clear()
+
+def get_memoizer_capacity():
+    """
+    :return: the maximum number of entries of the cache of the offset-ed 
+        bounded semantics (0 means unbounded, which is the default).
+    """
+    return _lower.MEMOIZER_get_capacity()
+
+def set_memoizer_capacity(capacity):
+    """
+    Bounds the number of entries of the cache of the offset-ed bounded 
+    semantics. Once this capacity is reached, the least recently used entries 
+    are evicted to make room for the new ones. 
+    
+    :param capacity: the maximum number of entries of the cache (0 or None 
+        means unbounded).
+    :raises ValueError: when the capacity is negative
+    """
+    if capacity is None:
+        capacity = 0
+    if capacity < 0:
+        raise ValueError("The capacity of the memoizer may not be negative")
+    _lower.MEMOIZER_set_capacity(capacity)
+
 ##############################################################################
 # DUMP 
 ##############################################################################
@@ -0,0 +1,262 @@
+"""
+The :mod:`pynusmv.bmc.portfolio` module provides a parallel portfolio approach
+to the bounded model checking of LTL properties.
+
+Rather than solving the problems of increasing bounds one after the other in
+one single solver (as done by :func:`pynusmv.bmc.ltlspec.check_ltl`), the
+verification is split into independent work items which are dispatched to a
+pool of worker processes:
+
+    - a work item can either be a bound `k` (in which case all the possible
+      loops are considered at once) or a pair `(k, l)` of bound and loop
+      position (in which case the problem is built using
+      :func:`pynusmv.bmc.ltlspec.bounded_semantics_single_loop` or
+      :func:`pynusmv.bmc.ltlspec.bounded_semantics_without_loop`).
+    - each work item can be solved by several solver configurations
+      (:class:`SolverConfig`) racing against one another.
+
+As soon as a counter example is found, all the outstanding work which can no
+longer produce a shorter counter example is cancelled and the shortest
+counter example is reported.
+
+.. note::
+
+    NuSMV relies on a global state which cannot be shared between processes.
+    Hence, each worker process loads the model on its own (when it receives
+    its first work item) and the counter examples are sent back to the caller
+    in a plain python form (see :class:`PortfolioResult`).
+"""
+
+__all__ = ['SolverConfig', 'WorkItem', 'PortfolioResult', 'work_items',
+           'check_ltl']
+
+import multiprocessing
+import queue
+import os
+
+from collections         import namedtuple
+
+from pynusmv.init        import init_nusmv
+from pynusmv.glob        import load_from_file
+from pynusmv.parser      import parse_ltl_spec
+from pynusmv.node        import Node
+from pynusmv.wff         import Wff
+from pynusmv.sat         import SatSolverFactory, SatSolverResult, Polarity
+from pynusmv.exception   import NuSmvSatSolverError, PyNuSMVError
+from pynusmv.bmc.glob    import go_bmc, master_be_fsm
+from pynusmv.bmc         import ltlspec
+from pynusmv.bmc         import utils
+
+SolverConfig = namedtuple('SolverConfig', ('name', 'seed'))
+SolverConfig.__new__.__defaults__ = (None,)
+SolverConfig.__doc__ = """
+The configuration of the sat solver used by a worker: the `name` of the solver
+(as accepted by :meth:`pynusmv.sat.SatSolverFactory.create`) and an optional
+`seed` used to turn on the random mode of the solver.
+"""
+
+WorkItem = namedtuple('WorkItem', ('bound', 'loop'))
+WorkItem.__doc__ = """
+One independent BMC problem: the `bound` k and the absolute `loop` position l
+(or one of the special values :func:`pynusmv.bmc.utils.all_loopbacks()` and
+:func:`pynusmv.bmc.utils.no_loopback()`).
+"""
+
+PortfolioResult = namedtuple('PortfolioResult',
+                             ('bound', 'loop', 'solver', 'counter_example'))
+PortfolioResult.__doc__ = """
+The shortest counter example found by :func:`check_ltl`: the `bound` and
+`loop` of the work item that produced it, the :class:`SolverConfig` which
+solved it and the `counter_example` itself, a tuple of the successive steps
+of the trace where each step is a dictionary mapping the name of the symbols
+to the string representation of their values.
+"""
+
+def work_items(bound, loops=False):
+    """
+    Enumerates the work items up to `bound` in increasing bound order.
+
+    :param bound: the maximum bound (included) of the work items
+    :param loops: when this flag is off, there is one work item per bound
+        considering all loops at once. Otherwise, there is one work item per
+        bound and loop position (plus one for the loop free paths).
+    :return: a generator of :class:`WorkItem`
+    :raises ValueError: when the bound is negative
+    """
+    if bound < 0:
+        raise ValueError("The bound value must be greater or equal to zero")
+    for k in range(bound+1):
+        if not loops:
+            yield WorkItem(k, utils.all_loopbacks())
+        else:
+            yield WorkItem(k, utils.no_loopback())
+            for l in range(k):
+                yield WorkItem(k, l)
+
+def check_ltl(model, spec, bound=10, loops=False, solvers=('MiniSat',),
+              processes=None):
+    """
+    Verifies the LTL property `spec` of the model stored in the file `model`
+    up to `bound` using a pool of worker processes.
+
+    :param model: the path to the SMV file containing the model.
+    :param spec: the text of the LTL property to verify.
+    :param bound: the maximum bound (included) of the verification.
+    :param loops: a flag telling whether the work items are the bounds
+        (False) or the pairs of bound and loop position (True).
+        See :func:`work_items`.
+    :param solvers: the solver configurations used to solve each work item.
+        This is an iterable of :class:`SolverConfig` or of solver names. When
+        several configurations are given, they race on each work item and the
+        first answer wins.
+    :param processes: the number of worker processes (defaults to the number
+        of cpus).
+    :return: a :class:`PortfolioResult` describing the shortest counter example
+        or None when the property holds up to `bound`.
+    :raises ValueError: when the bound is negative or no solver is given
+    :raises IOError: when the file `model` does not exist
+    :raises PyNuSMVError: when a worker could not load the model
+    :raises NuSmvSatSolverError: when a worker could not solve its problem
+    :raises RuntimeError: when a worker process died
+    """
+    items   = list(work_items(bound, loops))
+    configs = [SolverConfig(s) if isinstance(s, str) else SolverConfig(*s)
+               for s in solvers]
+    if not configs:
+        raise ValueError("At least one solver configuration must be given")
+    if not os.path.exists(model):
+        raise IOError("File {} does not exist".format(model))
+
+    answers = queue.Queue()
+    context = multiprocessing.get_context('spawn')
+    pool    = context.Pool(processes, _init_worker, (model,))
+    workers = {process.pid for process in pool._pool}
+    try:
+        for item in items:
+            for config in configs:
+                pool.apply_async(_solve, (spec, item, config),
+                                 callback=answers.put,
+                                 error_callback=answers.put)
+
+        pending = set(items)
+        best    = None
+        while any(best is None or item.bound < best.bound
+                  for item in pending):
+            answer = _next_answer(answers, pool, workers)
+            if isinstance(answer, BaseException):
+                raise answer
+            item, config, counter_example = answer
+            if item not in pending:
+                continue    # another configuration was faster
+            pending.discard(item)
+            if counter_example is not None and \
+               (best is None or item.bound < best.bound):
+                best = PortfolioResult(item.bound, item.loop, config,
+                                       counter_example)
+        return best
+    finally:
+        pool.terminate()
+        pool.join()
+
+# the delay (in seconds) between two checks of the liveness of the workers
+_POLL_INTERVAL = 1.0
+
+def _next_answer(answers, pool, workers):
+    """
+    Waits for the next answer of the workers of `pool`. A task whose worker
+    died is never answered: the processes of the pool are checked against the
+    ids of the `workers` it was started with while waiting.
+
+    :return: the next element of the `answers` queue
+    :raises RuntimeError: when a worker process died
+    """
+    while True:
+        try:
+            return answers.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            processes = list(pool._pool)
+            if {process.pid for process in processes} != workers \
+            or any(process.exitcode is not None for process in processes):
+                raise RuntimeError("A worker process of the portfolio died")
+
+##############################################################################
+# WORKER PROCESSES
+##############################################################################
+# the path of the model to load in this worker process (None once loaded)
+_model      = None
+# the error raised when the model could not be loaded
+_load_error = None
+
+def _init_worker(model):
+    """
+    Initializes NuSMV in a worker process and remembers the `model` to load.
+    The model is only loaded by the first call to :func:`_solve` so that a
+    loading error is reported to the caller rather than killing the worker
+    (which the pool would respawn endlessly).
+    """
+    global _model
+    init_nusmv()
+    _model = model
+
+def _load_model():
+    """
+    Loads the model and sets up the BMC sub system in a worker process unless
+    it is already done.
+
+    :raises PyNuSMVError: when the model could not be loaded (the error is
+        raised again by the following calls)
+    """
+    global _model, _load_error
+    if _load_error is not None:
+        raise _load_error
+    if _model is None:
+        return
+    model, _model = _model, None
+    try:
+        load_from_file(model)
+        go_bmc()
+    except PyNuSMVError as error:
+        # the NuSMV exceptions are not all picklable
+        _load_error = PyNuSMVError("Could not load {}: {}".format(model, error))
+        raise _load_error
+
+def _solve(spec, item, config):
+    """
+    Solves the work `item` for the LTL property `spec` with the solver
+    configured by `config` in a worker process.
+
+    :return: a triple (item, config, counter_example) where counter_example is
+        None when the problem is unsatisfiable.
+    """
+    _load_model()
+    fsm  = master_be_fsm()
+    node = Node.from_ptr(parse_ltl_spec(spec))
+    k, l = item
+
+    if utils.is_all_loopbacks(l):
+        problem = ltlspec.generate_ltl_problem(fsm, node, k, l)
+    else:
+        path    = utils.BmcModel(fsm).path(k)
+        negated = Wff.decorate(node).not_()
+        if utils.is_no_loopback(l):
+            problem = path & ltlspec.bounded_semantics_without_loop(fsm, negated, k)
+        else:
+            problem = path & ltlspec.bounded_semantics_single_loop(fsm, negated, k, l)
+
+    cnf    = utils.apply_inlining(problem).to_cnf()
+    solver = SatSolverFactory.create(config.name, incremental=False, proof=False)
+    if config.seed is not None:
+        solver.random_mode(config.seed)
+    solver+= cnf
+    solver.polarity(cnf, Polarity.POSITIVE)
+
+    status = solver.solve()
+    if status == SatSolverResult.INTERNAL_ERROR:
+        raise NuSmvSatSolverError("The sat solver failed with an internal error")
+    if status == SatSolverResult.UNSATISFIABLE:
+        return (item, config, None)
+
+    trace = utils.generate_counter_example(fsm, problem, solver, k)
+    steps = tuple({str(symbol): str(value) for symbol, value in step}
+                  for step in trace)
+    return (item, config, steps)
@@ -6,11 +6,16 @@ These are roughly organized in six categories:
     - inlining of boolean expressions
     - ast nodes manipulations and normalization
     - BMC model / unrolling
-    - problem dumping to file
+    - problem dumping to file (or to any python binary stream)
     - counter example (trace) generation.
 '''
 
-from enum import IntEnum
+import gzip
+import bz2
+import lzma
+
+from collections import namedtuple
+from enum  import IntEnum
 
 from pynusmv_lower_interface.nusmv.bmc    import bmc    as _bmc
 from pynusmv_lower_interface.nusmv.parser import parser as _parser
@@ -21,6 +26,9 @@ from pynusmv                import glob
 from pynusmv.wff            import Wff
 from pynusmv.trace          import Trace 
 from pynusmv.be.expression  import Be 
+from pynusmv.be.encoder     import BeVarType
+from pynusmv.sat            import int32_zeros
+from pynusmv.bmc            import dimacs
 from pynusmv.bmc            import glob as bmcglob
 
 __all__ = [# loop related stuffs
@@ -34,9 +42,9 @@ __all__ = [# loop related stuffs
            'is_constant_expr', 'is_variable', 'is_past_operator', 
            'is_binary_operator', 'OperatorType', 'operator_class', 
            # model / unrolling
-           'BmcModel',
+           'BmcModel', 'UnrollingCacheStats',
            # dumping of problem to file
-           'DumpType', 'dump_problem',
+           'DumpType', 'dump_problem', 'write_dimacs', 'write_dimacs_parts',
            # counter examples
            'print_counter_example', 'generate_counter_example', 
            'fill_counter_example'
@@ -473,11 +481,37 @@ def operator_class(node):
 ###############################################################################
 # Linear time model, useful for LTL and invariant verification
 ###############################################################################
+UnrollingCacheStats = namedtuple('UnrollingCacheStats', 
+                                 ('entries', 'hits', 'misses'))
+"""
+An :class:`UnrollingCacheStats` is a snapshot of the usage of the cache of a
+:class:`BmcModel`:
+
+    - `entries` is the number of expressions currently stored in the cache;
+    - `hits` and `misses` count the lookups that did (or did not) find a 
+      cached expression since the creation of the model or the last call to
+      :meth:`BmcModel.clear_cache`.
+"""
+
 class BmcModel:
     """
     The :class:`BmcModel` defines a wrapper providing an higher level interface
     to the BeFsm object. This is the object that must be used to generate the 
     LTL problems.
+    
+    The expressions produced by a model (init, invar, trans, unrolling 
+    fragments, unrollings and paths) are cached per time step: they are 
+    derived from the untimed expressions of the fsm with 
+    :meth:`pynusmv.be.encoder.BeEnc.shift_to_time` and the unrolling from `j` 
+    to `k` is built by extending the longest unrolling from `j` which is 
+    already known. Hence, the incremental algorithms which repeatedly ask for
+    the same prefixes reuse them instead of rebuilding them. The usage of the
+    cache is described by :attr:`cache_stats`.
+    
+    .. note::
+    
+        The cached expressions are protected from the active scratch regions
+        (see :func:`pynusmv.bmc.glob.keep`).
     """
     
     def __init__(self, be_fsm=None):
@@ -488,8 +522,70 @@ class BmcModel:
         
         :param be_fsm: the fsm to wrap.
         """
-        self._fsm = be_fsm if be_fsm is not None else bmcglob.master_be_fsm()
+        self._fsm    = be_fsm if be_fsm is not None else bmcglob.master_be_fsm()
+        self._cache  = {}
+        self._hits   = 0
+        self._misses = 0
+    
+    ###########################################################################
+    # Cache management
+    ###########################################################################
+    @property
+    def cache_stats(self):
+        """
+        :return: an :class:`UnrollingCacheStats` describing the current usage
+            of the cache of this model.
+        """
+        return UnrollingCacheStats(len(self._cache), self._hits, self._misses)
     
+    def clear_cache(self):
+        """
+        Empties the cache of this model and resets its usage statistics.
+        """
+        self._cache.clear()
+        self._hits   = 0
+        self._misses = 0
+    
+    def _cached(self, key, build):
+        """
+        Looks `key` up in the cache and falls back to `build` to compute (and 
+        store) the value when it is missing.
+        
+        :param key: the key of the cached expression
+        :param build: a function without argument building the expression
+        :return: the expression associated with `key`
+        """
+        be = self._cache.get(key)
+        if be is None:
+            self._misses += 1
+            be = bmcglob.keep(build())
+            self._cache[key] = be
+        else:
+            self._hits += 1
+        return be
+    
+    def _at(self, key, untimed, time):
+        """
+        :return: the (cached) expression built by `untimed` shifted at `time`
+        """
+        return self._cached((key, time), 
+                  lambda: self._fsm.encoding.shift_to_time(untimed(), time))
+    
+    def _step(self, time):
+        """
+        :return: Invar[time] & Trans[time] & Invar[time+1] structured the way 
+            NuSMV builds its unrollings.
+        """
+        def untimed():
+            invar = self._fsm.invariants
+            return self._cached(('step', None), lambda: 
+                      (self._fsm.trans & invar)
+                      & self._fsm.encoding.shift_curr_to_next(invar))
+        return self._at('step', untimed, time)
+    
+    ###########################################################################
+    # Model
+    ###########################################################################
     @indexed.getter
     def init(self, time):
         """
@@ -501,10 +597,9 @@ class BmcModel:
         """
         if time < 0 :
             raise ValueError("Time cannot be negative")
-        if time == 0:
-            return Be(_bmc.Bmc_Model_GetInit0(self._fsm._ptr), self._fsm.encoding.manager)
-        else:
-            return Be(_bmc.Bmc_Model_GetInitI(self._fsm._ptr, time), self._fsm.encoding.manager)
+        untimed = lambda: self._cached(('init', None), lambda: 
+                                    self._fsm.init & self._fsm.invariants)
+        return self._at('init', untimed, time)
        
     @indexed.getter 
     def invar(self, time):
@@ -517,7 +612,7 @@ class BmcModel:
         """
         if time < 0 :
             raise ValueError("Time cannot be negative")
-        return Be(_bmc.Bmc_Model_GetInvarAtTime(self._fsm._ptr, time), self._fsm.encoding.manager)
+        return self._at('invar', lambda: self._fsm.invariants, time)
     
     @indexed.getter 
     def trans(self, time):
@@ -530,13 +625,16 @@ class BmcModel:
         """
         if time < 0 :
             raise ValueError("Time cannot be negative")
-        return Be(_bmc.Bmc_Model_GetTransAtTime(self._fsm._ptr, time), self._fsm.encoding.manager)
+        return self._at('trans', lambda: self._fsm.trans, time)
     
     def unrolling(self, j, k):
         """
         Unrolls the transition relation from j to k, taking into account of 
         invars.
         
+        The unrolling is obtained by extending the longest cached unrolling 
+        from `j` with the (cached) steps it is missing.
+        
         :param j: the start time
         :param k: the end time
         :return: a Be representing the unrolling of the fsm from time i to k
@@ -547,7 +645,18 @@ class BmcModel:
             raise ValueError("time must be positive")
         if k < j:
             raise ValueError("unrolling can only increase the amount of constraints")
-        return Be(_bmc.Bmc_Model_GetUnrolling(self._fsm._ptr, j, k), self._fsm.encoding.manager)
+        
+        prefix = k
+        while prefix > j and ('unrolling', j, prefix) not in self._cache:
+            prefix -= 1
+        
+        manager= self._fsm.encoding.manager
+        result = self._cached(('unrolling', j, prefix), 
+                              lambda: Be.true(manager))
+        for time in range(prefix, k):
+            result = self._cached(('unrolling', j, time+1), 
+                                  lambda: result & self._step(time))
+        return result
     
     @indexed.getter
     def unrolling_fragment(self, i):
@@ -563,8 +672,10 @@ class BmcModel:
         """
         if i < 0:
             raise ValueError("time indices start at 0")
-        ptr = _bmc.Bmc_Gen_UnrollingFragment(self._fsm._ptr, i)
-        return Be(ptr, self._fsm.encoding.manager)
+        if i == 0:
+            return self.init[0]
+        return self._cached(('fragment', i), lambda: 
+                    self.invar[i-1] & (self.trans[i-1] & self.invar[i]))
     
     def path(self, k, with_init=True):
         """
@@ -580,9 +691,10 @@ class BmcModel:
         if k < 0: 
             raise ValueError("time must be positive")
         if with_init:
-            return Be(_bmc.Bmc_Model_GetPathWithInit(self._fsm._ptr, k), self._fsm.encoding.manager)
+            return self._cached(('path', k), 
+                                lambda: self.unrolling(0, k) & self.init[0])
         else:
-            return Be(_bmc.Bmc_Model_GetPathNoInit(self._fsm._ptr, k), self._fsm.encoding.manager)
+            return self.unrolling(0, k)
     
     def fairness(self, k, l):
         """
@@ -710,6 +822,182 @@ def dump_problem(be_enc, be_cnf, prop, bound, loop, dump_type, fname):
                                bound, loop, 
                                dump_type, fname)
 
+def _open_compressed(stream, compression):
+    """
+    Wraps the binary file object `stream` so that everything written to it is
+    compressed with the given standard library `compression` codec.
+    
+    :param stream: a binary file object opened for writing
+    :param compression: None, 'gzip', 'bz2' or 'lzma'
+    :return: a binary file object writing to `stream`
+    :raise ValueError: when the compression codec is not supported
+    """
+    if compression is None:
+        return stream
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=stream, mode='wb')
+    if compression == 'bz2':
+        return bz2.BZ2File(stream, mode='wb')
+    if compression == 'lzma':
+        return lzma.LZMAFile(stream, mode='wb')
+    raise ValueError("Unsupported compression codec: {}".format(compression))
+
+def _dimacs_mapping(be_enc, bound):
+    """
+    Yields the comment lines of the DIMACS header which map the cnf variables
+    to the model variables at each time step between 0 and `bound` (this is
+    the same table as the one produced by NuSMV's dumper).
+    """
+    yield "c Time steps from 0 to {}, {} State Variables, {} Frozen Variables "\
+          "and {} Input Variables\n".format(bound,
+                                            be_enc.num_of_state_vars,
+                                            be_enc.num_of_frozen_vars,
+                                            be_enc.num_of_input_vars)
+    yield "c Model to Dimacs Conversion Table\n"
+    
+    var_type  = BeVarType.CURR | BeVarType.FROZEN | BeVarType.INPUT
+    variables = list(be_enc.iterator(var_type))
+    for time in range(bound+1):
+        yield "c \nc @@@@@ Time {}\n".format(time)
+        for var in variables:
+            # input vars do not exist at time k nor frozen vars after time 0
+            if (var.is_input_var and time == bound) \
+            or (var.is_frozen_var and time > 0):
+                continue
+            literal = var.at_time[time].cnf_literal
+            if literal != 0:
+                yield "c CNF variable {} => Time {}, Model Variable {}\n"\
+                      .format(literal, time, var.name)
+    yield "c \n"
+
+def write_dimacs(be_cnf, stream, be_enc=None, bound=0, compression=None,
+                 chunk_size=dimacs.CHUNK_SIZE):
+    """
+    Writes `be_cnf` in the DIMACS format to the binary file object `stream`.
+    
+    Unlike :func:`dump_problem`, this function streams the problem from the
+    python side: the clauses are exported at once with a bulk conversion (see
+    :meth:`pynusmv.be.expression.BeCnf.to_arrays`) and are written in chunks of
+    `chunk_size` clauses. Hence, the output can be any binary file object (an
+    open file, a socket, an :class:`io.BytesIO`, ...) and may be compressed on
+    the fly.
+    
+    The output is the same as the one of NuSMV's dumper: when `be_enc` is
+    given, the header contains the comment table mapping the cnf variables to
+    the model variables of each time step from 0 to `bound`. The formula
+    literal is asserted by a unit clause.
+    
+    .. note::
+    
+        `stream` is not closed by this function. However, when the output is
+        compressed, the compressed stream is flushed and terminated before
+        returning.
+    
+    :param be_cnf: the problem represented in CNF (:class:`BeCnf`)
+    :param stream: the binary file object where to write the problem
+    :param be_enc: the encoding of the problem (typically fsm.encoding) used to
+        produce the variables mapping table. No table is written when it is
+        None.
+    :param bound: the bound of the problem (only used to produce the mapping
+        table)
+    :param compression: the standard library codec used to compress the output
+        on the fly: None (no compression), 'gzip', 'bz2' or 'lzma'
+    :param chunk_size: the number of clauses formatted and written at once
+    :return: the number of clauses written (including the formula literal)
+    :raise ValueError: in case the given parameters are incorrect.
+    """
+    return write_dimacs_parts(be_cnf, lambda _: stream, None, be_enc, bound,
+                              compression, chunk_size)[1]
+
+def write_dimacs_parts(be_cnf, open_part, max_clauses, be_enc=None, bound=0,
+                       compression=None, chunk_size=dimacs.CHUNK_SIZE):
+    """
+    Writes `be_cnf` in the DIMACS format, split in several parts of at most
+    `max_clauses` clauses each.
+    
+    Every part is a standalone DIMACS problem with its own header over the 
+    same variables, and `be_cnf` is the conjunction of all the parts. The first
+    part holds the mapping table (when `be_enc` is given) and the unit clause
+    asserting the formula literal. See :func:`write_dimacs` for the details
+    about the format and the compression.
+    
+    :param be_cnf: the problem represented in CNF (:class:`BeCnf`)
+    :param open_part: a function which, given the index of a part (starting
+        at 0), returns the binary file object where to write that part. These
+        file objects are not closed by this function.
+    :param max_clauses: the maximum number of clauses per part (None means that
+        the problem is not split)
+    :param be_enc: the encoding of the problem used to produce the variables
+        mapping table. No table is written when it is None.
+    :param bound: the bound of the problem (only used by the mapping table)
+    :param compression: None, 'gzip', 'bz2' or 'lzma' (applied to each part)
+    :param chunk_size: the number of clauses formatted and written at once
+    :return: a pair (number of parts, number of clauses written)
+    :raise ValueError: in case the given parameters are incorrect.
+    """
+    if be_cnf is None:
+        raise ValueError("a boolean CNF formula is required")
+    if open_part is None:
+        raise ValueError("a binary file object is required")
+    if max_clauses is not None and max_clauses < 1:
+        raise ValueError("A part must contain at least one clause")
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be greater than zero")
+    if bound < 0:
+        raise ValueError("The bound value must be greater or equal to zero")
+    
+    max_var  = be_cnf.max_var_index
+    literals, offsets = be_cnf._flatten(int32_zeros)
+    nclauses = len(offsets) - 1
+    
+    formula  = be_cnf.formula_literal
+    if formula == dimacs.CONSTANT_LITERAL:
+        # the true constant has no clause, the false one is always false
+        prefix   = "" if nclauses == 0 else "1 0\n-1 0\n"
+        nprefix  = 0  if nclauses == 0 else 2
+        nclauses = 0
+    else:
+        prefix   = "{} 0\n".format(formula)
+        nprefix  = 1
+    
+    total    = nprefix + nclauses
+    capacity = total if max_clauses is None else max(max_clauses, nprefix)
+    parts    = 0
+    written  = 0
+    start    = 0
+    while parts == 0 or start < nclauses:
+        first = parts == 0
+        stop  = min(nclauses, start + capacity - (nprefix if first else 0))
+        
+        out = _open_compressed(open_part(parts), compression)
+        try:
+            header = ["c BMC problem generated by PyNuSMV\n"]
+            if first and be_enc is not None:
+                header.extend(_dimacs_mapping(be_enc, bound))
+            header.append("c Beginning of the DIMACS dumping\n")
+            if first:
+                header.append("c model {}\nc ".format(be_cnf.vars_number))
+                header.extend("{} ".format(v) for v in be_cnf.vars_list)
+                header.append("0\n")
+            size = (stop - start) + (nprefix if first else 0)
+            header.append("p cnf {} {}\n".format(max_var, size))
+            if first:
+                header.append(prefix)
+            out.write("".join(header).encode())
+            
+            for chunk in range(start, stop, chunk_size):
+                end = min(stop, chunk + chunk_size)
+                out.write(dimacs.format_clauses(literals, offsets, chunk, end).encode())
+            out.flush()
+        finally:
+            if compression is not None:
+                out.close()
+        
+        written += size
+        start    = stop
+        parts   += 1
+    return (parts, written)
+
 ###############################################################################
 # Counter examples utilities
 ###############################################################################
@@ -20,7 +20,7 @@ __all__ = ['PyNuSMVError', 'MissingManagerError', 'NuSMVLexerError',
            'NuSMVBeFsmMasterInstanceNotInitializedError',
            'NuSMVBmcAlreadyInitializedError', 'NuSMVNeedBooleanModelError',
            'NuSMVWffError', 'NuSmvIllegalTraceStateError',
-           'BDDDumpFormatError']
+           'BDDDumpFormatError', 'MuCalculusError']
 
 
 from collections import namedtuple
@@ -324,3 +324,10 @@ class BDDDumpFormatError(PyNuSMVError):
     Exception raised when an error occurs while loading a dumped BDD.
     """
     pass
+
+class MuCalculusError(PyNuSMVError):
+    """
+    Exception raised when a mu-calculus term is malformed (parsing error,
+    non-monotonic fixpoint, unbound variable,...).
+    """
+    pass
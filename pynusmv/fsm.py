@@ -43,6 +43,9 @@ from .parser import parse_next_expression
 from . import node
 
 
+_FAIR_STATES_ALGORITHMS = ("nusmv", "el", "owcty", "lockstep")
+
+
 class BddFsm(PointerWrapper):
 
     """
@@ -68,7 +71,8 @@ class BddFsm(PointerWrapper):
         super(BddFsm, self).__init__(ptr, freeit=freeit)
         self._reachable = None
         self._deadlock = None
-        self._fair = None
+        self._fair = {}
+        self._trans_replaced = False
 
     def __deepcopy__(self, memo):
         # No need to copy this FSM
@@ -118,6 +122,10 @@ class BddFsm(PointerWrapper):
         self._ptr.trans = new_trans_ptr
         # Free old trans
         nsbddtrans.BddTrans_free(old_trans_ptr)
+        # Fair states depend on the transition relation; NuSMV internal cache
+        # is not aware of the change, so do not rely on it anymore
+        self._fair = {}
+        self._trans_replaced = True
 
     @property
     def state_constraints(self):
@@ -189,12 +197,316 @@ class BddFsm(PointerWrapper):
     def fair_states(self):
         """
         The set of fair states of this FSM, represented as a BDD.
+        This is the same as :meth:`get_fair_states` with default parameters.
+
+        """
+        return self.get_fair_states()
+
+    def get_fair_states(self, algorithm="nusmv", restrict_to=None):
+        """
+        Return the set of fair states of this FSM, that is, the set of states
+        from which a path visiting infinitely often every fairness constraint
+        starts, computed with `algorithm`.
+
+        The available algorithms are:
+
+        * `"nusmv"`: the NuSMV implementation (Emerson-Lei); if the transition
+          relation of this FSM has been replaced, NuSMV is not aware of the
+          change and `"el"` is used instead;
+        * `"el"`: the Emerson-Lei algorithm;
+        * `"owcty"`: the One-Way-Catch-Them-Young algorithm: fairness
+          constraints are considered one at a time and states without
+          successor are pruned eagerly; this is usually much faster than
+          Emerson-Lei when there are many fairness constraints;
+        * `"lockstep"`: fair strongly connected components are enumerated
+          with the Lockstep algorithm and the fair states are the states that
+          can reach one of them.
+
+        Results are cached. The cache is emptied when the transition relation
+        is replaced, and depends on the current fairness constraints.
+
+        :param algorithm: the name of the algorithm to use
+        :param restrict_to: if not `None`, only paths staying in `restrict_to`
+                            are considered; with the `"nusmv"` algorithm, the
+                            fair states are simply intersected with
+                            `restrict_to`, which is only equivalent if
+                            `restrict_to` is closed under successors (like
+                            the reachable states)
+        :type restrict_to: :class:`BDD <pynusmv.dd.BDD>`
+        :rtype: :class:`BDD <pynusmv.dd.BDD>`
+        :raise: a :exc:`ValueError` if `algorithm` is unknown
+
+        """
+        if algorithm not in _FAIR_STATES_ALGORITHMS:
+            raise ValueError("Unknown fair states algorithm: " +
+                             str(algorithm))
+        if algorithm == "nusmv" and self._trans_replaced:
+            algorithm = "el"
+
+        fairness = tuple(self.fairness_constraints)
+        key = (algorithm, restrict_to, fairness)
+        if key not in self._fair:
+            if algorithm == "nusmv":
+                fair = BDD(bddFsm.BddFsm_get_fair_states(self._ptr),
+                           self.bddEnc.DDmanager)
+                if restrict_to is not None:
+                    fair = fair & restrict_to
+            else:
+                if restrict_to is None:
+                    restrict_to = BDD.true(self)
+                compute = getattr(self, "_fair_states_" + algorithm)
+                fair = compute(fairness, restrict_to)
+            self._fair[key] = fair
+        return self._fair[key]
+
+    def _fair_states_el(self, fairness, restrict_to):
+        """
+        Return the fair states of this FSM restricted to `restrict_to`,
+        computed with the Emerson-Lei algorithm.
+
+        """
+        fair = restrict_to
+        while True:
+            new = restrict_to & self.pre(fair)
+            for constraint in fairness:
+                new = new & self.pre(self._backward_reach(fair & constraint,
+                                                          fair))
+            if new == fair:
+                return fair
+            fair = new
+
+    def _fair_states_owcty(self, fairness, restrict_to):
+        """
+        Return the fair states of this FSM restricted to `restrict_to`,
+        computed with the One-Way-Catch-Them-Young algorithm.
+
+        """
+        fair = self._trim(restrict_to)
+        while True:
+            old = fair
+            for constraint in fairness:
+                fair = self._trim(self._backward_reach(fair & constraint,
+                                                       fair))
+            if fair == old:
+                return fair
+
+    def _fair_states_lockstep(self, fairness, restrict_to):
+        """
+        Return the fair states of this FSM restricted to `restrict_to`,
+        computed by enumerating the strongly connected components of
+        `restrict_to` with the Lockstep algorithm.
+
+        """
+        fair_sccs = BDD.false(self)
+        for scc in self.sccs(restrict=restrict_to, algorithm="lockstep"):
+            if self._is_fair_scc(scc, fairness):
+                fair_sccs = fair_sccs | scc
+        return self._backward_reach(fair_sccs, restrict_to)
+
+    def _backward_reach(self, target, within):
+        """
+        Return the states of `within` that can reach `target` through a path
+        of states of `within`.
+
+        """
+        reached = target & within
+        frontier = reached
+        while frontier.isnot_false():
+            frontier = (self.pre(frontier) & within) - reached
+            reached = reached | frontier
+        return reached
+
+    def _trim(self, states):
+        """
+        Return the largest subset of `states` in which every state has a
+        successor.
+
+        """
+        while True:
+            trimmed = states & self.pre(states)
+            if trimmed == states:
+                return states
+            states = trimmed
+
+    def _trim_both(self, states):
+        """
+        Return the largest subset of `states` in which every state has a
+        successor and a predecessor.
 
         """
-        if self._fair is None:
-            self._fair = BDD(bddFsm.BddFsm_get_fair_states(self._ptr),
-                             self.bddEnc.DDmanager)
-        return self._fair
+        while True:
+            trimmed = states & self.pre(states) & self.post(states)
+            if trimmed == states:
+                return states
+            states = trimmed
+
+    def _is_fair_scc(self, scc, fairness):
+        """
+        Return whether the strongly connected component `scc` is not trivial
+        and intersects all `fairness` constraints.
+
+        """
+        return ((scc & self.pre(scc)).isnot_false() and
+                all((scc & constraint).isnot_false()
+                    for constraint in fairness))
+
+    def sccs(self, restrict=None, algorithm="skeleton", skip_trivial=True,
+             stop_at_first_fair=False):
+        """
+        Return an iterator over the strongly connected components (SCCs) of
+        the graph of this FSM restricted to `restrict`, as BDDs. SCCs are
+        computed lazily, that is, the decomposition goes on only when the next
+        SCC is requested.
+
+        The available algorithms are:
+
+        * `"skeleton"`: the algorithm of Gentilini, Piazza and Policriti,
+          which uses a spine (a path computed during each forward search) to
+          choose the next seeds, and needs a linear number of symbolic steps;
+        * `"lockstep"`: the Lockstep algorithm of Bloem, Gabow and Somenzi,
+          which interleaves forward and backward searches from each seed.
+
+        An SCC is trivial if it is a single state without self-loop. An SCC is
+        fair if it is not trivial and intersects every fairness constraint of
+        this FSM.
+
+        :param restrict: the states to decompose; if `None`, the reachable
+                         states are used
+        :type restrict: :class:`BDD <pynusmv.dd.BDD>`
+        :param algorithm: the name of the algorithm to use
+        :param skip_trivial: whether or not trivial SCCs are skipped; if they
+                             are, states that cannot belong to a cycle are
+                             pruned before the decomposition starts
+        :param stop_at_first_fair: whether or not to stop the decomposition
+                                   after yielding the first fair SCC
+        :raise: a :exc:`ValueError` if `algorithm` is unknown
+
+        """
+        if algorithm == "skeleton":
+            decompose = self._skeleton_sccs
+        elif algorithm == "lockstep":
+            decompose = self._lockstep_sccs
+        else:
+            raise ValueError("Unknown SCC algorithm: " + str(algorithm))
+
+        if restrict is None:
+            restrict = self.reachable_states
+        if skip_trivial:
+            restrict = self._trim_both(restrict)
+        fairness = self.fairness_constraints if stop_at_first_fair else None
+
+        def components():
+            for scc in decompose(restrict):
+                if skip_trivial and (scc & self.pre(scc)).is_false():
+                    continue
+                yield scc
+                if fairness is not None and self._is_fair_scc(scc, fairness):
+                    return
+        return components()
+
+    def _skeleton_sccs(self, states):
+        """
+        Yield the strongly connected components of the subgraph induced by
+        `states`, computed with the skeleton-based algorithm of Gentilini,
+        Piazza and Policriti.
+
+        """
+        false = BDD.false(self)
+        # Each pending problem is a set of states, a spine (a path of states
+        # of the set) and the last node of the spine
+        pending = [(states & self.bddEnc.statesMask, false, None)]
+        while pending:
+            remaining, spine, node = pending.pop()
+            if remaining.is_false():
+                continue
+            if node is None:
+                node = self.pick_one_state(remaining)
+
+            forward, new_spine, new_node = self._skeleton_forward(remaining,
+                                                                  node)
+
+            # The SCC of node is the backward closure of node in forward
+            scc = node
+            frontier = node
+            while frontier.isnot_false():
+                frontier = (self.pre(frontier) & forward) - scc
+                scc = scc | frontier
+            yield scc
+
+            # The new end of the spine is its node preceding the SCC
+            rest = spine - scc
+            previous = self.pre(scc & spine) & rest
+            if previous.isnot_false():
+                previous = self.pick_one_state(previous)
+            else:
+                previous = None
+            pending.append((remaining - forward, rest, previous))
+            pending.append((forward - scc, new_spine - scc,
+                            new_node if (new_node - scc).isnot_false()
+                            else None))
+
+    def _skeleton_forward(self, states, node):
+        """
+        Return a triple `(forward, spine, last)` where `forward` is the set of
+        states of `states` reachable from `node`, `spine` is a shortest path
+        from `node` to a state of the last layer of the search, and `last` is
+        this last state.
+
+        """
+        layers = []
+        forward = BDD.false(self)
+        layer = node
+        while layer.isnot_false():
+            layers.append(layer)
+            forward = forward | layer
+            layer = (self.post(layer) & states) - forward
+
+        last = self.pick_one_state(layers.pop())
+        spine = last
+        current = last
+        while layers:
+            current = self.pick_one_state(self.pre(current) & layers.pop())
+            spine = spine | current
+        return forward, spine, last
+
+    def _lockstep_sccs(self, states):
+        """
+        Yield the strongly connected components of the subgraph induced by
+        `states`, computed with the Lockstep algorithm of Bloem, Gabow and
+        Somenzi.
+
+        """
+        pending = [states & self.bddEnc.statesMask]
+        while pending:
+            remaining = pending.pop()
+            if remaining.is_false():
+                continue
+            seed = self.pick_one_state(remaining)
+            forward, backward = seed, seed
+            ffront, bfront = seed, seed
+            # Search both directions until one of them converges
+            while ffront.isnot_false() and bfront.isnot_false():
+                ffront = (self.post(ffront) & remaining) - forward
+                forward = forward | ffront
+                bfront = (self.pre(bfront) & remaining) - backward
+                backward = backward | bfront
+            # Finish the other search inside the converged set
+            if ffront.is_false():
+                converged = forward
+                bfront = bfront & converged
+                while bfront.isnot_false():
+                    bfront = (self.pre(bfront) & converged) - backward
+                    backward = backward | bfront
+            else:
+                converged = backward
+                ffront = ffront & converged
+                while ffront.isnot_false():
+                    ffront = (self.post(ffront) & converged) - forward
+                    forward = forward | ffront
+            scc = forward & backward
+            yield scc
+            pending.append(converged - scc)
+            pending.append(remaining - converged)
 
     def pre(self, states, inputs=None):
         """
@@ -6,10 +6,16 @@ model checking, like CTL model checking.
 __all__ = ['check_ltl_spec', 'check_explain_ltl_spec',
            'check_ctl_spec', 'eval_simple_expression', 'eval_ctl_spec',
            'ef', 'eg', 'ex', 'eu', 'au',
-           'explain', 'explainEX', 'explainEU', 'explainEG']
+           'explain', 'explainEX', 'explainEU', 'explainEG',
+           'ShortestExplainer', 'LtlChecker', 'Counterexample']
 
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
 
 from pynusmv_lower_interface.nusmv.node import node as nsnode
+from pynusmv_lower_interface.nusmv.parser import parser as nsparser
 from pynusmv_lower_interface.nusmv.dd import dd as nsdd
 from pynusmv_lower_interface.nusmv.mc import mc as nsmc
 from pynusmv_lower_interface.nusmv.ltl import ltl as nsltl
@@ -18,33 +24,26 @@ from pynusmv_lower_interface.nusmv.compile import compile as nscompile
 from pynusmv_lower_interface.nusmv.opt import opt as nsopt
 from pynusmv_lower_interface.nusmv.fsm.bdd import bdd as nsfsmbdd
 from pynusmv_lower_interface.nusmv.enc.bdd import bdd as nsencbdd
+from pynusmv_lower_interface.nusmv.fsm.sexp import sexp as nssexp
 from pynusmv_lower_interface.nusmv.compile.symb_table import symb_table as \
                                                              nssymb_table
 
 from .dd import BDD, State, Inputs, BDDList, DDManager, Cube
 from .prop import atom, propTypes
+from . import prop
 from . import glob
 from .fsm import BddFsm
 
 
-def check_ltl_spec(spec):
+def _save_ltl_options():
     """
-    Return whether the loaded SMV model satisfies or not the LTL given `spec`.
-    That is, return whether all initial states of le model satisfies `spec` or
-    not.
+    Set the options needed by the forward Emerson-Lei LTL emptiness check,
+    if this algorithm is selected and the model has no compassion.
 
-    :param spec: a specification
-    :type spec: :class:`Spec <pynusmv.prop.Spec>`
-    :rtype: bool
+    :return: the saved options to give to :func:`_restore_ltl_options`, or
+             `None` if nothing has been changed
 
     """
-    # Check that a model has been compiled
-    assert(glob.prop_database().master is not None)
-    
-    # Create a property from the given spec
-    prop = nsprop.Prop_create_partial(spec._ptr, propTypes["LTL"])
-    
-    # Save settings
     o = nsopt.OptsHandler_get_enum_option_value(
             nsopt.OptsHandler_get_instance(),
             "oreg_justice_emptiness_bdd_algorithm")
@@ -54,31 +53,532 @@ def check_ltl_spec(spec):
             is None and
             o == nsfsmbdd.BDD_OREG_JUSTICE_EMPTINESS_BDD_ALGORITHM_EL_FWD):
         
-        saved_options = nsfsmbdd.Bdd_elfwd_check_set_and_save_options(
-                            nsfsmbdd.BDD_ELFWD_OPT_ALL)
+        return nsfsmbdd.Bdd_elfwd_check_set_and_save_options(
+                   nsfsmbdd.BDD_ELFWD_OPT_ALL)
     else:
-        saved_options = None
-    
-    # Create, build and check the structure for LTL model checking
-    ltl_struct = nsltl.Ltl_StructCheckLtlSpec_create(prop)
-    nsltl.Ltl_StructCheckLtlSpec_build(ltl_struct)
-    nsltl.Ltl_StructCheckLtlSpec_check(ltl_struct)
-    
-    # Get the result
-    result = nsprop.Prop_get_status(prop) == nsprop.Prop_True
-    
-    # Destroy the intermediate structure
-    nsltl.Ltl_StructCheckLtlSpec_destroy(ltl_struct)
-    
-    # Restore settings
+        return None
+
+
+def _restore_ltl_options(saved_options):
+    """
+    Restore the options saved by :func:`_save_ltl_options`.
+
+    :param saved_options: the result of :func:`_save_ltl_options`
+
+    """
     if saved_options is not None:
         nsfsmbdd.Bdd_elfwd_restore_options(nsfsmbdd.BDD_ELFWD_OPT_ALL,
                                            saved_options)
+
+
+def _shortest_path(fsm, source, target, within):
+    """
+    Return a shortest path of `fsm` of at least one step from `source` to a
+    state of `target`, through states of `within`, as a list of alternating
+    inputs and states (`source` excluded).
+
+    :raise: a :exc:`ValueError` if no state of `target` can be reached
+
+    """
+    layers = []
+    layer = fsm.post(source) & within
+    reached = layer
+    while (layer & target).is_false():
+        if layer.is_false():
+            raise ValueError("The target is unreachable from the source.")
+        layers.append(layer)
+        layer = (fsm.post(layer) & within) - reached
+        reached = reached | layer
+
+    current = fsm.pick_one_state(layer & target)
+    states = [current]
+    for layer in reversed(layers):
+        current = fsm.pick_one_state(fsm.pre(current) & layer)
+        states.insert(0, current)
+
+    path = []
+    previous = source
+    for current in states:
+        path.append(fsm.pick_one_inputs(
+                    fsm.get_inputs_between_states(previous, current)))
+        path.append(current)
+        previous = current
+    return path
+
+
+def _el_fwd_lasso(fsm, revfair):
+    """
+    Return a fair lasso-shaped path of `fsm` starting in an initial state,
+    given the non-empty set `revfair` of reachable states that are reachable
+    from a fair cycle, as computed by the forward Emerson-Lei algorithm.
+
+    The path is a list of alternating states and inputs, starting and ending
+    with a state; the last state also appears earlier in the path, where the
+    loop starts. The stem follows the forward layers of the reachable states
+    computed by the forward search.
+
+    :param fsm: the FSM
+    :type fsm: :class:`BddFsm <pynusmv.fsm.BddFsm>`
+    :param revfair: the reverse fair states of `fsm`
+    :type revfair: :class:`BDD <pynusmv.dd.BDD>`
+    :rtype: list
+
+    """
+    # Climb to a source SCC of revfair: since every state of revfair is
+    # reachable from a fair cycle inside revfair, such an SCC is fair and
+    # non-trivial
+    state = fsm.pick_one_state(revfair)
+    while True:
+        backward = state
+        frontier = state
+        while frontier.isnot_false():
+            frontier = (fsm.pre(frontier) & revfair) - backward
+            backward = backward | frontier
+        forward = state
+        frontier = state
+        while frontier.isnot_false():
+            frontier = (fsm.post(frontier) & backward) - forward
+            forward = forward | frontier
+        if (backward - forward).is_false():
+            break
+        state = fsm.pick_one_state(backward - forward)
+    scc = backward
+
+    # Loop from state through all fairness constraints, back to state
+    loop = [state]
+    for constraint in fsm.fairness_constraints:
+        loop.extend(_shortest_path(fsm, loop[-1], scc & constraint, scc))
+    loop.extend(_shortest_path(fsm, loop[-1], state, scc))
+
+    # Stem from an initial state to state, through the forward layers
+    diameter = nsfsmbdd.BddFsm_get_diameter(fsm._ptr)
+    layers = []
+    for distance in range(diameter):
+        layer = BDD(nsfsmbdd.BddFsm_get_reachable_states_at_distance(
+                        fsm._ptr, distance),
+                    fsm.bddEnc.DDmanager)
+        if (layer & state).isnot_false():
+            break
+        layers.append(layer)
+    stem = [state]
+    current = state
+    for layer in reversed(layers):
+        previous = fsm.pick_one_state(fsm.pre(current) & layer)
+        stem.insert(0, fsm.pick_one_inputs(
+                       fsm.get_inputs_between_states(previous, current)))
+        stem.insert(0, previous)
+        current = previous
+
+    return stem + loop[1:]
+
+
+def _explain_ltl_struct(fsm, ltl_struct):
+    """
+    Return a path of `fsm` violating the specification checked by
+    `ltl_struct`, a built and checked LTL structure whose property is false.
+
+    :param fsm: the FSM of the model
+    :type fsm: :class:`BddFsm <pynusmv.fsm.BddFsm>`
+    :param ltl_struct: the LTL model checking structure
+    :rtype: :class:`Counterexample`
+
+    """
+    bdd_fsm = BddFsm(ltl_struct.fsm)
     
-    # Destroy prop
-    nsprop.Prop_destroy(prop)
+    full_fairness = (not nsfsmbdd.FairnessList_is_empty(
+                         nsfsmbdd.compassionList2fairnessList(
+                         nsfsmbdd.BddFsm_get_compassion(bdd_fsm._ptr))))
+    
+    o = nsopt.OptsHandler_get_enum_option_value(
+            nsopt.OptsHandler_get_instance(),
+            "oreg_justice_emptiness_bdd_algorithm")
+    el_fwd = (not full_fairness and
+              o == nsfsmbdd.BDD_OREG_JUSTICE_EMPTINESS_BDD_ALGORITHM_EL_FWD)
+    
+    if el_fwd:
+        # s0 contains the reverse fair states of the tableau FSM
+        revfair = BDD(nsdd.bdd_dup(ltl_struct.s0),
+                      dd_manager=bdd_fsm.bddEnc.DDmanager)
+        exp = tuple(_el_fwd_lasso(bdd_fsm,
+                                  revfair & bdd_fsm.reachable_states))
+        return _ltl_counterexample(fsm, ltl_struct, exp)
+
+    tmp = BDD(nsencbdd.BddEnc_pick_one_state(ltl_struct.bdd_enc,
+                                             ltl_struct.s0),
+              dd_manager=DDManager(nsencbdd.BddEnc_get_dd_manager(
+                                   ltl_struct.bdd_enc)))
+    
+    if full_fairness:
+        exp = BDDList(nsltl.witness(bdd_fsm._ptr,
+                                    ltl_struct.bdd_enc,
+                                    tmp._ptr),
+                      ddmanager=tmp._manager)
+    else:
+        path = nsnode.cons(nsnode.bdd2node(nsdd.bdd_dup(tmp._ptr)), None)
+        exp = BDDList(nsnode.reverse(
+                      nsmc.explain(bdd_fsm._ptr,
+                                   ltl_struct.bdd_enc,
+                                   path,
+                                   ltl_struct.spec_formula,
+                                   None)),
+                      ddmanager=tmp._manager)
     
-    return result
+    if exp is None: # The counterexample consists of one initial state
+        exp = BDDList(nsnode.cons(nsnode.bdd2node(nsdd.bdd_dup(tmp._ptr)),
+                                  None),
+                      ddmanager=tmp._manager)
+    return _ltl_counterexample(fsm, ltl_struct, exp.to_tuple())
+
+
+def _ltl_counterexample(fsm, ltl_struct, exp):
+    """
+    Return the path `exp` of BDDs of the tableau FSM of `ltl_struct` as a
+    :class:`Counterexample` of `fsm`.
+
+    """
+    tableau_cube = Cube(nsencbdd.BddEnc_get_layer_vars_cube(
+                            ltl_struct.bdd_enc,
+                            ltl_struct.tableau_layer,
+                            nssymb_table.VFT_ALL),
+                        dd_manager=fsm.bddEnc.DDmanager)
+    return Counterexample(fsm, exp, tableau_cube)
+
+
+class Counterexample(Sequence):
+    """
+    A path of the model violating an LTL specification, as returned by
+    :func:`check_explain_ltl_spec`.
+
+    A counterexample behaves as a tuple of alternating states and inputs,
+    starting and ending with a state, represented by dictionaries where keys
+    are state and inputs variables of the model, and values are their value:
+    it compares equal to and concatenates as the tuple of its decoded steps.
+    The path is looping if the last state is somewhere else in the sequence,
+    at index :attr:`loop_start`.
+
+    The steps are kept as BDDs and are only decoded into dictionaries when
+    accessed; the tableau variables are removed from the BDDs at the same
+    time. Note that removing these variables may show unexistent loops in
+    the decoded path.
+
+    """
+
+    def __init__(self, fsm, bdds, tableau_cube):
+        """
+        Create a new counterexample.
+
+        :param fsm: the FSM of the model
+        :type fsm: :class:`BddFsm <pynusmv.fsm.BddFsm>`
+        :param bdds: the alternating states and inputs of the path, as BDDs
+                     of the tableau FSM
+        :param tableau_cube: the cube of the tableau variables
+        :type tableau_cube: :class:`Cube <pynusmv.dd.Cube>`
+
+        """
+        self.fsm = fsm
+        self._bdds = tuple(bdds)
+        self._tableau_cube = tableau_cube
+        self._cleaned = [None] * len(self._bdds)
+        self._values = [None] * len(self._bdds)
+
+        last = self._bdds[-1]
+        self._loop_start = next((index for index, state
+                                 in enumerate(self._bdds[:-1:2])
+                                 if state == last), None)
+        if self._loop_start is not None:
+            self._loop_start *= 2
+
+    @property
+    def loop_start(self):
+        """
+        The index of the state at which the loop of this path starts, that is,
+        the first state equal to the last one, or `None` if this path does not
+        loop.
+
+        """
+        return self._loop_start
+
+    def bdd(self, index):
+        """
+        Return the state or inputs at `index`, as a BDD without tableau
+        variables.
+
+        :param int index: the index of the step in the path
+        :rtype: :class:`BDD <pynusmv.dd.BDD>`
+
+        """
+        index = range(len(self._bdds))[index]
+        if self._cleaned[index] is None:
+            self._cleaned[index] = self._bdds[index].forsome(
+                                       self._tableau_cube)
+        return self._cleaned[index]
+
+    def __len__(self):
+        return len(self._bdds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(len(self))[index])
+        index = range(len(self._bdds))[index]
+        if self._values[index] is None:
+            if index % 2 == 0:
+                step = self.fsm.pick_one_state(self.bdd(index))
+            else:
+                step = self.fsm.pick_one_inputs(self.bdd(index))
+            self._values[index] = step.get_str_values()
+        return self._values[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (Counterexample, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    # as the tuple of its dictionaries, a counterexample is not hashable
+    __hash__ = None
+
+    def __add__(self, other):
+        if isinstance(other, (Counterexample, tuple)):
+            return tuple(self) + tuple(other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, tuple):
+            return other + tuple(self)
+        return NotImplemented
+
+    def __repr__(self):
+        return "Counterexample({} states, loop_start={})".format(
+                   len(self) // 2 + 1, self.loop_start)
+
+    def to_trace(self, description="LTL Counterexample"):
+        """
+        Return this counterexample as a NuSMV trace. If the path loops, the
+        step of :attr:`loop_start` is marked as the loopback of the trace,
+        and the trace is frozen.
+
+        :param str description: the description of the trace
+        :rtype: :class:`Trace <pynusmv.trace.Trace>`
+
+        """
+        from .trace import Trace, TraceType
+
+        master = glob.prop_database().master
+        symbols = nssexp.SexpFsm_get_symbols_list(
+                      nsprop.Prop_get_scalar_sexp_fsm(master._ptr))
+        path = BDDList.from_tuple(tuple(self.bdd(index)
+                                        for index in range(len(self))))
+        trace = Trace(nsmc.Mc_create_trace_from_bdd_state_input_list(
+                          self.fsm.bddEnc._ptr,
+                          symbols,
+                          description,
+                          TraceType.COUNTER_EXAMPLE,
+                          path._ptr),
+                      freeit=True)
+        if self.loop_start is not None:
+            trace.freeze()
+            trace.steps[self.loop_start // 2 + 1].force_loopback()
+        return trace
+
+
+class LtlChecker(object):
+    """
+    An LTL model checker for the loaded SMV model, amortizing the setup
+    work over many specifications.
+
+    The emptiness check options are set once when the checker is created,
+    and restored when it is closed. The tableau built for each checked
+    specification is kept until the checker is closed, such that checking
+    an equal specification again does not build a new tableau; the verdict
+    of a conjunction is also derived from the cached verdicts of its
+    conjuncts, when they are known.
+
+    A checker must be closed with :meth:`close` to free the tableaux and
+    restore the options; it can also be used as a context manager::
+
+        with LtlChecker(fsm) as checker:
+            for spec in specs:
+                print(spec, checker.check(spec))
+
+    """
+
+    def __init__(self, fsm=None):
+        """
+        Create a new checker for the LTL specifications of the loaded model.
+
+        :param fsm: the FSM of the model; if `None`, the FSM of the master
+                    property of the propositions database is used
+        :type fsm: :class:`BddFsm <pynusmv.fsm.BddFsm>`
+        :raise: a :exc:`ValueError` if `fsm` is not the FSM of the master
+                property
+
+        .. note:: NuSMV always checks LTL specifications against the FSM of
+                  the master property, thus it is the only one supported.
+
+        """
+        # Check that a model has been compiled
+        assert(glob.prop_database().master is not None)
+        master = glob.prop_database().master.bddFsm
+        if fsm is None:
+            fsm = master
+        elif fsm != master:
+            raise ValueError("An LtlChecker only supports the FSM of the "
+                             "master property.")
+        self.fsm = fsm
+        self._saved_options = _save_ltl_options()
+        self._closed = False
+        # spec -> (prop, ltl_struct), in creation order
+        self._structs = {}
+        self._order = []
+        self._verdicts = {}
+        self._explanations = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        """Whether this checker has been closed."""
+        return self._closed
+
+    def close(self):
+        """
+        Free all the tableaux built by this checker and restore the options
+        changed when creating it. Closing an already closed checker has no
+        effect.
+
+        """
+        if self._closed:
+            return
+        for spec in reversed(self._order):
+            prop, ltl_struct = self._structs[spec]
+            nsltl.Ltl_StructCheckLtlSpec_destroy(ltl_struct)
+            nsprop.Prop_destroy(prop)
+        self._structs = {}
+        self._order = []
+        self._verdicts = {}
+        self._explanations = {}
+        _restore_ltl_options(self._saved_options)
+        self._saved_options = None
+        self._closed = True
+
+    def check(self, spec):
+        """
+        Return whether the loaded SMV model satisfies or not the LTL given
+        `spec`.
+
+        :param spec: a specification
+        :type spec: :class:`Spec <pynusmv.prop.Spec>`
+        :rtype: bool
+        :raise: a :exc:`ValueError` if this checker is closed
+
+        """
+        spec = self._normalize(spec)
+        verdict, _ = self._lookup(spec)
+        if verdict is None:
+            verdict = self._check(spec)
+        return verdict
+
+    def check_explain(self, spec):
+        """
+        Return whether the loaded SMV model satisfies or not the LTL given
+        `spec`, and an explanation if it does not, as
+        :func:`check_explain_ltl_spec`.
+
+        :param spec: a specification
+        :type spec: :class:`Spec <pynusmv.prop.Spec>`
+        :rtype: tuple
+        :raise: a :exc:`ValueError` if this checker is closed
+
+        """
+        spec = self._normalize(spec)
+        verdict, violated = self._lookup(spec)
+        if verdict is None:
+            verdict = self._check(spec)
+            violated = spec
+        if verdict:
+            return (True, None)
+        if violated not in self._explanations:
+            _, ltl_struct = self._structs[violated]
+            self._explanations[violated] = _explain_ltl_struct(self.fsm,
+                                                               ltl_struct)
+        return (False, self._explanations[violated])
+
+    def _normalize(self, spec):
+        """
+        Return the hash-consed version of `spec`, such that equal
+        specifications share the same node (and thus the same cache entries)
+        even when they were parsed separately.
+
+        """
+        return prop.Spec(nsnode.node_normalize(spec._ptr))
+
+    def _lookup(self, spec):
+        """
+        Return the cached verdict of `spec` (or `None` if unknown) and a
+        cached specification violated by the model and implied by `spec`
+        (or `None` if there is none).
+
+        """
+        if self._closed:
+            raise ValueError("Cannot check a spec with a closed LtlChecker.")
+        if spec in self._verdicts:
+            verdict = self._verdicts[spec]
+            return verdict, (None if verdict else spec)
+        if spec.type == nsparser.AND:
+            left, violated = self._lookup(spec.car)
+            if left is False:
+                return False, violated
+            right, violated = self._lookup(spec.cdr)
+            if right is False:
+                return False, violated
+            if left and right:
+                return True, None
+        return None, None
+
+    def _check(self, spec):
+        """
+        Build and check the tableau of `spec`, cache it and its verdict and
+        return the verdict.
+
+        """
+        # Create a property from the given spec
+        prop = nsprop.Prop_create_partial(spec._ptr, propTypes["LTL"])
+        
+        # Create, build and check the structure for LTL model checking
+        ltl_struct = nsltl.Ltl_StructCheckLtlSpec_create(prop)
+        nsltl.Ltl_StructCheckLtlSpec_build(ltl_struct)
+        nsltl.Ltl_StructCheckLtlSpec_check(ltl_struct)
+        
+        self._structs[spec] = (prop, ltl_struct)
+        self._order.append(spec)
+        verdict = nsprop.Prop_get_status(prop) == nsprop.Prop_True
+        self._verdicts[spec] = verdict
+        return verdict
+
+
+def check_ltl_spec(spec):
+    """
+    Return whether the loaded SMV model satisfies or not the LTL given `spec`.
+    That is, return whether all initial states of le model satisfies `spec` or
+    not.
+
+    To check many specifications, an :class:`LtlChecker` avoids repeating the
+    setup for each of them.
+
+    :param spec: a specification
+    :type spec: :class:`Spec <pynusmv.prop.Spec>`
+    :rtype: bool
+
+    """
+    with LtlChecker() as checker:
+        return checker.check(spec)
 
 
 def check_explain_ltl_spec(spec):
@@ -92,120 +592,20 @@ def check_explain_ltl_spec(spec):
     `spec` is satisfied, and the second element is either `None` if the first
     element is `True`, or a path of the SMV model violating `spec` otherwise.
     
-    The explanation is a tuple of alternating states and inputs, starting and
-    ennding with a state. The path is looping if the last state is somewhere
-    else in the sequence. States and inputs are represented by dictionaries
-    where keys are state and inputs variable of the loaded SMV model, and
-    values are their value.
+    The explanation is a :class:`Counterexample`, behaving as a tuple of
+    alternating states and inputs, starting and ennding with a state. The path
+    is looping if the last state is somewhere else in the sequence, at index
+    :attr:`Counterexample.loop_start`. States and inputs are represented by
+    dictionaries where keys are state and inputs variable of the loaded SMV
+    model, and values are their value; they are decoded when accessed.
 
     :param spec: a specification
     :type spec: :class:`Spec <pynusmv.prop.Spec>`
     :rtype: tuple
 
     """
-    # Check that a model has been compiled
-    assert(glob.prop_database().master is not None)
-    
-    # Create a property from the given spec
-    prop = nsprop.Prop_create_partial(spec._ptr, propTypes["LTL"])
-    
-    # Save settings
-    o = nsopt.OptsHandler_get_enum_option_value(
-            nsopt.OptsHandler_get_instance(),
-            "oreg_justice_emptiness_bdd_algorithm")
-    if (nscompile.
-            FlatHierarchy_get_compassion(glob.
-                                         global_compile_flathierarchy())
-            is None and
-            o == nsfsmbdd.BDD_OREG_JUSTICE_EMPTINESS_BDD_ALGORITHM_EL_FWD):
-        
-        saved_options = nsfsmbdd.Bdd_elfwd_check_set_and_save_options(
-                            nsfsmbdd.BDD_ELFWD_OPT_ALL)
-    else:
-        saved_options = None
-    
-    # Create, build and check the structure for LTL model checking
-    ltl_struct = nsltl.Ltl_StructCheckLtlSpec_create(prop)
-    nsltl.Ltl_StructCheckLtlSpec_build(ltl_struct)
-    nsltl.Ltl_StructCheckLtlSpec_check(ltl_struct)
-    
-    # Get the result
-    result = nsprop.Prop_get_status(prop) == nsprop.Prop_True
-    
-    # explain
-    if not result:
-        # Extract explanation
-        bdd_fsm = BddFsm(ltl_struct.fsm)
-        
-        full_fairness = (not nsfsmbdd.FairnessList_is_empty(
-                             nsfsmbdd.compassionList2fairnessList(
-                             nsfsmbdd.BddFsm_get_compassion(bdd_fsm._ptr))))
-        
-        # Counterexample construction for forward Emerson-Lei not yet
-        # implemented
-        assert(full_fairness or not o)
-
-        tmp = BDD(nsencbdd.BddEnc_pick_one_state(ltl_struct.bdd_enc,
-                                                 ltl_struct.s0),
-                  dd_manager=DDManager(nsencbdd.BddEnc_get_dd_manager(
-                                       ltl_struct.bdd_enc)))
-        
-        if full_fairness:
-            exp = BDDList(nsltl.witness(bdd_fsm._ptr,
-                                        ltl_struct.bdd_enc,
-                                        tmp._ptr),
-                          ddmanager=tmp._manager)
-        else:
-            path = nsnode.cons(nsnode.bdd2node(nsdd.bdd_dup(tmp._ptr)), None)
-            exp = BDDList(nsnode.reverse(
-                          nsmc.explain(bdd_fsm._ptr,
-                                       ltl_struct.bdd_enc,
-                                       path,
-                                       ltl_struct.spec_formula,
-                                       None)),
-                          ddmanager=tmp._manager)
-        
-        if exp is None: # The counterexample consists of one initial state
-            exp = BDDList(nsnode.cons(nsnode.bdd2node(nsdd.bdd_dup(tmp._ptr)),
-                                      None),
-                          ddmanager=tmp._manager)
-        exp = exp.to_tuple()
-
-        # removes all the tableau variables from the result before
-        # building the resulting trace. This will make simulation
-        # working, but may show unexistent loops in the shown trace
-        def clean(bdd):
-            tableau_cube = Cube(nsencbdd.BddEnc_get_layer_vars_cube(
-                                    ltl_struct.bdd_enc,
-                                    ltl_struct.tableau_layer,
-                                    nssymb_table.VFT_ALL),
-                                dd_manager=bdd._manager)
-            return bdd.forsome(tableau_cube)
-        
-        # exp has at least one element
-        explanation = [bdd_fsm.pick_one_state(clean(exp[0])).get_str_values()]
-        for inputs_bdd, state_bdd in zip(exp[1::2], exp[2::2]):
-            explanation.append(bdd_fsm.pick_one_inputs(
-                               clean(inputs_bdd))
-                               .get_str_values())
-            explanation.append(bdd_fsm.pick_one_state(
-                               clean(state_bdd))
-                               .get_str_values())
-    else:
-        explanation = None
-    
-    # Destroy the intermediate structure
-    nsltl.Ltl_StructCheckLtlSpec_destroy(ltl_struct)
-    
-    # Restore settings
-    if saved_options is not None:
-        nsfsmbdd.Bdd_elfwd_restore_options(nsfsmbdd.BDD_ELFWD_OPT_ALL,
-                                           saved_options)
-    
-    # Destroy prop
-    nsprop.Prop_destroy(prop)
-    
-    return (result, explanation if explanation is None else tuple(explanation))
+    with LtlChecker() as checker:
+        return checker.check_explain(spec)
 
 
 def check_ctl_spec(fsm, spec, context=None):
@@ -503,3 +903,330 @@ def explainEG(fsm, state, a):
         path.insert(0, inputs)
         path.insert(0, curstate)
     return (tuple(path), (loopinputs, loopstate))
+
+
+class ShortestExplainer(object):
+
+    """
+    An explainer producing short witnesses for CTL formulas.
+
+    Contrary to :func:`explain`, :func:`explainEU` and :func:`explainEG`,
+    which return any witness, a ShortestExplainer uses the onion rings of the
+    `E[a U b]` fixpoints to build minimal-length prefixes, and builds lassos
+    for `EG a` made of a shortest path to a fair strongly connected component
+    followed by a shortest cycle in this component (going through every
+    fairness constraint, if any).
+
+    The onion rings, the sets of states satisfying subformulas and the fair
+    components of `EG` subformulas are cached, such that explaining many
+    states for the same specification is cheap. The cache depends on the FSM;
+    a new explainer must be created if the FSM changes.
+
+    """
+
+    def __init__(self, fsm):
+        """
+        Create a new explainer for `fsm`.
+
+        :param fsm: the system
+        :type fsm: :class:`BddFsm <pynusmv.fsm.BddFsm>`
+
+        """
+        self._fsm = fsm
+        self._sat = {}
+        self._rings = {}
+        self._components = {}
+
+    @property
+    def fsm(self):
+        """
+        The FSM of this explainer.
+
+        """
+        return self._fsm
+
+    def explain(self, state, spec, context=None):
+        """
+        Explain why `state` of the FSM satisfies `spec` in `context`.
+
+        Return a tuple `t` composed of states
+        (:class:`State <pynusmv.dd.State>`) and inputs
+        (:class:`Inputs <pynusmv.dd.Inputs>`), such that `t[0]` is `state`
+        and `t` represents a path of the FSM explaining why `state` satisfies
+        `spec` in `context`, as for :func:`explain`. The returned path is
+        looping if the last state of path is equal to a previous state along
+        the path.
+
+        :param state: a state of the FSM satisfying `spec`
+        :type state: :class:`State <pynusmv.dd.State>`
+        :param spec: a CTL specification
+        :type spec: :class:`Spec <pynusmv.prop.Spec>`
+        :param context: the context in which evaluate `spec`
+        :type context: :class:`Spec <pynusmv.prop.Spec>`
+
+        """
+        return tuple(self._explain(state, spec, context))
+
+    def explain_ex(self, state, a):
+        """
+        Explain why `state` satisfies `EX phi`, where `a` is the set of states
+        satisfying `phi`. The result has the same format as the one of
+        :func:`explainEX`.
+
+        """
+        inputs, successor = self._step(state, a & self._fsm.fair_states)
+        return (state, inputs, successor)
+
+    def explain_eu(self, state, a, b):
+        """
+        Explain why `state` satisfies `E[phi U psi]` with a shortest path,
+        where `a` and `b` are the sets of states satisfying `phi` and `psi`.
+        The result has the same format as the one of :func:`explainEU`.
+
+        :raise: a :exc:`ValueError` if `state` does not satisfy the formula
+
+        """
+        return tuple(self._eu_path(state, a, b))
+
+    def explain_eg(self, state, a):
+        """
+        Explain why `state` satisfies `EG phi` with a short lasso, where `a`
+        is the set of states satisfying `phi`. The result has the same format
+        as the one of :func:`explainEG`.
+
+        :raise: a :exc:`ValueError` if `state` does not satisfy the formula
+
+        """
+        path = self._eg_path(state, a)
+        return (tuple(path[:-2]), (path[-2], path[-1]))
+
+    # =========================================================================
+    # ===== Cached sets =======================================================
+    # =========================================================================
+
+    def _sat_states(self, spec, context):
+        """
+        Return the set of states satisfying `spec` in `context`.
+
+        """
+        key = (spec, context)
+        if key not in self._sat:
+            self._sat[key] = eval_ctl_spec(self._fsm, spec, context)
+        return self._sat[key]
+
+    def _onion_rings(self, a, b):
+        """
+        Return the onion rings of `E[a U b]`: the i-th ring is the set of
+        states whose shortest fair path through `a` to `b` has length i.
+
+        """
+        key = (a, b)
+        if key not in self._rings:
+            fsm = self._fsm
+            ring = b & fsm.fair_states
+            reached = ring
+            rings = []
+            while ring.isnot_false():
+                rings.append(ring)
+                ring = (a & fsm.pre(ring)) - reached
+                reached = reached | ring
+            self._rings[key] = rings
+        return self._rings[key]
+
+    def _fair_components(self, a):
+        """
+        Return a pair `(eg, components)` where `eg` is the set of states
+        satisfying `EG a` and `components` is the list of the fair strongly
+        connected components of `eg`.
+
+        """
+        if a not in self._components:
+            fsm = self._fsm
+            states = eg(fsm, a)
+            fairness = fsm.fairness_constraints
+            components = [scc for scc in fsm.sccs(restrict=states)
+                          if all((scc & constraint).isnot_false()
+                                 for constraint in fairness)]
+            self._components[a] = (states, components)
+        return self._components[a]
+
+    # =========================================================================
+    # ===== Path construction =================================================
+    # =========================================================================
+
+    def _step(self, state, target):
+        """
+        Return a pair `(inputs, successor)` where `successor` is a successor
+        of `state` in `target`, reached through `inputs`.
+
+        """
+        fsm = self._fsm
+        successor = fsm.pick_one_state(fsm.post(state) & target)
+        inputs = fsm.pick_one_inputs(fsm.get_inputs_between_states(state,
+                                                                   successor))
+        return inputs, successor
+
+    def _shortest_path(self, source, target, within):
+        """
+        Return a shortest path of at least one step from `source` to a state
+        of `target`, through states of `within`, as a list of alternating
+        inputs and states (`source` excluded).
+
+        """
+        return _shortest_path(self._fsm, source, target, within)
+
+    def _eu_path(self, state, a, b):
+        """
+        Return a shortest path from `state` witnessing `E[a U b]`, as a list.
+
+        """
+        rings = self._onion_rings(a, b)
+        for index, ring in enumerate(rings):
+            if (state & ring).isnot_false():
+                break
+        else:
+            raise ValueError("The state does not satisfy the formula.")
+
+        path = [state]
+        current = state
+        for ring in reversed(rings[:index]):
+            inputs, current = self._step(current, ring)
+            path.append(inputs)
+            path.append(current)
+        return path
+
+    def _eg_path(self, state, a):
+        """
+        Return a lasso from `state` witnessing `EG a`, as a list ending with
+        the inputs and the state closing the loop.
+
+        """
+        fsm = self._fsm
+        states, components = self._fair_components(a)
+        cycles = BDD.false(fsm)
+        for component in components:
+            cycles = cycles | component
+        if (state & states).is_false() or cycles.is_false():
+            raise ValueError("The state does not satisfy the formula.")
+
+        # Shortest prefix to a fair component
+        path = self._eu_path(state, states, cycles)
+        loopstate = path[-1]
+
+        # Shortest cycle through all fairness constraints in the component
+        component = next(component for component in components
+                         if (loopstate & component).isnot_false())
+        for constraint in fsm.fairness_constraints:
+            path.extend(self._shortest_path(path[-1], constraint & component,
+                                            component))
+        path.extend(self._shortest_path(path[-1], loopstate, component))
+        # Close the loop on the same state object
+        path[-1] = loopstate
+        return path
+
+    def _explain(self, state, spec, context):
+        """
+        Return a path from `state` explaining why it satisfies `spec` in
+        `context`, as a list.
+
+        """
+        fsm = self._fsm
+        kind = spec.type
+
+        if kind == nsparser.CONTEXT:
+            return self._explain(state, spec.cdr, spec.car)
+
+        elif kind == nsparser.NOT:
+            negated = self._negate(spec.car)
+            if negated is None:
+                return [state]
+            return self._explain(state, negated, context)
+
+        elif kind == nsparser.AND:
+            path = self._explain(state, spec.car, context)
+            if len(path) == 1:
+                path = self._explain(state, spec.cdr, context)
+            return path
+
+        elif kind == nsparser.OR:
+            if (state & self._sat_states(spec.car, context)).isnot_false():
+                return self._explain(state, spec.car, context)
+            return self._explain(state, spec.cdr, context)
+
+        elif kind == nsparser.IMPLIES:
+            if (state & self._sat_states(spec.car, context)).is_false():
+                return self._explain(state, prop.not_(spec.car), context)
+            return self._explain(state, spec.cdr, context)
+
+        elif kind == nsparser.EX:
+            inputs, successor = self._step(
+                state,
+                self._sat_states(spec.car, context) & fsm.fair_states)
+            return self._extend([state, inputs, successor], spec.car,
+                                context)
+
+        elif kind == nsparser.EF:
+            path = self._eu_path(state, BDD.true(fsm),
+                                 self._sat_states(spec.car, context))
+            return self._extend(path, spec.car, context)
+
+        elif kind == nsparser.EU:
+            path = self._eu_path(state, self._sat_states(spec.car, context),
+                                 self._sat_states(spec.cdr, context))
+            return self._extend(path, spec.cdr, context)
+
+        elif kind == nsparser.EW:
+            until = prop.eu(spec.car, spec.cdr)
+            if (state & self._sat_states(until, context)).isnot_false():
+                return self._explain(state, until, context)
+            return self._explain(state, prop.eg(spec.car), context)
+
+        elif kind == nsparser.EG:
+            return self._eg_path(state, self._sat_states(spec.car, context))
+
+        else:
+            return [state]
+
+    def _extend(self, path, spec, context):
+        """
+        Extend `path` with the explanation of why its last state satisfies
+        `spec` in `context`.
+
+        """
+        return path + self._explain(path[-1], spec, context)[1:]
+
+    def _negate(self, spec):
+        """
+        Return a specification equivalent to `NOT spec` whose top operator is
+        not a negation, or `None` if `NOT spec` has no path witness.
+
+        """
+        kind = spec.type
+        if kind == nsparser.NOT:
+            return spec.car
+        elif kind == nsparser.AND:
+            return prop.or_(prop.not_(spec.car), prop.not_(spec.cdr))
+        elif kind == nsparser.OR:
+            return prop.and_(prop.not_(spec.car), prop.not_(spec.cdr))
+        elif kind == nsparser.IMPLIES:
+            return prop.and_(spec.car, prop.not_(spec.cdr))
+        elif kind == nsparser.AX:
+            return prop.ex(prop.not_(spec.car))
+        elif kind == nsparser.AF:
+            return prop.eg(prop.not_(spec.car))
+        elif kind == nsparser.AG:
+            return prop.ef(prop.not_(spec.car))
+        elif kind == nsparser.AU:
+            # !A[a U b] = E[!b U (!a & !b)] | EG !b
+            return prop.or_(prop.eu(prop.not_(spec.cdr),
+                                    prop.and_(prop.not_(spec.car),
+                                              prop.not_(spec.cdr))),
+                            prop.eg(prop.not_(spec.cdr)))
+        elif kind == nsparser.AW:
+            # !A[a W b] = E[!b U (!a & !b)]
+            return prop.eu(prop.not_(spec.cdr),
+                           prop.and_(prop.not_(spec.car),
+                                     prop.not_(spec.cdr)))
+        else:
+            return None
+
@@ -0,0 +1,910 @@
+"""
+The :mod:`pynusmv.mucalc` module provides a small mu-calculus on top of BDD
+encoded FSMs. It is meant to prototype logics (ATL, epistemic logics, fair CTL
+variants,...) whose semantics is naturally expressed as nested fixpoints over
+:meth:`pre <pynusmv.fsm.BddFsm.pre>` and
+:meth:`post <pynusmv.fsm.BddFsm.post>`.
+
+* :class:`Term` and its subclasses represent mu-calculus terms. Terms are
+  immutable and compared structurally, such that equal subterms share the
+  same cache entries. They are built with :func:`true`, :func:`false`,
+  :func:`atom`, :func:`expression`, :func:`var`, :func:`not_`, :func:`and_`,
+  :func:`or_`, :func:`pre`, :func:`post`, :func:`mu` and :func:`nu`,
+  with the ``&``, ``|`` and ``~`` operators, or parsed from a string with
+  :func:`parse`.
+* :class:`Evaluator` evaluates terms on a given
+  :class:`BddFsm <pynusmv.fsm.BddFsm>`.
+* :func:`evaluate` is a shortcut to evaluate one term with a fresh evaluator.
+
+The evaluator implements the Emerson-Lei optimization: the last fixpoint
+computed for each fixpoint subterm is kept, and used as starting point of the
+next computation of that subterm whenever the values of its free variables
+evolved in the right direction (grew for a least fixpoint, shrank for a
+greatest fixpoint). Inner fixpoints are thus only restarted from scratch when
+an enclosing fixpoint of the opposite kind changes, which makes the cost of
+nested fixpoints of the same kind linear instead of quadratic.
+
+For instance, the fair states of a model with fairness constraints `f1` and
+`f2` can be computed with::
+
+    fair = parse("nu Z. pre(mu Y. (Z & f1) | pre(Y))"
+                 "    & pre(mu Y. (Z & f2) | pre(Y))",
+                 atoms={"f1": f1, "f2": f2})
+    states = evaluate(fsm, fair)
+
+"""
+
+
+__all__ = ['Term', 'Constant', 'Atom', 'Expression', 'Variable', 'Not', 'And',
+           'Or', 'Pre', 'Post', 'Fixpoint', 'Mu', 'Nu', 'Evaluator',
+           'true', 'false', 'atom', 'expression', 'var', 'not_', 'and_',
+           'or_', 'pre', 'post', 'mu', 'nu', 'parse', 'evaluate']
+
+
+from functools import reduce
+
+from pyparsing import (Word, Forward, Keyword, Literal, Suppress, Regex,
+                       ZeroOrMore, alphas, alphanums, ParseException)
+
+from .dd import BDD
+from .mc import eval_simple_expression
+from .utils import AttributeDict
+from .exception import MuCalculusError
+
+
+class Term(object):
+
+    """
+    A mu-calculus term.
+
+    Terms are immutable. Two terms are equal if they have the same structure
+    (and the same atoms). The free variables of a term are available through
+    :attr:`free_vars`; a term can only be evaluated if all its free variables
+    are given a value.
+
+    """
+
+    def __init__(self, *children):
+        self._children = children
+        self._hash = None
+        self._vars = None
+
+    @property
+    def children(self):
+        """
+        The direct subterms (or other components) of this term.
+
+        """
+        return self._children
+
+    @property
+    def free_vars(self):
+        """
+        The names of the free variables of this term, as a frozenset.
+
+        """
+        return self._polarities()[0] | self._polarities()[1]
+
+    @property
+    def positive_vars(self):
+        """
+        The names of the free variables appearing under an even number of
+        negations in this term.
+
+        """
+        return self._polarities()[0]
+
+    @property
+    def negative_vars(self):
+        """
+        The names of the free variables appearing under an odd number of
+        negations in this term.
+
+        """
+        return self._polarities()[1]
+
+    def _polarities(self):
+        """
+        Return the pair of frozensets of positive and negative free variables
+        of this term, computed once.
+
+        """
+        if self._vars is None:
+            self._vars = self._compute_polarities()
+        return self._vars
+
+    def _compute_polarities(self):
+        """
+        Return the pair of frozensets of positive and negative free variables
+        of this term.
+
+        """
+        positive, negative = frozenset(), frozenset()
+        for child in self._subterms():
+            positive |= child.positive_vars
+            negative |= child.negative_vars
+        return positive, negative
+
+    def substitute(self, mapping):
+        """
+        Return a copy of this term in which every free variable whose name is
+        a key of `mapping` is replaced by the corresponding term.
+
+        :param mapping: a dictionary of variable names to terms
+        :rtype: :class:`Term`
+
+        """
+        if not self.free_vars & set(mapping):
+            return self
+        return type(self)(*(child.substitute(mapping)
+                            if isinstance(child, Term) else child
+                            for child in self._children))
+
+    def _subterms(self):
+        """
+        Return the children of this term that are terms.
+
+        """
+        return (child for child in self._children if isinstance(child, Term))
+
+    def _evaluate(self, evaluator, env, previous):
+        """
+        Compute the value of this term with `evaluator`, given the values of
+        its free variables in `env`. `previous` is the last (key, value) pair
+        computed for this term by `evaluator`, or `None`.
+
+        """
+        raise NotImplementedError()
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        return (type(self) is type(other) and
+                self._children == other._children)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((type(self),) + self._children)
+        return self._hash
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+
+class Constant(Term):
+
+    """
+    The TRUE or FALSE constant.
+
+    """
+
+    def __init__(self, value):
+        super(Constant, self).__init__(bool(value))
+
+    @property
+    def value(self):
+        """
+        The boolean value of this constant.
+
+        """
+        return self._children[0]
+
+    def _evaluate(self, evaluator, env, previous):
+        if self.value:
+            return BDD.true(evaluator.fsm)
+        else:
+            return BDD.false(evaluator.fsm)
+
+    def __str__(self):
+        return "TRUE" if self.value else "FALSE"
+
+
+class Atom(Term):
+
+    """
+    An atomic proposition given as a BDD.
+
+    """
+
+    def __init__(self, bdd, name=None):
+        super(Atom, self).__init__(bdd)
+        self._name = name
+
+    @property
+    def bdd(self):
+        """
+        The BDD of this atom.
+
+        """
+        return self._children[0]
+
+    @property
+    def name(self):
+        """
+        The name of this atom, if any.
+
+        """
+        return self._name
+
+    def substitute(self, mapping):
+        return self
+
+    def _evaluate(self, evaluator, env, previous):
+        return self.bdd
+
+    def __str__(self):
+        return self._name if self._name is not None else "<atom>"
+
+
+class Expression(Term):
+
+    """
+    An atomic proposition given as an SMV simple expression, evaluated on the
+    FSM of the evaluator.
+
+    """
+
+    def __init__(self, sexp):
+        super(Expression, self).__init__(sexp)
+
+    @property
+    def sexp(self):
+        """
+        The string of this simple expression.
+
+        """
+        return self._children[0]
+
+    def substitute(self, mapping):
+        return self
+
+    def _evaluate(self, evaluator, env, previous):
+        return eval_simple_expression(evaluator.fsm, self.sexp)
+
+    def __str__(self):
+        return "{" + self.sexp + "}"
+
+
+class Variable(Term):
+
+    """
+    A variable, bound by an enclosing fixpoint or given a value when
+    evaluating the term.
+
+    """
+
+    def __init__(self, name):
+        super(Variable, self).__init__(name)
+
+    @property
+    def name(self):
+        """
+        The name of this variable.
+
+        """
+        return self._children[0]
+
+    def _compute_polarities(self):
+        return frozenset((self.name,)), frozenset()
+
+    def substitute(self, mapping):
+        return mapping.get(self.name, self)
+
+    def _evaluate(self, evaluator, env, previous):
+        return env[self.name]
+
+    def __str__(self):
+        return self.name
+
+
+class Not(Term):
+
+    """
+    The negation of a term.
+
+    """
+
+    def __init__(self, term):
+        super(Not, self).__init__(term)
+
+    def _compute_polarities(self):
+        return self._children[0].negative_vars, self._children[0].positive_vars
+
+    def _evaluate(self, evaluator, env, previous):
+        return ~evaluator._evaluate(self._children[0], env)
+
+    def __str__(self):
+        return "~" + _str_operand(self._children[0])
+
+
+class And(Term):
+
+    """
+    The conjunction of two terms.
+
+    """
+
+    def __init__(self, left, right):
+        super(And, self).__init__(left, right)
+
+    def _evaluate(self, evaluator, env, previous):
+        left = evaluator._evaluate(self._children[0], env)
+        if left.is_false():
+            return left
+        return left & evaluator._evaluate(self._children[1], env)
+
+    def __str__(self):
+        return "({} & {})".format(*self._children)
+
+
+class Or(Term):
+
+    """
+    The disjunction of two terms.
+
+    """
+
+    def __init__(self, left, right):
+        super(Or, self).__init__(left, right)
+
+    def _evaluate(self, evaluator, env, previous):
+        left = evaluator._evaluate(self._children[0], env)
+        if left.is_true():
+            return left
+        return left | evaluator._evaluate(self._children[1], env)
+
+    def __str__(self):
+        return "({} | {})".format(*self._children)
+
+
+class Pre(Term):
+
+    """
+    The pre-image of a term, possibly through the given inputs.
+
+    """
+
+    def __init__(self, term, inputs=None):
+        super(Pre, self).__init__(term, inputs)
+
+    @property
+    def inputs(self):
+        """
+        The inputs (a BDD) through which the pre-image is taken, or `None`.
+
+        """
+        return self._children[1]
+
+    def _evaluate(self, evaluator, env, previous):
+        return evaluator.fsm.pre(evaluator._evaluate(self._children[0], env),
+                                 self.inputs)
+
+    def __str__(self):
+        return "pre({})".format(self._children[0])
+
+
+class Post(Term):
+
+    """
+    The post-image of a term, possibly through the given inputs.
+
+    """
+
+    def __init__(self, term, inputs=None):
+        super(Post, self).__init__(term, inputs)
+
+    @property
+    def inputs(self):
+        """
+        The inputs (a BDD) through which the post-image is taken, or `None`.
+
+        """
+        return self._children[1]
+
+    def _evaluate(self, evaluator, env, previous):
+        return evaluator.fsm.post(evaluator._evaluate(self._children[0], env),
+                                  self.inputs)
+
+    def __str__(self):
+        return "post({})".format(self._children[0])
+
+
+class Fixpoint(Term):
+
+    """
+    Superclass of the least and greatest fixpoints. A fixpoint binds the
+    variable `name` in `body`; `name` must only appear under an even number of
+    negations in `body`.
+
+    """
+
+    def __init__(self, name, body):
+        if name in body.negative_vars:
+            raise MuCalculusError("Variable {} appears negatively in {}."
+                                  .format(name, body))
+        super(Fixpoint, self).__init__(name, body)
+
+    @property
+    def name(self):
+        """
+        The name of the variable bound by this fixpoint.
+
+        """
+        return self._children[0]
+
+    @property
+    def body(self):
+        """
+        The body of this fixpoint.
+
+        """
+        return self._children[1]
+
+    def _compute_polarities(self):
+        return (self.body.positive_vars - {self.name},
+                self.body.negative_vars - {self.name})
+
+    def substitute(self, mapping):
+        mapping = {name: term for name, term in mapping.items()
+                   if name != self.name}
+        if not self.free_vars & set(mapping):
+            return self
+        return type(self)(self.name, self.body.substitute(mapping))
+
+    def _start(self, evaluator):
+        """
+        Return the starting point of the computation of this fixpoint when no
+        approximation can be reused.
+
+        """
+        raise NotImplementedError()
+
+    def _reusable(self, old, new):
+        """
+        Return whether the fixpoint computed when the free variables had the
+        `old` values is a valid starting point when they have the `new`
+        values.
+
+        """
+        raise NotImplementedError()
+
+    def _monotonic(self, low, high):
+        """
+        Return whether the body of this fixpoint denotes a smaller set when its
+        free variables have the `low` values than when they have the `high`
+        values (both sorted by variable name). The body is monotonic in the
+        variables appearing positively and anti-monotonic in the variables
+        appearing negatively.
+
+        """
+        for name, l, h in zip(sorted(self.free_vars), low, high):
+            if name in self.positive_vars and not l <= h:
+                return False
+            if name in self.negative_vars and not h <= l:
+                return False
+        return True
+
+    def _evaluate(self, evaluator, env, previous):
+        key = evaluator._key(self, env)
+        if previous is not None and self._reusable(previous[0], key):
+            evaluator.stats.reused += 1
+            approx = previous[1]
+        else:
+            approx = self._start(evaluator)
+
+        env = dict(env)
+        while True:
+            env[self.name] = approx
+            evaluator.stats.iterations += 1
+            new = evaluator._evaluate(self.body, env)
+            if new == approx:
+                return approx
+            approx = new
+
+
+class Mu(Fixpoint):
+
+    """
+    The least fixpoint of a term.
+
+    """
+
+    def _start(self, evaluator):
+        return BDD.false(evaluator.fsm)
+
+    def _reusable(self, old, new):
+        # The least fixpoint can only grow if the body grows
+        return self._monotonic(old, new)
+
+    def __str__(self):
+        return "(mu {}. {})".format(self.name, self.body)
+
+
+class Nu(Fixpoint):
+
+    """
+    The greatest fixpoint of a term.
+
+    """
+
+    def _start(self, evaluator):
+        return BDD.true(evaluator.fsm)
+
+    def _reusable(self, old, new):
+        # The greatest fixpoint can only shrink if the body shrinks
+        return self._monotonic(new, old)
+
+    def __str__(self):
+        return "(nu {}. {})".format(self.name, self.body)
+
+
+def _str_operand(term):
+    """
+    Return the string representation of `term`, between parentheses if needed.
+
+    """
+    s = str(term)
+    if isinstance(term, (Fixpoint, Not)) and not s.startswith("("):
+        return "(" + s + ")"
+    return s
+
+
+class Evaluator(object):
+
+    """
+    An evaluator of mu-calculus terms on a given FSM.
+
+    The evaluator keeps, for every term it evaluated, the last value computed
+    together with the values of the free variables of the term at that time.
+    This cache serves two purposes:
+
+    * repeated subterms (closed subterms, or open subterms evaluated again
+      with the same values for their free variables) are computed only once;
+    * the last value of each fixpoint subterm is reused as the starting point
+      of its next computation whenever possible (Emerson-Lei optimization).
+
+    The cache depends on the FSM; it must be cleared with :meth:`clear_cache`
+    if the transition relation of the FSM is replaced.
+
+    """
+
+    def __init__(self, fsm):
+        """
+        Create a new evaluator for `fsm`.
+
+        :param fsm: the FSM on which terms are evaluated
+        :type fsm: :class:`BddFsm <pynusmv.fsm.BddFsm>`
+
+        """
+        self._fsm = fsm
+        self._cache = {}
+        self._names = {}
+        self.stats = AttributeDict(evaluations=0, hits=0, iterations=0,
+                                   reused=0)
+
+    @property
+    def fsm(self):
+        """
+        The FSM of this evaluator.
+
+        """
+        return self._fsm
+
+    @property
+    def cache(self):
+        """
+        The result cache of this evaluator: a dictionary associating each
+        evaluated term to a pair `(values, bdd)` where `values` is the tuple of
+        values of the free variables of the term (sorted by name) and `bdd` is
+        the value of the term for these values.
+
+        """
+        return self._cache
+
+    def clear_cache(self):
+        """
+        Clear the result cache of this evaluator.
+
+        """
+        self._cache.clear()
+        self._names.clear()
+
+    def evaluate(self, term, env=None):
+        """
+        Return the set of states of the FSM satisfying `term`, given the values
+        of its free variables in `env`.
+
+        :param term: the term to evaluate
+        :type term: :class:`Term`
+        :param env: a dictionary of variable names to BDDs; must give a value
+                    to every free variable of `term`
+        :rtype: :class:`BDD <pynusmv.dd.BDD>`
+        :raise: a :exc:`MuCalculusError <pynusmv.exception.MuCalculusError>`
+                if some free variable of `term` has no value in `env`
+
+        """
+        env = dict(env) if env is not None else {}
+        missing = term.free_vars - set(env)
+        if missing:
+            raise MuCalculusError("Unbound variables: " +
+                                  ", ".join(sorted(missing)))
+        return self._evaluate(term, env)
+
+    def _key(self, term, env):
+        """
+        Return the values of the free variables of `term` in `env`, sorted by
+        variable name.
+
+        """
+        names = self._names.get(term)
+        if names is None:
+            names = self._names[term] = tuple(sorted(term.free_vars))
+        return tuple(env[name] for name in names)
+
+    def _evaluate(self, term, env):
+        """
+        Return the value of `term` in `env`, using the cache if possible.
+
+        """
+        if isinstance(term, Variable):
+            return env[term.name]
+        key = self._key(term, env)
+        previous = self._cache.get(term)
+        if previous is not None and previous[0] == key:
+            self.stats.hits += 1
+            return previous[1]
+        self.stats.evaluations += 1
+        value = term._evaluate(self, env, previous)
+        self._cache[term] = (key, value)
+        return value
+
+
+# =============================================================================
+# ===== Term construction =====================================================
+# =============================================================================
+
+def true():
+    """
+    Return the TRUE term.
+
+    :rtype: :class:`Constant`
+
+    """
+    return Constant(True)
+
+
+def false():
+    """
+    Return the FALSE term.
+
+    :rtype: :class:`Constant`
+
+    """
+    return Constant(False)
+
+
+def atom(bdd, name=None):
+    """
+    Return the atomic term corresponding to `bdd`.
+
+    :param bdd: the set of states satisfying the atom
+    :type bdd: :class:`BDD <pynusmv.dd.BDD>`
+    :param name: an optional name, used to print the term
+    :rtype: :class:`Atom`
+
+    """
+    return Atom(bdd, name)
+
+
+def expression(sexp):
+    """
+    Return the atomic term corresponding to the SMV simple expression `sexp`.
+
+    :param sexp: a simple expression, as a string
+    :rtype: :class:`Expression`
+
+    """
+    return Expression(sexp)
+
+
+def var(name):
+    """
+    Return the variable `name`.
+
+    :rtype: :class:`Variable`
+
+    """
+    return Variable(name)
+
+
+def not_(term):
+    """
+    Return the term `~term`.
+
+    :rtype: :class:`Not`
+
+    """
+    return Not(term)
+
+
+def and_(left, right):
+    """
+    Return the term `left & right`.
+
+    :rtype: :class:`And`
+
+    """
+    return And(left, right)
+
+
+def or_(left, right):
+    """
+    Return the term `left | right`.
+
+    :rtype: :class:`Or`
+
+    """
+    return Or(left, right)
+
+
+def pre(term, inputs=None):
+    """
+    Return the term `pre(term)`, through `inputs` if not `None`.
+
+    :rtype: :class:`Pre`
+
+    """
+    return Pre(term, inputs)
+
+
+def post(term, inputs=None):
+    """
+    Return the term `post(term)`, through `inputs` if not `None`.
+
+    :rtype: :class:`Post`
+
+    """
+    return Post(term, inputs)
+
+
+def mu(name, body):
+    """
+    Return the least fixpoint `mu name. body`.
+
+    :rtype: :class:`Mu`
+    :raise: a :exc:`MuCalculusError <pynusmv.exception.MuCalculusError>`
+            if `name` appears negatively in `body`
+
+    """
+    return Mu(name, body)
+
+
+def nu(name, body):
+    """
+    Return the greatest fixpoint `nu name. body`.
+
+    :rtype: :class:`Nu`
+    :raise: a :exc:`MuCalculusError <pynusmv.exception.MuCalculusError>`
+            if `name` appears negatively in `body`
+
+    """
+    return Nu(name, body)
+
+
+# =============================================================================
+# ===== Parsing ===============================================================
+# =============================================================================
+
+def _build_grammar():
+    """
+    Return the pyparsing parser of mu-calculus terms.
+
+    """
+    term = Forward()
+
+    keywords = (Keyword("mu") | Keyword("nu") | Keyword("pre") |
+                Keyword("post") | Keyword("TRUE") | Keyword("FALSE"))
+    identifier = ~keywords + Word(alphas + "_", alphanums + "_")
+
+    constant = Keyword("TRUE") | Keyword("FALSE")
+    constant.setParseAction(lambda s, l, t: Constant(t[0] == "TRUE"))
+
+    sexp = Suppress("{") + Regex(r"[^}]+") + Suppress("}")
+    sexp.setParseAction(lambda s, l, t: Expression(t[0].strip()))
+
+    variable = identifier.copy()
+    variable.setParseAction(lambda s, l, t: Variable(t[0]))
+
+    image = ((Keyword("pre") | Keyword("post")) +
+             Suppress("(") + term + Suppress(")"))
+    image.setParseAction(lambda s, l, t: Pre(t[1]) if t[0] == "pre"
+                         else Post(t[1]))
+
+    fixpoint = ((Keyword("mu") | Keyword("nu")) + identifier +
+                Suppress(".") + term)
+    fixpoint.setParseAction(lambda s, l, t: Mu(t[1], t[2]) if t[0] == "mu"
+                            else Nu(t[1], t[2]))
+
+    primary = (fixpoint | image | constant | sexp | variable |
+               Suppress("(") + term + Suppress(")"))
+
+    negation = Forward()
+    negation << ((Suppress(Literal("~") | Literal("!")) + negation)
+                 .setParseAction(lambda s, l, t: Not(t[0])) | primary)
+
+    conjunction = negation + ZeroOrMore(Suppress("&") + negation)
+    conjunction.setParseAction(lambda s, l, t: reduce(And, t))
+
+    disjunction = conjunction + ZeroOrMore(Suppress("|") + conjunction)
+    disjunction.setParseAction(lambda s, l, t: reduce(Or, t))
+
+    term << disjunction
+    return term
+
+_grammar = None
+
+
+def parse(string, atoms=None):
+    """
+    Parse `string` as a mu-calculus term.
+
+    The syntax is the following:
+
+    * `TRUE` and `FALSE` are the constants;
+    * `{sexp}` is an SMV simple expression, e.g. `{admin = alice}`;
+    * identifiers are variables, unless they are keys of `atoms`;
+    * `~t` (or `!t`), `t1 & t2` and `t1 | t2` are the boolean connectives;
+    * `pre(t)` and `post(t)` are the pre- and post-images;
+    * `mu X. t` and `nu X. t` are the least and greatest fixpoints; their body
+      extends as far to the right as possible.
+
+    :param string: the string to parse
+    :param atoms: a dictionary of names to BDDs or terms; free identifiers of
+                  the parsed term that are keys of `atoms` are replaced by the
+                  corresponding atoms
+    :rtype: :class:`Term`
+    :raise: a :exc:`MuCalculusError <pynusmv.exception.MuCalculusError>`
+            if `string` cannot be parsed
+
+    """
+    global _grammar
+    if _grammar is None:
+        _grammar = _build_grammar()
+    try:
+        term = _grammar.parseString(string, parseAll=True)[0]
+    except ParseException as e:
+        raise MuCalculusError("Cannot parse {} (at char {}).".format(string,
+                                                                   e.loc))
+    if atoms:
+        term = term.substitute({name: value if isinstance(value, Term)
+                                else Atom(value, name)
+                                for name, value in atoms.items()})
+    return term
+
+
+def evaluate(fsm, term, env=None):
+    """
+    Return the set of states of `fsm` satisfying `term`, given the values of
+    its free variables in `env`. A fresh :class:`Evaluator` is used; use an
+    evaluator directly to share the cache between several evaluations.
+
+    :param fsm: the concerned FSM
+    :type fsm: :class:`BddFsm <pynusmv.fsm.BddFsm>`
+    :param term: the term to evaluate
+    :type term: :class:`Term` or string (parsed with :func:`parse`)
+    :param env: a dictionary of variable names to BDDs
+    :rtype: :class:`BDD <pynusmv.dd.BDD>`
+
+    """
+    if not isinstance(term, Term):
+        term = parse(term)
+    return Evaluator(fsm).evaluate(term, env)
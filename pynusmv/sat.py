@@ -9,6 +9,20 @@ from pynusmv             import utils
 from pynusmv.collections import Slist, IntConversion
 from pynusmv.utils       import writeonly
 from pynusmv_lower_interface.nusmv.utils.utils import int_to_void_star
+from pynusmv_lower_interface.bmc_utils import bmc_utils as _bmc_utils
+from pynusmv.exception   import NuSmvSatSolverError
+from pynusmv.bmc         import dimacs
+from array               import array
+
+import os
+import subprocess
+import threading
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class SatSolverResult(IntEnum):
@@ -100,6 +114,19 @@ class SatSolverFactory():
                 return SatSolver(
                                 _sat.Sat_CreateNonIncSolver(name))
         raise Exception("Could not create solver")
+    
+    @staticmethod
+    def create_external(command, args=(), timeout=None):
+        """
+        Creates a new solver running the external solver binary `command` 
+        (see :class:`ExternalSatSolver`).
+        
+        :param command: the path to the solver binary
+        :param args: the command line arguments passed to the solver
+        :param timeout: the maximum time (in seconds) granted to each solving
+        :return: a new :class:`ExternalSatSolver`
+        """
+        return ExternalSatSolver(command, args, timeout)
         
 class SatSolver(utils.PointerWrapper):
     """
@@ -113,6 +140,7 @@ class SatSolver(utils.PointerWrapper):
         """
         assert(ptr is not None)
         super().__init__(ptr, freeit=freeit)
+        self._conflicts = []
         
     def _free(self):
         """
@@ -192,6 +220,32 @@ class SatSolver(utils.PointerWrapper):
         group_ptr = _sat.SatSolver_get_permanent_group(self._as_SatSolver_ptr())
         _sat.SatSolver_add(self._as_SatSolver_ptr(), cnf._ptr, group_ptr)
     
+    def add_clauses(self, literals, offsets, group=None):
+        """
+        Adds a bunch of clauses at once to the given `group` of this solver (the
+        permanent group by default). The clauses are encoded in two flat arrays
+        of ints as those returned by :meth:`pynusmv.be.expression.BeCnf.to_arrays`:
+        the ith clause is `literals[offsets[i]:offsets[i+1]]`.
+        
+        The clauses are added as is: there is no formula literal whose polarity
+        should be set.
+        
+        :param literals: the CNF literals of all the clauses (a NumPy array or
+          any sequence of ints)
+        :param offsets: the position of the first literal of each clause in 
+          `literals` followed by the total number of literals.
+        :param group: the group to which the clauses are added.
+        :return: the number of clauses that were added
+        :raise ValueError: when the offsets are not consistent with the literals
+        """
+        grp = self.permanent_group if group is None else group
+        res = _bmc_utils.sat_add_clauses(self._as_SatSolver_ptr(), grp,
+                                         _int32_buffer(literals),
+                                         _int32_buffer(offsets))
+        if res < 0:
+            raise ValueError("The offsets are not consistent with the literals")
+        return res
+    
     def __iadd__(self, cnf):
         """
         Adds syntax sugar to post cnf clauses to the solver's permanent group
@@ -213,18 +267,81 @@ class SatSolver(utils.PointerWrapper):
         me = self._as_SatSolver_ptr()
         _sat.SatSolver_set_polarity(me, be_cnf._ptr, polarity, grp)
     
-    def solve(self):
+    def solve(self, assumptions=None):
         """
         Tries to solve all the clauses of the (permanent group of the) solver and
         returns the flag.
         
+        When `assumptions` are given, the problem is solved under the hypothesis
+        that all these literals hold (without adding any clause to the solver).
+        Whenever the problem turns out to be unsatisfiable, the subset of the
+        assumptions responsible for the failure is then available through
+        :attr:`conflicts`. This is much cheaper than adding (and destroying) a
+        temporary group to check one hypothesis.
+        
+        .. note::
+            Solving under assumptions is only available with MiniSat.
+        
+        :param assumptions: an iterable of CNF literals (ints, the negative
+          ones standing for the negated variables). For instance, the 
+          `cnf_literal` of a :class:`pynusmv.be.encoder.BeVar` or the 
+          `formula_literal` of a :class:`pynusmv.be.expression.BeCnf` whose 
+          clauses were added to the solver without polarity.
         :return: the outcome of the solving (value in SatSolverResult)
+        :raise NuSmvSatSolverError: when assumptions are given to a solver 
+          which does not support them.
         """
-        # Note: an optional 'assumptions' parameter was initially foreseen to 
-        # call SatSolver_solve_all_groups_assume(...) but it turns out that this
-        # api always triggers segfaults when called (it tries to free 'conflict'
-        # which is NULL.
-        return SatSolverResult(_sat.SatSolver_solve_all_groups(self._as_SatSolver_ptr()))
+        if assumptions is None:
+            self._conflicts = []
+            return SatSolverResult(_sat.SatSolver_solve_all_groups(self._as_SatSolver_ptr()))
+        return self._solve_assume(assumptions, None)
+    
+    def _solve_assume(self, assumptions, groups):
+        """
+        Solves the `groups` (or all groups when it is None) under the given
+        `assumptions` and memorizes the final conflict if any.
+        
+        :return: the outcome of the solving (value in SatSolverResult)
+        """
+        # Note: SatSolver_solve_all_groups_assume(...) always triggers segfaults
+        # when called (it tries to free 'conflict' which is NULL). Hence, the 
+        # C helper talks to MiniSat directly.
+        if self.name != 'MiniSat':
+            raise NuSmvSatSolverError(
+                "Solving under assumptions is only supported by MiniSat")
+        me    = self._as_SatSolver_ptr()
+        lits  = Slist.from_list(assumptions, IntConversion())
+        olist = None
+        if groups is not None:
+            olist = _utils.Olist_create()
+            for g in groups:
+                _utils.Olist_append(olist, int_to_void_star(g))
+        try:
+            result = SatSolverResult(_bmc_utils.sat_solve_assume(me, lits._ptr, olist))
+        finally:
+            if olist is not None:
+                _utils.Olist_destroy(olist)
+        
+        self._conflicts = []
+        if result == SatSolverResult.UNSATISFIABLE:
+            self._conflicts = list(Slist(_bmc_utils.sat_conflict(me), IntConversion()))
+        return result
+    
+    @property
+    def conflicts(self):
+        """
+        Returns the final conflict of the last solving performed under 
+        assumptions: the subset of the assumptions which suffices to make the
+        problem unsatisfiable (an UNSAT core over the assumptions).
+        
+        .. note::
+            The list is empty when the last solving was not performed under
+            assumptions, when it succeeded or when the problem is unsatisfiable
+            regardless of the assumptions.
+        
+        :return: a list of the conflicting assumptions (CNF literals)
+        """
+        return list(self._conflicts)
     
     @property
     def model(self):
@@ -241,6 +358,94 @@ class SatSolver(utils.PointerWrapper):
         lst = _sat.SatSolver_get_model(self._as_SatSolver_ptr())
         return Slist(lst, IntConversion(), freeit=False)
     
+    # =========================================================================
+    # ============== Interpolation ============================================
+    # =========================================================================
+    @property
+    def supports_interpolation(self):
+        """
+        Tells whether or not interpolants can be extracted from this solver.
+        This is the case when the solver is a MiniSat instance created with the
+        proof logging capability (see :meth:`SatSolverFactory.create`) *and*
+        NuSMV was built against a proof logging MiniSat (that is to say with
+        the `MINISAT_WITH_PROOF_LOGGING` flag).
+
+        :return: True iff this solver can be used to compute interpolants
+        """
+        return isinstance(self, (SatProofSolver, SatIncProofSolver)) \
+           and self.name == 'MiniSat' \
+           and bool(_bmc_utils.sat_interpolation_enabled())
+
+    def _check_interpolation(self):
+        """
+        :raise NuSmvSatSolverError: when this solver does not support the
+          interpolation
+        """
+        if not self.supports_interpolation:
+            raise NuSmvSatSolverError(
+                "{} does not support interpolation (a proof logging MiniSat "
+                "is required)".format(repr(self)))
+
+    @property
+    def curr_itp_group(self):
+        """
+        Every clause added to the solver belongs to the interpolation group
+        which is current at the time of its addition. Interpolation groups are
+        orthogonal to the (incremental) solving groups: they only serve to
+        split the problem in the A and B parts of an interpolation query.
+
+        :return: the current interpolation group of this solver
+        :raise NuSmvSatSolverError: when this solver does not support the
+          interpolation
+        """
+        self._check_interpolation()
+        return _sat.SatSolver_curr_itp_group(self._as_SatSolver_ptr())
+
+    def new_itp_group(self):
+        """
+        Creates a new interpolation group and makes it the current one: all
+        the clauses added from now on belong to that group.
+
+        :return: the id of the newly created interpolation group
+        :raise NuSmvSatSolverError: when this solver does not support the
+          interpolation
+        """
+        self._check_interpolation()
+        return _sat.SatSolver_new_itp_group(self._as_SatSolver_ptr())
+
+    def interpolant(self, groups, manager):
+        """
+        Extracts a Craig interpolant from the proof of unsatisfiability of the
+        last problem solved by this solver. The A part of the problem consists
+        of the clauses of the interpolation `groups` and the B part of all the
+        other clauses. The interpolant is implied by A, is inconsistent with B
+        and only refers to the variables shared by A and B.
+
+        .. note::
+            The previous solving call should have returned UNSATISFIABLE.
+
+        .. note::
+            The cnf variables of the subformulas occurring in both A and B are
+            shared as well: the interpolant refers to them through these
+            subformulas. This is only sound when the clauses define them with
+            an equivalence, hence the CNF formulas should be produced with the
+            :attr:`pynusmv.be.expression.CnfEncoding.TSEITIN` encoding.
+
+        :param groups: an iterable of the interpolation groups (see
+          :meth:`new_itp_group`) making the A part of the problem
+        :param manager: the :class:`pynusmv.be.manager.BeManager` that was used
+          to build the CNF formulas fed to this solver
+        :return: the interpolant as a :class:`pynusmv.be.expression.Be`
+        :raise NuSmvSatSolverError: when this solver does not support the
+          interpolation
+        """
+        from pynusmv.be.expression import Be
+        self._check_interpolation()
+        lst = Slist.from_list(groups, IntConversion())
+        ptr = _bmc_utils.sat_interpolant(self._as_SatSolver_ptr(),
+                                         manager._ptr, lst._ptr)
+        return Be(ptr, manager)
+
     def __repr__(self):
         """
         :return: a string representation of this solver (mostly usefule for
@@ -248,35 +453,6 @@ class SatSolver(utils.PointerWrapper):
         """
         return self.__class__.__name__+" ( "+self.name+" )"
 
-################################################################################
-# Provokes a SEGFAULT whenever called.
-################################################################################       
-#     @property
-#     def conflicts(self):
-#         """
-#         Returns the set of conflicting assumptions.
-#         
-#         .. note::
-#         
-#           - At the time being, the use of this function is only allowed on 
-#             instances of MiniSat 
-#           - This function should be used only after solve or solve_all_groups 
-#             with a set of assumptions different from None
-#           - More information about inc. solving under assumption:
-#               PHD Thesis:
-#               Sörensson, N. (2008). Effective SAT solving. 
-#               Department of Computer Science and Engineering
-#               University of GOTHENBURG, Sweden.
-#               
-#           
-#         :return: an Slist of int which represent the indices of the conflict
-#            literals in the CNF being sat solved. 
-#         """
-#         # this functionality is only available for SatMiniSAT
-#         assert(self.name == 'MiniSat')
-#         lst = _sat.SatSolver_get_conflicts(self._as_SatSolver_ptr())
-#         return Slist(lst, IntConversion())
-
 ################################################################################
 # NEVER USED IN NUSMV, hence not exposed
 ################################################################################  
@@ -408,7 +584,7 @@ class SatIncSolver(SatSolver):
         me = self._as_SatSolver_ptr()
         _sat.SatSolver_add(me, cnf._ptr, group)
         
-    def solve_groups(self, groups):
+    def solve_groups(self, groups, assumptions=None):
         """
         Tries to solve formulas from the groups in the list.
         
@@ -416,9 +592,16 @@ class SatIncSolver(SatSolver):
             - The permanent group is automatically added to the list.
             - the model property may be accessed iff this function returns
               SatSolverResult.SATISFIABLE
-              
+        
+        :param groups: the groups to solve
+        :param assumptions: an optional iterable of CNF literals assumed to hold
+          during the solving (see :meth:`SatSolver.solve`)
         :return: a flag whether the solving was successful.
         """
+        if assumptions is not None:
+            return self._solve_assume(assumptions, groups)
+        
+        self._conflicts = []
         me   = self._as_SatIncSolver_ptr()
         olist= _utils.Olist_create()
         for g in groups:
@@ -444,6 +627,7 @@ class SatIncSolver(SatSolver):
         if self.permanent_group in groups:
             raise ValueError("The permanent group may be in the groups_olist")
         
+        self._conflicts = []
         me   = self._as_SatIncSolver_ptr()
         olist= _utils.Olist_create()
         for g in groups:
@@ -453,31 +637,16 @@ class SatIncSolver(SatSolver):
         _utils.Olist_destroy(olist)
         return SatSolverResult(result)
     
-    def solve_all_groups(self):
+    def solve_all_groups(self, assumptions=None):
         """
         Solves all groups belonging to the solver and returns the flag
         
+        :param assumptions: an optional iterable of CNF literals assumed to hold
+          during the solving (see :meth:`SatSolver.solve`)
         :return: the outcome of the solving (value in SatSolverResult)
         """
-        # Note: an optional 'assumptions' parameter was initially foreseen to 
-        # call SatSolver_solve_all_groups_assume(...) but it turns out that this
-        # api always triggers segfaults when called (it tries to free 'conflict'
-        # which is NULL.
-        return self.solve()
+        return self.solve(assumptions)
 
-###############################################################################
-# Not documented in the C code, so not exposed !         
-###############################################################################         
-#     @property
-#     def curr_itp_group(self):
-#         # FIXME : not documented ...
-#         return _sat.SatSolver_curr_itp_group(self._as_SatSolver_ptr())
-#     
-#     def new_itp_group(self):
-#         # FIXME : not documented ...
-#         return _sat.SatSolver_new_itp_group(self._as_SatSolver_ptr())
-###############################################################################
-    
 class SatIncProofSolver(SatIncSolver):
     """
     This type is simply a 'marker' type meant to show that this kind of solver
@@ -493,4 +662,240 @@ class SatProofSolver(SatSolver):
     """
     def __init__(self, ptr, freeit=True):
         super().__init__(ptr, freeit=freeit)
-    
\ No newline at end of file
+    
+
+class ExternalSatSolver(SatSolver):
+    """
+    This class bridges an external sat solver binary (any solver reading a 
+    DIMACS problem on its standard input and printing its answer in the format
+    of the SAT competitions) with PyNuSMV.
+    
+    The clauses are recorded on the python side and the whole problem is 
+    streamed to a fresh solver process upon each solving. The outcome (model
+    and solving time) is then recorded in a stand-in NuSMV solver which is
+    never solved itself. Hence, :attr:`model` is exposed as for any other 
+    solver and the functions reading the model of a solver (for instance
+    :meth:`pynusmv.be.encoder.BeEnc.decode_sat_model` or 
+    :func:`pynusmv.bmc.utils.generate_counter_example`) work unchanged.
+    
+    .. note::
+        An external solver is neither incremental nor proof logging: all the
+        clauses belong to the permanent group.
+    """
+    def __init__(self, command, args=(), timeout=None):
+        """
+        Creates a new external solver
+        
+        :param command: the path to the solver binary
+        :param args: the command line arguments passed to the solver
+        :param timeout: the maximum time (in seconds) granted to each solving
+          (None means no limit)
+        """
+        super().__init__(_sat.Sat_CreateNonIncSolver('MiniSat'))
+        self._command = command
+        self._args    = list(args)
+        self._timeout = timeout
+        self._clauses = []    # pairs (literals, offsets) of flat buffers
+        self._max_var = 0
+        self._false   = False # True when the false constant was asserted
+    
+    @property
+    def name(self):
+        """:return: the name of the solver binary"""
+        return os.path.basename(self._command)
+    
+    @writeonly
+    def random_mode(self, seed):
+        """
+        Random mode can not be set from here: pass the relevant command line
+        `args` to the constructor instead.
+        
+        :raise NuSmvSatSolverError: always
+        """
+        raise NuSmvSatSolverError(
+            "The random mode of an external solver must be set on its command line")
+    
+    def _check_group(self, group):
+        """
+        :raise NuSmvSatSolverError: when `group` is not the permanent group
+        """
+        if group is not None and group != self.permanent_group:
+            raise NuSmvSatSolverError("An external solver only has a permanent group")
+    
+    def add(self, cnf):
+        """
+        Adds a CNF formula to the problem of this solver (see 
+        :meth:`SatSolver.add`).
+        
+        :param cnf: a BeCnf representing a boolean expression encoded in CNF
+        """
+        # as in NuSMV, constants are only taken into account by polarity()
+        if cnf.formula_literal == dimacs.CONSTANT_LITERAL:
+            return
+        self._clauses.append(cnf._flatten(int32_zeros))
+        self._max_var = max(self._max_var, cnf.max_var_index)
+    
+    def add_clauses(self, literals, offsets, group=None):
+        """
+        Adds a bunch of clauses at once to the problem of this solver (see 
+        :meth:`SatSolver.add_clauses`).
+        
+        :param literals: the CNF literals of all the clauses
+        :param offsets: the position of the first literal of each clause in 
+          `literals` followed by the total number of literals.
+        :param group: the group to which the clauses are added (must be the 
+          permanent group).
+        :return: the number of clauses that were added
+        :raise ValueError: when the offsets are not consistent with the literals
+        :raise NuSmvSatSolverError: when `group` is not the permanent group
+        """
+        self._check_group(group)
+        literals = array('i', literals)
+        offsets  = array('i', offsets)
+        if len(offsets) < 1 or offsets[0] != 0 or offsets[-1] != len(literals)\
+        or any(offsets[i] < offsets[i-1] for i in range(1, len(offsets))):
+            raise ValueError("The offsets are not consistent with the literals")
+        
+        self._clauses.append((literals, offsets))
+        self._max_var = max([self._max_var] + [abs(l) for l in literals])
+        return len(offsets) - 1
+    
+    def polarity(self, be_cnf, polarity, group=None):
+        """
+        Asserts the formula literal of `be_cnf` with the given `polarity`.
+        
+        :param be_cnf: a BeCnf formula whose polarity is to be set
+        :param polarity: the new polarity
+        :param group: the group on which the polarity applies (must be the 
+          permanent group).
+        :raise NuSmvSatSolverError: when `group` is not the permanent group
+        """
+        self._check_group(group)
+        literal = be_cnf.formula_literal
+        if literal == dimacs.CONSTANT_LITERAL:
+            # the true constant has no clause
+            constant = 1 if be_cnf.clauses_number == 0 else -1
+            self._false |= constant * polarity < 0
+            return
+        self._clauses.append((array('i', [polarity * literal]), array('i', [0, 1])))
+        self._max_var = max(self._max_var, abs(literal))
+    
+    def solve(self, assumptions=None):
+        """
+        Streams the problem to a new process of the solver and returns the 
+        outcome of the solving.
+        
+        The `assumptions` are added to the problem as unit clauses for this 
+        solving only. Since the solver process does not report the final
+        conflict, :attr:`conflicts` remains empty.
+        
+        :param assumptions: an iterable of CNF literals assumed to hold.
+        :return: the outcome of the solving (value in SatSolverResult). 
+          INTERNAL_ERROR is returned when the answer of the solver can not be
+          understood and TIMEOUT when the solver did not answer in time.
+        :raise NuSmvSatSolverError: when the solver binary can not be executed
+        """
+        self._conflicts = []
+        units = list(assumptions) if assumptions is not None else []
+        if self._false:
+            return self._outcome(SatSolverResult.UNSATISFIABLE, None, 0)
+        
+        start = time.time()
+        try:
+            process = subprocess.Popen([self._command] + self._args,
+                                       stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL)
+        except OSError as err:
+            raise NuSmvSatSolverError(
+                "Could not run the solver {} : {}".format(self._command, err))
+        
+        writer = threading.Thread(target=self._write_problem,
+                                  args=(process.stdin, units))
+        timer  = None
+        killed = threading.Event()
+        if self._timeout is not None:
+            def kill():
+                killed.set()
+                process.kill()
+            timer = threading.Timer(self._timeout, kill)
+            timer.start()
+        writer.start()
+        try:
+            output = process.stdout.read()
+            process.wait()
+            writer.join()
+        finally:
+            process.stdout.close()
+            if timer is not None:
+                timer.cancel()
+        elapsed = int((time.time() - start) * 1000)
+        
+        if killed.is_set() and process.returncode < 0:
+            return self._outcome(SatSolverResult.TIMEOUT, None, elapsed)
+        
+        status, model = None, []
+        for line in output.decode(errors='replace').splitlines():
+            if line.startswith('s '):
+                status = line[2:].strip()
+            elif line.startswith('v '):
+                model.extend(int(x) for x in line[2:].split() if x != '0')
+        
+        if status == 'SATISFIABLE' or (status is None and process.returncode == 10):
+            return self._outcome(SatSolverResult.SATISFIABLE, model, elapsed)
+        if status == 'UNSATISFIABLE' or (status is None and process.returncode == 20):
+            return self._outcome(SatSolverResult.UNSATISFIABLE, None, elapsed)
+        return self._outcome(SatSolverResult.INTERNAL_ERROR, None, elapsed)
+    
+    def _write_problem(self, stream, units):
+        """
+        Writes the problem of this solver augmented with the unit clauses 
+        `units` in the DIMACS format to `stream` and closes it.
+        """
+        nclauses = sum(len(offsets) - 1 for _, offsets in self._clauses)
+        max_var  = max([self._max_var] + [abs(u) for u in units])
+        try:
+            stream.write("p cnf {} {}\n".format(max_var, nclauses + len(units))
+                         .encode())
+            for literals, offsets in self._clauses:
+                for start in range(0, len(offsets) - 1, dimacs.CHUNK_SIZE):
+                    stop = min(len(offsets) - 1, start + dimacs.CHUNK_SIZE)
+                    stream.write(dimacs.format_clauses(literals, offsets, start, stop)
+                                 .encode())
+            stream.write("".join("{} 0\n".format(u) for u in units).encode())
+            stream.close()
+        except OSError:
+            # the solver stopped reading (it was killed or answered early)
+            try:
+                stream.close()
+            except OSError:
+                pass
+    
+    def _outcome(self, result, model, elapsed):
+        """
+        Records the `model` and `elapsed` time (ms) of the last solving in the
+        stand-in NuSMV solver.
+        
+        :return: `result`
+        """
+        lst = None if model is None else Slist.from_list(model, IntConversion())
+        _bmc_utils.sat_set_outcome(self._as_SatSolver_ptr(),
+                                   None if lst is None else lst._ptr, elapsed)
+        return result
+
+
+def _int32_buffer(values):
+    """
+    :return: a writable and contiguous buffer of int32 holding `values` (no copy
+      is made when `values` already is such a NumPy array)
+    """
+    if numpy is not None:
+        return numpy.require(values, dtype=numpy.int32, requirements=['C', 'W'])
+    return array('i', values)
+
+
+def int32_zeros(n):
+    """
+    :return: a new array of `n` int32 values, all zero
+    """
+    return array('i', [0]) * n
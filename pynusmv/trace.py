@@ -39,6 +39,7 @@ class Trace(PointerWrapper, Iterable):
     
     def __init__(self, ptr, freeit=False):
         super().__init__(ptr, freeit=freeit)
+        self._language = None
         
     def _free(self):
         if self._freeit and self._ptr is not None:
@@ -403,10 +404,66 @@ class Trace(PointerWrapper, Iterable):
         """
         return bool(_trace.Trace_is_complete(self._ptr, vars_nlist._ptr, report))
 
+    def _language_symbols(self):
+        """
+        :return: a tuple with the symbols of the trace language. Since the 
+            language of a trace cannot change, it is only fetched once. 
+        """
+        if self._language is None:
+            self._language = tuple(self.symbols)
+        return self._language
+    
+    def _step_ptrs(self):
+        """
+        Iterates over the pointers of the successive steps of the trace by 
+        following the `TraceIter` links (this is linear in the length of the 
+        trace while fetching each step by its index is quadratic).
+        """
+        step_ptr = _trace.Trace_first_iter(self._ptr)
+        while not _trace.TraceIter_is_end(step_ptr):
+            yield step_ptr
+            step_ptr = _trace.TraceIter_get_next(step_ptr)
+
     def __iter__(self):
         """Iterator that permits an easy navigation in the steps of the trace"""
-        for i in range(1, len(self)+2):
-            yield self.steps[i]
+        for step_ptr in self._step_ptrs():
+            yield TraceStep(self, step_ptr)
+    
+    def to_table(self, symbols=None):
+        """
+        Exports the content of the trace in one pass as a table whose columns 
+        are the symbols and whose rows are the steps of the trace.
+        
+        Because the values are hash-consed in NuSMV, all the occurrences of a
+        same value share one single Node.
+        
+        :param symbols: an iterable of the symbols (:class:`pynusmv.node.Node`)
+            whose values must be exported. When it is None, all the symbols of 
+            the trace language are exported.
+        :return: a dictionary mapping each symbol (in the order of `symbols`)
+            to the list of the values (:class:`pynusmv.node.Node`) it takes in
+            the successive steps of the trace. A value is None when the symbol
+            is not assigned in the corresponding step.
+        """
+        symbols = self._language_symbols() if symbols is None else tuple(symbols)
+        columns = [(symbol._ptr, []) for symbol in symbols]
+        values  = {}
+        
+        for step_ptr in self._step_ptrs():
+            for symbol_ptr, column in columns:
+                value_ptr = _trace.Trace_step_get_value(self._ptr, step_ptr,
+                                                        symbol_ptr)
+                if value_ptr is None:
+                    column.append(None)
+                    continue
+                key   = int(value_ptr)  # the full address of the value node
+                value = values.get(key)
+                if value is None:
+                    value = values[key] = Node.from_ptr(value_ptr)
+                column.append(value)
+        
+        return {symbol: column 
+                for symbol, (_, column) in zip(symbols, columns)}
     
     @indexed.getter
     def steps(self, i):
@@ -566,7 +623,7 @@ class TraceStep:
         """
         # NuSMV advises not to use Trace_step_iter. This implementation is safer
         # and works well
-        for sym in self.trace.symbols:
+        for sym in self.trace._language_symbols():
             value = self.value[sym]
             if value is not None:
                 yield (sym, value)
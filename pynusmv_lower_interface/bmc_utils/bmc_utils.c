@@ -35,6 +35,14 @@
 #include <compile/compile.h>
 
 #include <bmc/bmcConv.h>
+#include <bmc/bmcInt.h>
+
+#include <sat/solvers/SatMinisat.h>
+#include <sat/solvers/SatMinisat_private.h>
+#include <enc/be/BeEnc_private.h>
+
+#include <rbc/rbcInt.h>
+#include <dag/dagInt.h>
 
 
 /****** REAL STUFF COMPUTATION ********************************************************************
@@ -527,12 +535,148 @@ be_ptr sem_with_loop_offset(BeFsm_ptr fsm, node_ptr formula, int time, int bound
   return result;
 }
 
+/****** BATCHED SEMANTICS ***************************************************************************
+ * This function assembles the complete bounded semantics of a formula in one single call so that
+ * the subterms which are common to all the loop positions are only built once.
+ **************************************************************************************************/
+
+/* Generates the Be [[formula]]_{bound} corresponding to the bounded semantics of `formula` (with
+ * or without loop) encoded with an `offset` long shift in the timeline of the encoder.
+ *
+ * .. note::
+ *    In python, this function has the same meaning as::
+ *
+ *        straight = sem_no_loop_offset(fsm, formula, 0, bound, offset)
+ *        k_loop   = Be.false(manager)
+ *        for i in range(bound):
+ *            k_loop |= ( loop_condition(enc, offset+bound, offset+i)
+ *                      & fairness_constraint(fsm, offset+bound, offset+i)
+ *                      & sem_with_loop_offset(fsm, formula, 0, bound, i, offset))
+ *        return straight | k_loop
+ *
+ *    except that the fairness constraints are not rebuilt from scratch for each loop position:
+ *    for each justice constraint f, the disjunction f(offset+i) | ... | f(offset+bound-1) is
+ *    obtained by extending the disjunction already built for the position i+1.
+ *
+ * .. warning::
+ *    The error checking and consistency verification *MUST* be done in the
+ *    python code calling this function.
+ *
+ * :param fsm: the BeFsm for which the property will be verified.
+ * :param formula: the property (in NNF) for which to generate the bounded semantics.
+ * :param bound: the logical time bound to the problem.
+ * :param offset: the time offset in the encoding block where the sem of this formula will be
+ *     generated.
+ * :param fairness: a flag (0 or 1) indicating whether or not to take the fairness constraints
+ *     into account.
+ * :return: a Be corresponding to the semantics of `formula` for a problem with a maximum of
+ *     `bound` steps encoded to start at time `offset` in the `fsm` encoding timeline.
+ */
+be_ptr sem_at_offset(BeFsm_ptr fsm, node_ptr formula, int bound, int offset, int fairness){
+  BeEnc_ptr      enc     = BeFsm_get_be_encoding(fsm);
+  Be_Manager_ptr manager = BeEnc_get_be_manager(enc);
+  int            k       = offset + bound;
+  int            nb_fair = 0;
+  be_ptr*        fair    = (be_ptr*) NULL;
+  be_ptr         k_loop  = Be_Falsity(manager);
+  node_ptr       iter;
+  int            i, j;
+
+  if (fairness && bound > 0) {
+    nb_fair = llength(BeFsm_get_fairness_list(fsm));
+  }
+
+  /* fair[i] is the fairness constraint of the loop starting at offset+i. It is built backwards
+   * so that the suffix disjunction of each justice constraint is shared among the positions */
+  if (bound > 0) {
+    fair = (be_ptr*) malloc(bound * sizeof(be_ptr));
+    nusmv_assert(fair != (be_ptr*) NULL);
+    for (i = 0; i < bound; i++) {
+      fair[i] = Be_Truth(manager);
+    }
+  }
+  for (iter = (nb_fair > 0) ? BeFsm_get_fairness_list(fsm) : Nil;
+       iter != Nil; iter = cdr(iter)) {
+    be_ptr untimed = (be_ptr) car(iter);
+    be_ptr suffix  = Be_Falsity(manager);
+    for (i = bound-1; i >= 0; i--) {
+      suffix  = Be_Or(manager, BeEnc_untimed_expr_to_timed(enc, untimed, offset+i), suffix);
+      fair[i] = Be_And(manager, fair[i], suffix);
+    }
+  }
+
+  for (j = 0; j < bound; j++) {
+    be_ptr disjunct = Be_And(manager,
+                             Be_And(manager, loop_condition(enc, k, offset+j), fair[j]),
+                             sem_with_loop_offset(fsm, formula, 0, bound, j, offset));
+    k_loop = Be_Or(manager, k_loop, disjunct);
+  }
+
+  if (fair != (be_ptr*) NULL) {
+    free(fair);
+  }
+
+  return Be_Or(manager, sem_no_loop_offset(fsm, formula, 0, bound, offset), k_loop);
+}
+
 /****** MEMOIZATION *******************************************************************************
  * Memoization related functions
  **************************************************************************************************/
 
-/* This is the private cache where all the memoized values are stored */
+/* An entry of the memoization cache. The entries are chained in a doubly linked list sorted
+ * from the most recently used (head) to the least recently used (tail) entry so that the cache
+ * can evict its oldest entries when its capacity is exceeded.
+ */
+typedef struct MemoizerEntry_TAG {
+  node_ptr key;
+  be_ptr   value;
+  struct MemoizerEntry_TAG* prev;
+  struct MemoizerEntry_TAG* next;
+} MemoizerEntry;
+
+/* This is the private cache where all the memoized values are stored (key -> MemoizerEntry) */
 static hash_ptr MEMOIZER = (hash_ptr) NULL;
+/* The most (head) and least (tail) recently used entries of the cache */
+static MemoizerEntry* MEMOIZER_head = (MemoizerEntry*) NULL;
+static MemoizerEntry* MEMOIZER_tail = (MemoizerEntry*) NULL;
+/* The maximum number of entries of the cache (a value <= 0 means unbounded) */
+static long MEMOIZER_capacity  = 0;
+/* The usage statistics of the cache */
+static long MEMOIZER_entries   = 0;
+static long MEMOIZER_hits      = 0;
+static long MEMOIZER_misses    = 0;
+static long MEMOIZER_evictions = 0;
+
+/* Unlinks `entry` from the LRU list (the entry is not freed) */
+static void MEMOIZER_unlink(MemoizerEntry* entry){
+  if (entry->prev != (MemoizerEntry*) NULL) entry->prev->next = entry->next;
+  else                                      MEMOIZER_head     = entry->next;
+  if (entry->next != (MemoizerEntry*) NULL) entry->next->prev = entry->prev;
+  else                                      MEMOIZER_tail     = entry->prev;
+  entry->prev = (MemoizerEntry*) NULL;
+  entry->next = (MemoizerEntry*) NULL;
+}
+
+/* Links `entry` at the head of the LRU list (marks it as the most recently used) */
+static void MEMOIZER_push_front(MemoizerEntry* entry){
+  entry->prev = (MemoizerEntry*) NULL;
+  entry->next = MEMOIZER_head;
+  if (MEMOIZER_head != (MemoizerEntry*) NULL) MEMOIZER_head->prev = entry;
+  MEMOIZER_head = entry;
+  if (MEMOIZER_tail == (MemoizerEntry*) NULL) MEMOIZER_tail = entry;
+}
+
+/* Evicts the least recently used entries until the cache fits its capacity */
+static void MEMOIZER_shrink(){
+  while (MEMOIZER_capacity > 0 && MEMOIZER_entries > MEMOIZER_capacity) {
+    MemoizerEntry* victim = MEMOIZER_tail;
+    MEMOIZER_unlink(victim);
+    remove_assoc(MEMOIZER, victim->key);
+    free(victim);
+    MEMOIZER_entries  -= 1;
+    MEMOIZER_evictions+= 1;
+  }
+}
 
 /* This function is used to compute an unique key to retrieve the some memoized value for
  * computed for `formula` at time `time` on a path bounded by k-l. (Note: for a straight
@@ -565,10 +709,21 @@ node_ptr MEMOIZER_key(node_ptr formula, int time, int k, int l, int offset) {
  * :return: the memoized value associated with `key` or NULL if none was found.
  */
 be_ptr MEMOIZER_get(node_ptr key){
+  MemoizerEntry* entry;
+
   if (MEMOIZER == (hash_ptr) NULL) {
     MEMOIZER = new_assoc();
   }
-  return (be_ptr) find_assoc(MEMOIZER, key);
+  entry = (MemoizerEntry*) find_assoc(MEMOIZER, key);
+  if (entry == (MemoizerEntry*) NULL) {
+    MEMOIZER_misses += 1;
+    return (be_ptr) NULL;
+  }
+
+  MEMOIZER_hits += 1;
+  MEMOIZER_unlink(entry);
+  MEMOIZER_push_front(entry);
+  return entry->value;
 }
 
 /* Associates a memoized value `be` identified by `key` (:see: `MEMOIZER_key`).
@@ -577,20 +732,1202 @@ be_ptr MEMOIZER_get(node_ptr key){
  * :param be: the value to store and associate to `key`
  */
 void MEMOIZER_put(node_ptr key, be_ptr be){
+  MemoizerEntry* entry;
+
   if (MEMOIZER == (hash_ptr) NULL) {
     MEMOIZER = new_assoc();
   }
-  insert_assoc(MEMOIZER, key, (node_ptr) be);
+  entry = (MemoizerEntry*) find_assoc(MEMOIZER, key);
+  if (entry != (MemoizerEntry*) NULL) {
+    entry->value = be;
+    MEMOIZER_unlink(entry);
+    MEMOIZER_push_front(entry);
+    return;
+  }
+
+  entry = (MemoizerEntry*) malloc(sizeof(MemoizerEntry));
+  nusmv_assert(entry != (MemoizerEntry*) NULL);
+  entry->key   = key;
+  entry->value = be;
+  MEMOIZER_push_front(entry);
+  insert_assoc(MEMOIZER, key, (node_ptr) entry);
+  MEMOIZER_entries += 1;
+
+  MEMOIZER_shrink();
 }
 
 /* Clears the memoization cache and reclaims all its associated system resources.
+ * The usage statistics are reset too but the capacity of the cache is preserved.
  *
  * .. warning::
  *    This function *MUST* be called whenever the BMC sub system is deinitialized in PyNuSMV.
  */
 void MEMOIZER_clear(){
+  while (MEMOIZER_head != (MemoizerEntry*) NULL) {
+    MemoizerEntry* next = MEMOIZER_head->next;
+    free(MEMOIZER_head);
+    MEMOIZER_head = next;
+  }
+  MEMOIZER_tail = (MemoizerEntry*) NULL;
+
   if (MEMOIZER != (hash_ptr) NULL) {
     free_assoc(MEMOIZER);
     MEMOIZER = (hash_ptr) NULL;
   }
+  MEMOIZER_entries   = 0;
+  MEMOIZER_hits      = 0;
+  MEMOIZER_misses    = 0;
+  MEMOIZER_evictions = 0;
+}
+
+/* Sets the maximum number of entries of the cache. When the cache holds more entries than its
+ * new capacity, the least recently used ones are evicted right away.
+ *
+ * :param capacity: the maximum number of entries of the cache (a value <= 0 means unbounded)
+ */
+void MEMOIZER_set_capacity(long capacity){
+  MEMOIZER_capacity = capacity;
+  MEMOIZER_shrink();
+}
+
+/* :return: the maximum number of entries of the cache (a value <= 0 means unbounded) */
+long MEMOIZER_get_capacity(){
+  return MEMOIZER_capacity;
+}
+
+/* :return: the number of entries currently stored in the cache */
+long MEMOIZER_get_size(){
+  return MEMOIZER_entries;
+}
+
+/* :return: the number of lookups that found a memoized value since the last clear */
+long MEMOIZER_get_hits(){
+  return MEMOIZER_hits;
+}
+
+/* :return: the number of lookups that found no memoized value since the last clear */
+long MEMOIZER_get_misses(){
+  return MEMOIZER_misses;
+}
+
+/* :return: the number of entries evicted to respect the capacity since the last clear */
+long MEMOIZER_get_evictions(){
+  return MEMOIZER_evictions;
+}
+
+/****** INTERPOLATION *****************************************************************************
+ * These functions bridge the interpolation facilities of the proof logging MiniSat with the
+ * boolean expressions manager: the interpolant is built through callbacks which can not be
+ * provided from python.
+ **************************************************************************************************/
+
+/* The data passed to the term factory callbacks while extracting an interpolant */
+typedef struct ItpFactoryData_TAG {
+  SatMinisat_ptr solver;
+  Be_Manager_ptr mgr;
+} ItpFactoryData;
+
+static Term itp_make_false(TermFactoryCallbacksUserData_ptr user_data){
+  return (Term) Be_Falsity(((ItpFactoryData*) user_data)->mgr);
+}
+
+static Term itp_make_true(TermFactoryCallbacksUserData_ptr user_data){
+  return (Term) Be_Truth(((ItpFactoryData*) user_data)->mgr);
+}
+
+static Term itp_make_and(Term t1, Term t2, TermFactoryCallbacksUserData_ptr user_data){
+  return (Term) Be_And(((ItpFactoryData*) user_data)->mgr, (be_ptr) t1, (be_ptr) t2);
+}
+
+static Term itp_make_or(Term t1, Term t2, TermFactoryCallbacksUserData_ptr user_data){
+  return (Term) Be_Or(((ItpFactoryData*) user_data)->mgr, (be_ptr) t1, (be_ptr) t2);
+}
+
+static Term itp_make_not(Term t, TermFactoryCallbacksUserData_ptr user_data){
+  return (Term) Be_Not(((ItpFactoryData*) user_data)->mgr, (be_ptr) t);
+}
+
+/* Maps the (minisat) variable `var` of the proof back onto the variable of the manager. The
+ * auxiliary variables introduced by the cnf conversion of a subformula occurring both in A and in B
+ * are shared as well: these are mapped onto the subformula they stand for (which is sound as long as
+ * both parts define them with an equivalence, see BE_CNF_TSEITIN) */
+static Term itp_make_var(int var, TermFactoryCallbacksUserData_ptr user_data){
+  ItpFactoryData* data = (ItpFactoryData*) user_data;
+  Rbc_Manager_t*  rbc  = (Rbc_Manager_t*) Be_Manager_GetSpecManager(data->mgr);
+  int cnf_var  = abs(sat_minisat_minisatLiteral2cnfLiteral(data->solver, var));
+  int be_lit   = Be_CnfLiteral2BeLiteral(data->mgr, cnf_var);
+  Rbc_t* node;
+
+  if (0 != be_lit) {
+    return (Term) Be_Index2Var(data->mgr, Be_BeLiteral2BeIndex(data->mgr, be_lit));
+  }
+
+  node = (Rbc_t*) find_assoc(rbc->cnfVar2rbcNode_cnf, NODE_FROM_INT(cnf_var));
+  nusmv_assert(NIL(Rbc_t) != node && RBCDUMMY != node); /* not a gate of the formulas */
+  return (Term) Be_Manager_Spec2Be(data->mgr, (char*) node);
+}
+
+int sat_interpolation_enabled(){
+#ifdef MINISAT_WITH_PROOF_LOGGING
+  return 1;
+#else
+  return 0;
+#endif
+}
+
+be_ptr sat_interpolant(SatSolver_ptr solver, Be_Manager_ptr mgr, Slist_ptr groups){
+  TermFactoryCallbacks callbacks;
+  ItpFactoryData       data;
+  SatSolverItpGroup*   ga_groups;
+  be_ptr               result;
+  Siter                iter;
+  int                  i;
+
+  callbacks.make_false = itp_make_false;
+  callbacks.make_true  = itp_make_true;
+  callbacks.make_and   = itp_make_and;
+  callbacks.make_or    = itp_make_or;
+  callbacks.make_not   = itp_make_not;
+  callbacks.make_var   = itp_make_var;
+
+  data.solver = SAT_MINISAT(solver);
+  data.mgr    = mgr;
+
+  ga_groups = ALLOC(SatSolverItpGroup, Slist_get_size(groups));
+  i = 0;
+  SLIST_FOREACH(groups, iter){
+    ga_groups[i++] = (SatSolverItpGroup) Siter_element(iter);
+  }
+
+  result = (be_ptr) SatSolver_extract_interpolant(solver, i, ga_groups,
+                                                  &callbacks, (void*) &data);
+  FREE(ga_groups);
+  return result;
+}
+
+be_ptr shift_timed_expr(BeEnc_ptr enc, be_ptr expr, int from, int to){
+  Be_Manager_ptr mgr     = BeEnc_get_be_manager(enc);
+  int            untimed = enc->input_vars_num + enc->frozen_vars_num + 2 * enc->state_vars_num;
+  int            timed   = enc->input_vars_num + enc->frozen_vars_num + enc->state_vars_num;
+  int            first, size, i, phy;
+  int*           sources;
+  int*           targets;
+  int*           subst;
+  be_ptr         result;
+
+  if (from == to || BeEnc_get_vars_num(enc) == 0 || Be_IsConstant(mgr, expr)) {
+    return expr;
+  }
+  nusmv_assert(from <= BeEnc_get_max_time(enc));
+
+  /* the images of the variables of the `from` block are all computed before the
+   * substitution array is built: timing a variable may extend the timed blocks
+   * (and reallocate log2phy and phy2log) */
+  first   = from < 0 ? 0       : untimed + from * timed;
+  size    = from < 0 ? untimed : timed;
+  sources = ALLOC(int, size);
+  targets = ALLOC(int, size);
+  for (i = 0; i < size; i++) {
+    phy        = enc->log2phy[first + i];
+    sources[i] = phy;
+    targets[i] = phy;
+    /* frozen variables only live in the untimed block, they are left untouched */
+    if (phy <= 0 || BeEnc_is_index_frozen_var(enc, phy)) continue;
+
+    if (from >= 0) phy = BeEnc_index_to_untimed_index(enc, phy);
+    targets[i] = to < 0 ? phy : BeEnc_var_to_index(enc, BeEnc_index_to_timed(enc, phy, to));
+  }
+
+  subst = ALLOC(int, enc->log_idx_capacity);
+  for (i = 0; i < enc->log_idx_capacity; i++) {
+    subst[i] = i;
+  }
+  for (i = 0; i < size; i++) {
+    if (sources[i] > 0) subst[enc->phy2log[sources[i]]] = enc->phy2log[targets[i]];
+  }
+  result = Be_LogicalVarSubst(mgr, expr, subst, enc->log2phy, enc->phy2log);
+
+  FREE(subst);
+  FREE(targets);
+  FREE(sources);
+  return result;
+}
+
+/****** ASSUMPTIONS *******************************************************************************
+ * SatSolver_solve_all_groups_assume can not be used as is: both the base class and MiniSat
+ * destroy the model and the conflict of the previous solving without checking that these exist
+ * (which segfaults) and the base class caches a conflict that MiniSat frees on the next solving.
+ * These functions talk to MiniSat directly instead.
+ **************************************************************************************************/
+
+int sat_solve_assume(SatSolver_ptr solver, Slist_ptr assumptions, Olist_ptr groups){
+  SatMinisat_ptr self = SAT_MINISAT(solver);
+  SatSolverGroup permanent = SatSolver_get_permanent_group(solver);
+  Olist_ptr      solved    = (Olist_ptr) NULL == groups ? solver->existingGroups : groups;
+  int*           lits;
+  int            nb_lits;
+  int            minisat_result;
+  Siter          siter;
+  Oiter          oiter;
+
+  /* destroy the model of previous solving */
+  if ((Slist_ptr) NULL != solver->model) {
+    Slist_destroy(solver->model);
+    solver->model = (Slist_ptr) NULL;
+  }
+
+  if (Olist_contains(solver->unsatisfiableGroups, (void*) permanent)) {
+    return SAT_SOLVER_UNSATISFIABLE_PROBLEM;
+  }
+
+  lits    = ALLOC(int, Slist_get_size(assumptions) + Olist_get_size(solved) + 1);
+  nb_lits = 0;
+  OLIST_FOREACH(solved, oiter){
+    SatSolverGroup group = (SatSolverGroup) Oiter_element(oiter);
+    if (Olist_contains(solver->unsatisfiableGroups, (void*) group)) {
+      FREE(lits);
+      return SAT_SOLVER_UNSATISFIABLE_PROBLEM;
+    }
+    /* the clauses of a group are enabled by the negated group id */
+    if (permanent != group) {
+      lits[nb_lits++] = -group;
+    }
+  }
+  SLIST_FOREACH(assumptions, siter){
+    int literal = PTR_TO_INT(Siter_element(siter));
+    lits[nb_lits++] = sat_minisat_cnfLiteral2minisatLiteral(self, literal);
+  }
+
+  solver->solvingTime = util_cpu_time();
+  minisat_result = MiniSat_Solve_Assume(self->minisatSolver, nb_lits, lits);
+  solver->solvingTime = util_cpu_time() - solver->solvingTime;
+  FREE(lits);
+
+  return 1 == minisat_result ? SAT_SOLVER_SATISFIABLE_PROBLEM
+                             : SAT_SOLVER_UNSATISFIABLE_PROBLEM;
+}
+
+Slist_ptr sat_conflict(SatSolver_ptr solver){
+  SatMinisat_ptr self     = SAT_MINISAT(solver);
+  Slist_ptr      conflict = Slist_create();
+  int            nb_lits  = MiniSat_Get_Nof_Conflict_Lits(self->minisatSolver);
+  int*           lits;
+  int            i;
+
+  if (nb_lits == 0) return conflict;
+
+  lits = ALLOC(int, nb_lits);
+  MiniSat_Get_Conflict_Lits(self->minisatSolver, lits);
+  for (i = 0; i < nb_lits; i++) {
+    /* group ids have no cnf counterpart: they are mapped onto 0 */
+    int literal = sat_minisat_minisatLiteral2cnfLiteral(self, lits[i]);
+    if (0 != literal) {
+      Slist_push(conflict, PTR_FROM_INT(void*, literal));
+    }
+  }
+  FREE(lits);
+  return conflict;
+}
+
+/****** BULK CNF CONVERSIONS **********************************************************************
+ * Converting the clauses one at a time through the Slist wrappers costs several python objects
+ * per clause. These functions move all the clauses at once through flat int32 buffers.
+ **************************************************************************************************/
+
+int cnf_literals_count(Be_Cnf_ptr cnf){
+  int   count = 0;
+  Siter iter;
+
+  SLIST_FOREACH(Be_Cnf_GetClausesList(cnf), iter){
+    int* clause = (int*) Siter_element(iter);
+    while (0 != *clause++) count++;
+  }
+  return count;
+}
+
+int cnf_to_arrays(Be_Cnf_ptr cnf, char* literals, size_t literals_size,
+                  char* offsets, size_t offsets_size){
+  int*   lits    = (int*) literals;
+  int*   offs    = (int*) offsets;
+  size_t nb_lits = literals_size / sizeof(int);
+  size_t nb_offs = offsets_size  / sizeof(int);
+  size_t pos     = 0;
+  size_t nclause = 0;
+  Siter  iter;
+
+  if (nb_offs < (size_t) Slist_get_size(Be_Cnf_GetClausesList(cnf)) + 1) return -1;
+
+  SLIST_FOREACH(Be_Cnf_GetClausesList(cnf), iter){
+    int* clause = (int*) Siter_element(iter);
+    offs[nclause++] = (int) pos;
+    for (; 0 != *clause; clause++) {
+      if (pos >= nb_lits) return -1;
+      lits[pos++] = *clause;
+    }
+  }
+  offs[nclause] = (int) pos;
+  return 0;
+}
+
+int sat_add_clauses(SatSolver_ptr solver, SatSolverGroup group,
+                    char* literals, size_t literals_size,
+                    char* offsets, size_t offsets_size){
+  int*       lits    = (int*) literals;
+  int*       offs    = (int*) offsets;
+  int        nb_lits = (int) (literals_size / sizeof(int));
+  int        nb_offs = (int) (offsets_size  / sizeof(int));
+  Be_Cnf_ptr cnf;
+  int        i, j;
+
+  if (nb_offs < 1 || offs[0] != 0 || offs[nb_offs-1] != nb_lits) return -1;
+  for (i = 1; i < nb_offs; i++) {
+    if (offs[i] < offs[i-1]) return -1;
+  }
+
+  cnf = Be_Cnf_Create((be_ptr) NULL);
+  for (i = nb_offs - 2; i >= 0; i--) {
+    int  size   = offs[i+1] - offs[i];
+    int* clause = ALLOC(int, size + 1);
+    for (j = 0; j < size; j++) {
+      clause[j] = lits[offs[i] + j];
+    }
+    clause[size] = 0;
+    Slist_push(Be_Cnf_GetClausesList(cnf), (void*) clause);
+  }
+
+  SatSolver_add(solver, cnf, group);
+  Be_Cnf_Delete(cnf);
+  return nb_offs - 1;
+}
+
+/****** EXTERNAL SOLVERS **************************************************************************
+ * An external solver runs in a separate process. The outcome of its solving is recorded in a
+ * (never solved) NuSMV solver so that the C functions reading the model keep working unchanged.
+ **************************************************************************************************/
+void sat_set_outcome(SatSolver_ptr solver, Slist_ptr model, long solving_time){
+  if ((Slist_ptr) NULL != solver->model) {
+    Slist_destroy(solver->model);
+  }
+  solver->model       = (Slist_ptr) NULL == model ? Slist_create() : Slist_copy(model);
+  solver->solvingTime = solving_time;
+}
+
+/****** SAT MODEL DECODING ************************************************************************
+ * Decoding a sat model literal by literal costs several SWIG round-trips per literal. This
+ * function computes in one pass where every cnf variable lives in the encoding.
+ **************************************************************************************************/
+int enc_cnf_decoding_table(BeEnc_ptr enc, char* times, size_t times_size,
+                           char* untimed, size_t untimed_size){
+  Be_Manager_ptr mgr  = BeEnc_get_be_manager(enc);
+  int*           time = (int*) times;
+  int*           unt  = (int*) untimed;
+  int            size = (int) (times_size / sizeof(int));
+  int            cnf;
+
+  if (size != (int) (untimed_size / sizeof(int))) return -1;
+
+  for (cnf = 0; cnf < size; cnf++) {
+    int be_lit = 0 == cnf ? 0 : Be_CnfLiteral2BeLiteral(mgr, cnf);
+    int index  = 0 == be_lit ? -1 : Be_BeLiteral2BeIndex(mgr, be_lit);
+
+    /* not a model variable (eg. a variable introduced by the cnf conversion) */
+    if (index < 0 || index > enc->max_used_phy_idx || enc->phy2log[index] < 0) {
+      time[cnf] = BE_CURRENT_UNTIMED;
+      unt[cnf]  = -1;
+      continue;
+    }
+    time[cnf] = BeEnc_index_to_time(enc, index);
+    unt[cnf]  = BeEnc_is_index_untimed(enc, index) ? index
+                                                   : BeEnc_index_to_untimed_index(enc, index);
+  }
+  return 0;
+}
+
+/****** BE METRICS ********************************************************************************
+ * A be is a node of the RBC DAG held by its manager. These functions measure the sub DAG rooted
+ * in a be (each shared node is only visited once) and report the usage of the whole manager.
+ **************************************************************************************************/
+
+/* Walks the sub DAG rooted in `f` and returns its depth. `depths` maps each visited vertex to
+ * its depth + 1, `size` and `vars` are incremented for each new connective and variable.
+ */
+static int be_metrics_walk(Rbc_t* f, hash_ptr depths, int* size, int* vars){
+  Rbc_t*   v = RbcGetRef(f);
+  node_ptr known = find_assoc(depths, (node_ptr) v);
+  int      depth = 0;
+  unsigned i;
+
+  if ((node_ptr) NULL != known) return PTR_TO_INT(known) - 1;
+
+  switch (Rbc_get_type(v)) {
+    case RBCTOP: break;
+    case RBCVAR: *vars += 1; break;
+    default:
+      *size += 1;
+      for (i = 0; i < v->numSons; i++) {
+        int son = be_metrics_walk(v->outList[i], depths, size, vars);
+        if (son + 1 > depth) depth = son + 1;
+      }
+  }
+  insert_assoc(depths, (node_ptr) v, PTR_FROM_INT(node_ptr, depth + 1));
+  return depth;
+}
+
+/* Measures the sub DAG rooted in `be`. Each of `size`, `depth` and `vars` may be NULL */
+static void be_metrics(Be_Manager_ptr mgr, be_ptr be, int* size, int* depth, int* vars){
+  hash_ptr depths = new_assoc();
+  int      nodes  = 0;
+  int      leaves = 0;
+  int      height = be_metrics_walk((Rbc_t*) Be_Manager_Be2Spec(mgr, be), depths,
+                                    &nodes, &leaves);
+  free_assoc(depths);
+
+  if ((int*) NULL != size ) *size  = nodes;
+  if ((int*) NULL != depth) *depth = height;
+  if ((int*) NULL != vars ) *vars  = leaves;
+}
+
+int be_size(Be_Manager_ptr mgr, be_ptr be){
+  int size;
+  be_metrics(mgr, be, &size, (int*) NULL, (int*) NULL);
+  return size;
+}
+
+int be_depth(Be_Manager_ptr mgr, be_ptr be){
+  int depth;
+  be_metrics(mgr, be, (int*) NULL, &depth, (int*) NULL);
+  return depth;
+}
+
+int be_num_vars(Be_Manager_ptr mgr, be_ptr be){
+  int vars;
+  be_metrics(mgr, be, (int*) NULL, (int*) NULL, &vars);
+  return vars;
+}
+
+/* :return: the DAG manager storing the nodes of the RBC manager behind `mgr` */
+static Dag_Manager_t* be_manager_dag(Be_Manager_ptr mgr){
+  return ((Rbc_Manager_t*) Be_Manager_GetSpecManager(mgr))->dagManager;
+}
+
+long be_manager_get_nodes(Be_Manager_ptr mgr){
+  return (long) st_count(be_manager_dag(mgr)->vTable);
+}
+
+long be_manager_get_bins(Be_Manager_ptr mgr){
+  return (long) be_manager_dag(mgr)->vTable->num_bins;
+}
+
+long be_manager_get_created(Be_Manager_ptr mgr){
+  return (long) be_manager_dag(mgr)->stats[DAG_NODE_NO];
+}
+
+long be_manager_get_collected(Be_Manager_ptr mgr){
+  return (long) be_manager_dag(mgr)->stats[DAG_GC_NO];
+}
+
+long be_manager_get_vars(Be_Manager_ptr mgr){
+  return (long) ((Rbc_Manager_t*) Be_Manager_GetSpecManager(mgr))->stats[RBCVAR_NO];
+}
+
+/****** BE REWRITING ******************************************************************************
+ * The RBC constructors only simplify a node with respect to its (grand) children. The rewriting
+ * below looks at whole conjunctions instead: the trees of AND nodes which are not shared are
+ * flattened, their conjuncts are rewritten, sorted and scanned for constants, duplicates and
+ * complementary pairs and the simplified conjunction is then rebuilt as a balanced tree.
+ * IFF and ITE nodes are rebuilt from their rewritten operands so that the RBC constructors get
+ * a second chance to fold them.
+ **************************************************************************************************/
+
+/* The counters of the rewritings performed in one manager */
+typedef struct BeRewriteStats_TAG {
+  long folds;  /* conjunctions/ite/iff folded into a constant */
+  long merges; /* duplicate conjuncts removed */
+} BeRewriteStats;
+
+/* Be_Manager_ptr -> BeRewriteStats* of the managers rewritten since the last reset */
+static hash_ptr BE_REWRITE_stats = (hash_ptr) NULL;
+
+/* :return: the counters of `mgr`, created when `create` is set (NULL otherwise) */
+static BeRewriteStats* be_rewrite_stats(Be_Manager_ptr mgr, boolean create){
+  BeRewriteStats* stats;
+
+  if ((hash_ptr) NULL == BE_REWRITE_stats) {
+    if (!create) return (BeRewriteStats*) NULL;
+    BE_REWRITE_stats = new_assoc();
+  }
+  stats = (BeRewriteStats*) find_assoc(BE_REWRITE_stats, (node_ptr) mgr);
+  if ((BeRewriteStats*) NULL == stats && create) {
+    stats = ALLOC(BeRewriteStats, 1);
+    stats->folds  = 0;
+    stats->merges = 0;
+    insert_assoc(BE_REWRITE_stats, (node_ptr) mgr, (node_ptr) stats);
+  }
+  return stats;
+}
+
+/* Counts the number of fathers of each vertex of the sub DAG rooted in `f` in `fathers` */
+static void be_count_fathers(Rbc_t* f, hash_ptr fathers){
+  Rbc_t*   v     = RbcGetRef(f);
+  int      count = PTR_TO_INT(find_assoc(fathers, (node_ptr) v));
+  unsigned i;
+
+  insert_assoc(fathers, (node_ptr) v, PTR_FROM_INT(node_ptr, count + 1));
+  if (count > 0) return;
+  for (i = 0; i < v->numSons; i++) {
+    be_count_fathers(v->outList[i], fathers);
+  }
+}
+
+/* Appends the conjuncts of the AND vertex `v` to `conjuncts`, descending into the (positive)
+ * AND sons which have no other father than `v`.
+ */
+static void be_conjuncts(Rbc_t* v, hash_ptr fathers, Olist_ptr conjuncts){
+  unsigned i;
+
+  for (i = 0; i < v->numSons; i++) {
+    Rbc_t* son = v->outList[i];
+    if (!RbcIsSet(son) && RBCAND == Rbc_get_type(son)
+        && 1 == PTR_TO_INT(find_assoc(fathers, (node_ptr) son))) {
+      be_conjuncts(son, fathers, conjuncts);
+    }
+    else {
+      Olist_append(conjuncts, (void*) son);
+    }
+  }
+}
+
+static int be_rewrite_compare(const void* a, const void* b){
+  nusmv_ptrint x = (nusmv_ptrint) *(Rbc_t* const*) a;
+  nusmv_ptrint y = (nusmv_ptrint) *(Rbc_t* const*) b;
+  return x < y ? -1 : (x > y ? 1 : 0);
+}
+
+/* Builds the balanced conjunction of `conjuncts[lo..hi[` (which is not empty) */
+static Rbc_t* be_rewrite_balance(Rbc_Manager_t* rbc, Rbc_t** conjuncts, int lo, int hi){
+  int mid = lo + (hi - lo) / 2;
+  if (hi - lo == 1) return conjuncts[lo];
+  return Rbc_MakeAnd(rbc, be_rewrite_balance(rbc, conjuncts, lo, mid),
+                          be_rewrite_balance(rbc, conjuncts, mid, hi), RBC_TRUE);
+}
+
+static Rbc_t* be_rewrite_rec(Rbc_Manager_t* rbc, Rbc_t* f, hash_ptr fathers, hash_ptr memo,
+                             BeRewriteStats* stats);
+
+/* Rewrites the conjunction rooted in the AND vertex `v` */
+static Rbc_t* be_rewrite_and(Rbc_Manager_t* rbc, Rbc_t* v, hash_ptr fathers, hash_ptr memo,
+                             BeRewriteStats* stats){
+  Olist_ptr conjuncts = Olist_create();
+  Oiter     iter;
+  Rbc_t**   simplified;
+  Rbc_t*    result = (Rbc_t*) NULL;
+  int       size   = 0;
+  int       kept   = 0;
+  int       i;
+
+  be_conjuncts(v, fathers, conjuncts);
+  simplified = ALLOC(Rbc_t*, Olist_get_size(conjuncts));
+
+  OLIST_FOREACH(conjuncts, iter) {
+    Rbc_t* conjunct = be_rewrite_rec(rbc, (Rbc_t*) Oiter_element(iter), fathers, memo,
+                                      stats);
+    if (conjunct == rbc->zero) {
+      result = rbc->zero;
+      break;
+    }
+    if (conjunct != rbc->one) simplified[size++] = conjunct;
+  }
+
+  if ((Rbc_t*) NULL == result) {
+    /* x and !x only differ by their annotation bit: they are neighbours once sorted */
+    qsort(simplified, size, sizeof(Rbc_t*), be_rewrite_compare);
+    for (i = 0; i < size && (Rbc_t*) NULL == result; i++) {
+      if (kept > 0 && simplified[kept-1] == simplified[i]) {
+        stats->merges += 1;
+      }
+      else if (kept > 0 && RbcGetRef(simplified[kept-1]) == RbcGetRef(simplified[i])) {
+        result = rbc->zero;
+      }
+      else {
+        simplified[kept++] = simplified[i];
+      }
+    }
+  }
+
+  if ((Rbc_t*) NULL == result) {
+    result = 0 == kept ? rbc->one : be_rewrite_balance(rbc, simplified, 0, kept);
+  }
+  if (result == rbc->zero || result == rbc->one) stats->folds += 1;
+
+  FREE(simplified);
+  Olist_destroy(conjuncts);
+  return result;
+}
+
+/* Rewrites the sub DAG rooted in `f`. `memo` maps the vertices already rewritten to their
+ * (positive) rewriting.
+ */
+static Rbc_t* be_rewrite_rec(Rbc_Manager_t* rbc, Rbc_t* f, hash_ptr fathers, hash_ptr memo,
+                             BeRewriteStats* stats){
+  Rbc_t*     v    = RbcGetRef(f);
+  Rbc_Bool_c sign = RbcIsSet(f) ? RBC_FALSE : RBC_TRUE;
+  Rbc_t*     result;
+
+  switch (Rbc_get_type(v)) {
+    case RBCTOP:
+    case RBCVAR:
+      return f;
+    default:
+      break;
+  }
+
+  result = (Rbc_t*) find_assoc(memo, (node_ptr) v);
+  if ((Rbc_t*) NULL != result) return RbcId(result, sign);
+
+  switch (Rbc_get_type(v)) {
+    case RBCAND:
+      result = be_rewrite_and(rbc, v, fathers, memo, stats);
+      break;
+    case RBCIFF:
+      result = Rbc_MakeIff(rbc, be_rewrite_rec(rbc, v->outList[0], fathers, memo, stats),
+                                be_rewrite_rec(rbc, v->outList[1], fathers, memo, stats), RBC_TRUE);
+      if (Rbc_IsConstant(rbc, result)) stats->folds += 1;
+      break;
+    case RBCITE:
+      result = Rbc_MakeIte(rbc, be_rewrite_rec(rbc, v->outList[0], fathers, memo, stats),
+                                be_rewrite_rec(rbc, v->outList[1], fathers, memo, stats),
+                                be_rewrite_rec(rbc, v->outList[2], fathers, memo, stats), RBC_TRUE);
+      if (Rbc_IsConstant(rbc, result)) stats->folds += 1;
+      break;
+    default:
+      nusmv_assert(false); /* unknown rbc node type */
+      result = v;
+  }
+
+  insert_assoc(memo, (node_ptr) v, (node_ptr) result);
+  return RbcId(result, sign);
+}
+
+be_ptr be_rewrite(Be_Manager_ptr mgr, be_ptr be){
+  Rbc_Manager_t* rbc     = (Rbc_Manager_t*) Be_Manager_GetSpecManager(mgr);
+  Rbc_t*         f       = (Rbc_t*) Be_Manager_Be2Spec(mgr, be);
+  hash_ptr       fathers = new_assoc();
+  hash_ptr       memo    = new_assoc();
+  Rbc_t*         result;
+
+  be_count_fathers(f, fathers);
+  result = be_rewrite_rec(rbc, f, fathers, memo, be_rewrite_stats(mgr, true));
+
+  free_assoc(memo);
+  free_assoc(fathers);
+  return Be_Manager_Spec2Be(mgr, (void*) result);
+}
+
+long be_rewrite_get_folds(Be_Manager_ptr mgr){
+  BeRewriteStats* stats = be_rewrite_stats(mgr, false);
+  return (BeRewriteStats*) NULL == stats ? 0 : stats->folds;
+}
+
+long be_rewrite_get_merges(Be_Manager_ptr mgr){
+  BeRewriteStats* stats = be_rewrite_stats(mgr, false);
+  return (BeRewriteStats*) NULL == stats ? 0 : stats->merges;
+}
+
+static enum st_retval be_rewrite_free_stats(char* key, char* record, char* arg){
+  FREE(record);
+  return ST_DELETE;
+}
+
+void be_rewrite_reset_stats(){
+  if ((hash_ptr) NULL != BE_REWRITE_stats) {
+    clear_assoc_and_free_entries(BE_REWRITE_stats, &be_rewrite_free_stats);
+  }
+}
+
+void be_rewrite_forget_stats(Be_Manager_ptr mgr){
+  BeRewriteStats* stats = be_rewrite_stats(mgr, false);
+  if ((BeRewriteStats*) NULL != stats) {
+    remove_assoc(BE_REWRITE_stats, (node_ptr) mgr);
+    FREE(stats);
+  }
+}
+
+/****** CNF ENCODINGS *****************************************************************************
+ * NuSMV converts a be to cnf with the algorithm selected by its rbc_rbc2cnf_algorithm option.
+ * The converter below offers alternative encodings. It shares the mapping of the rbc nodes to the
+ * cnf variables of NuSMV (see Rbc_get_node_cnf) so that the models are decoded the usual way:
+ *
+ *   - BE_CNF_TSEITIN defines every connective with the clauses of both polarities;
+ *   - BE_CNF_PLAISTED_GREENBAUM only emits the clauses of the polarities in which each connective
+ *     is actually used;
+ *   - BE_CNF_COMPACT additionally merges the conjunctions which have a single father into that
+ *     father (these get no cnf variable at all).
+ **************************************************************************************************/
+#define BE_CNF_POSITIVE 1
+#define BE_CNF_NEGATIVE 2
+#define BE_CNF_BOTH     (BE_CNF_POSITIVE | BE_CNF_NEGATIVE)
+#define BE_CNF_SWAP(p)  ((((p) & BE_CNF_POSITIVE) << 1) | (((p) & BE_CNF_NEGATIVE) >> 1))
+
+typedef struct BeCnfEncoder_TAG {
+  Rbc_Manager_t* rbc;
+  int            encoding;
+  hash_ptr       fathers;   /* vertex -> number of fathers (compact encoding only) */
+  hash_ptr       inputs;    /* connective -> Olist of its (possibly negated) inputs */
+  hash_ptr       polarity;  /* vertex -> polarities in which it is used */
+  hash_ptr       seen;      /* the vertices already visited */
+  Olist_ptr      gates;     /* the connectives, fathers first */
+  Olist_ptr      vars;      /* the variables */
+} BeCnfEncoder;
+
+/* Collects the connectives and variables of the sub DAG rooted in `f` */
+static void be_cnf_visit(BeCnfEncoder* enc, Rbc_t* f){
+  Rbc_t*    v = RbcGetRef(f);
+  Olist_ptr inputs;
+  Oiter     iter;
+  unsigned  i;
+
+  if ((node_ptr) NULL != find_assoc(enc->seen, (node_ptr) v)) return;
+  insert_assoc(enc->seen, (node_ptr) v, (node_ptr) v);
+
+  switch (Rbc_get_type(v)) {
+    case RBCTOP: return;
+    case RBCVAR: Olist_append(enc->vars, (void*) v); return;
+    default: break;
+  }
+
+  inputs = Olist_create();
+  if (BE_CNF_COMPACT == enc->encoding && RBCAND == Rbc_get_type(v)) {
+    be_conjuncts(v, enc->fathers, inputs);
+  }
+  else {
+    for (i = 0; i < v->numSons; i++) Olist_append(inputs, (void*) v->outList[i]);
+  }
+  insert_assoc(enc->inputs, (node_ptr) v, (node_ptr) inputs);
+
+  OLIST_FOREACH(inputs, iter) {
+    be_cnf_visit(enc, (Rbc_t*) Oiter_element(iter));
+  }
+  /* reversed post order: a connective comes before all its inputs */
+  Olist_prepend(enc->gates, (void*) v);
+}
+
+/* Propagates the polarities from the fathers to their inputs */
+static void be_cnf_polarities(BeCnfEncoder* enc){
+  Oiter gate;
+
+  OLIST_FOREACH(enc->gates, gate) {
+    Rbc_t* v   = (Rbc_t*) Oiter_element(gate);
+    int    pol = PTR_TO_INT(find_assoc(enc->polarity, (node_ptr) v));
+    int    pos = 0;
+    Oiter  iter;
+
+    OLIST_FOREACH((Olist_ptr) find_assoc(enc->inputs, (node_ptr) v), iter) {
+      Rbc_t* input = (Rbc_t*) Oiter_element(iter);
+      Rbc_t* ref   = RbcGetRef(input);
+      int    p     = pol;
+
+      /* the operands of an iff and the condition of an ite are used both ways */
+      if (RBCIFF == Rbc_get_type(v) || (RBCITE == Rbc_get_type(v) && 0 == pos)) {
+        p = 0 == pol ? 0 : BE_CNF_BOTH;
+      }
+      if (RbcIsSet(input)) p = BE_CNF_SWAP(p);
+
+      p |= PTR_TO_INT(find_assoc(enc->polarity, (node_ptr) ref));
+      insert_assoc(enc->polarity, (node_ptr) ref, PTR_FROM_INT(node_ptr, p));
+      pos++;
+    }
+  }
+}
+
+/* :return: the cnf literal standing for the (possibly negated) vertex `f` */
+static int be_cnf_literal(Rbc_Manager_t* rbc, Rbc_t* f){
+  int var = Rbc_get_node_cnf(rbc, RbcGetRef(f), &rbc->maxCnfVariable);
+  return RbcIsSet(f) ? -var : var;
+}
+
+/* Adds the clause {a, b, c} (c may be 0 for a binary clause) to `cnf` */
+static void be_cnf_push(Be_Cnf_ptr cnf, int a, int b, int c){
+  int* clause = ALLOC(int, 4);
+  clause[0] = a;
+  clause[1] = b;
+  clause[2] = c;
+  clause[3] = 0;
+  Slist_push(Be_Cnf_GetClausesList(cnf), (void*) clause);
+}
+
+/* Emits the clauses defining the connective `v` in the polarities `pol` */
+static void be_cnf_define(BeCnfEncoder* enc, Be_Cnf_ptr cnf, Rbc_t* v, int pol){
+  Olist_ptr inputs = (Olist_ptr) find_assoc(enc->inputs, (node_ptr) v);
+  int       size   = Olist_get_size(inputs);
+  int*      lits   = ALLOC(int, size);
+  int       self   = be_cnf_literal(enc->rbc, v);
+  int       i      = 0;
+  Oiter     iter;
+
+  OLIST_FOREACH(inputs, iter) {
+    lits[i++] = be_cnf_literal(enc->rbc, (Rbc_t*) Oiter_element(iter));
+  }
+
+  switch (Rbc_get_type(v)) {
+    case RBCAND:
+      if (pol & BE_CNF_POSITIVE) {
+        for (i = 0; i < size; i++) be_cnf_push(cnf, -self, lits[i], 0);
+      }
+      if (pol & BE_CNF_NEGATIVE) {
+        int* clause = ALLOC(int, size + 2);
+        for (i = 0; i < size; i++) clause[i] = -lits[i];
+        clause[size]   = self;
+        clause[size+1] = 0;
+        Slist_push(Be_Cnf_GetClausesList(cnf), (void*) clause);
+      }
+      break;
+    case RBCIFF:
+      if (pol & BE_CNF_POSITIVE) {
+        be_cnf_push(cnf, -self, -lits[0],  lits[1]);
+        be_cnf_push(cnf, -self,  lits[0], -lits[1]);
+      }
+      if (pol & BE_CNF_NEGATIVE) {
+        be_cnf_push(cnf,  self,  lits[0],  lits[1]);
+        be_cnf_push(cnf,  self, -lits[0], -lits[1]);
+      }
+      break;
+    case RBCITE:
+      if (pol & BE_CNF_POSITIVE) {
+        be_cnf_push(cnf, -self, -lits[0],  lits[1]);
+        be_cnf_push(cnf, -self,  lits[0],  lits[2]);
+      }
+      if (pol & BE_CNF_NEGATIVE) {
+        be_cnf_push(cnf,  self, -lits[0], -lits[1]);
+        be_cnf_push(cnf,  self,  lits[0], -lits[2]);
+      }
+      break;
+    default:
+      nusmv_assert(false); /* unknown rbc node type */
+  }
+  FREE(lits);
+}
+
+Be_Cnf_ptr be_convert_to_cnf(Be_Manager_ptr mgr, be_ptr be, int polarity, int encoding){
+  Rbc_Manager_t* rbc = (Rbc_Manager_t*) Be_Manager_GetSpecManager(mgr);
+  Rbc_t*         f   = (Rbc_t*) Be_Manager_Be2Spec(mgr, be);
+  Be_Cnf_ptr     cnf = Be_Cnf_Create(be);
+  BeCnfEncoder   enc;
+  Oiter          iter;
+  int            root;
+  int            max_var;
+  int            i;
+
+  /* constants are handled the same way as Rbc_Convert2Cnf */
+  Be_Cnf_SetFormulaLiteral(cnf, INT_MAX);
+  Be_Cnf_SetMaxVarIndex(cnf, 0);
+  if (f == rbc->one) return cnf;
+  if (f == rbc->zero) {
+    int* empty = ALLOC(int, 1);
+    empty[0] = 0;
+    Slist_push(Be_Cnf_GetClausesList(cnf), (void*) empty);
+    return cnf;
+  }
+
+  /* the rbc variables keep their index as cnf variable as long as possible (as Rbc_Convert2Cnf) */
+  max_var = 0;
+  for (i = rbc->varCapacity - 1; i >= 0; --i) {
+    if (rbc->varTable[i] != NIL(Rbc_t)) { max_var = i; break; }
+  }
+  if (rbc->maxUnchangedRbcVariable == rbc->maxCnfVariable
+      && rbc->maxUnchangedRbcVariable < max_var) {
+    rbc->maxUnchangedRbcVariable = max_var;
+    rbc->maxCnfVariable          = max_var;
+  }
+
+  enc.rbc      = rbc;
+  enc.encoding = encoding;
+  enc.fathers  = new_assoc();
+  enc.inputs   = new_assoc();
+  enc.polarity = new_assoc();
+  enc.seen     = new_assoc();
+  enc.gates    = Olist_create();
+  enc.vars     = Olist_create();
+
+  if (BE_CNF_COMPACT == encoding) be_count_fathers(f, enc.fathers);
+  be_cnf_visit(&enc, f);
+
+  /* the formula literal is asserted: the root is used in the polarity of its own sign */
+  root = polarity > 0 ? BE_CNF_POSITIVE : (polarity < 0 ? BE_CNF_NEGATIVE : BE_CNF_BOTH);
+  if (RbcIsSet(f)) root = BE_CNF_SWAP(root);
+  insert_assoc(enc.polarity, (node_ptr) RbcGetRef(f), PTR_FROM_INT(node_ptr, root));
+  if (BE_CNF_TSEITIN != encoding) be_cnf_polarities(&enc);
+
+  OLIST_FOREACH(enc.vars, iter) {
+    Slist_push(Be_Cnf_GetVarsList(cnf),
+               PTR_FROM_INT(void*, be_cnf_literal(rbc, (Rbc_t*) Oiter_element(iter))));
+  }
+  OLIST_FOREACH(enc.gates, iter) {
+    Rbc_t* v   = (Rbc_t*) Oiter_element(iter);
+    int    pol = BE_CNF_TSEITIN == encoding ? BE_CNF_BOTH
+                                            : PTR_TO_INT(find_assoc(enc.polarity, (node_ptr) v));
+    be_cnf_define(&enc, cnf, v, pol);
+    Olist_destroy((Olist_ptr) find_assoc(enc.inputs, (node_ptr) v));
+  }
+
+  Be_Cnf_RemoveDuplicateLiterals(cnf);
+  Be_Cnf_SetFormulaLiteral(cnf, be_cnf_literal(rbc, f));
+  Be_Cnf_SetMaxVarIndex(cnf, rbc->maxCnfVariable);
+
+  Olist_destroy(enc.vars);
+  Olist_destroy(enc.gates);
+  free_assoc(enc.seen);
+  free_assoc(enc.polarity);
+  free_assoc(enc.inputs);
+  free_assoc(enc.fathers);
+  return cnf;
+}
+
+int cnf_variables_count(Be_Cnf_ptr cnf){
+  hash_ptr seen  = new_assoc();
+  int      count = 0;
+  Siter    iter;
+
+  SLIST_FOREACH(Be_Cnf_GetClausesList(cnf), iter){
+    int* clause = (int*) Siter_element(iter);
+    for (; 0 != *clause; clause++) {
+      node_ptr var = PTR_FROM_INT(node_ptr, abs(*clause));
+      if ((node_ptr) NULL == find_assoc(seen, var)) {
+        insert_assoc(seen, var, var);
+        count++;
+      }
+    }
+  }
+  free_assoc(seen);
+  return count;
+}
+
+/****** CONE OF INFLUENCE *************************************************************************
+ * The top level conjuncts of a be are partitioned according to the variables they share (union
+ * find over the rbc variable indices). Only the conjuncts which are (transitively) connected to the
+ * variables of the seed are kept.
+ **************************************************************************************************/
+
+/* Appends the top level conjuncts of `f` to `conjuncts` */
+static void be_coi_conjuncts(Rbc_t* f, Olist_ptr conjuncts){
+  unsigned i;
+
+  if (!RbcIsSet(f) && RBCAND == Rbc_get_type(f)) {
+    for (i = 0; i < f->numSons; i++) be_coi_conjuncts(f->outList[i], conjuncts);
+  }
+  else {
+    Olist_append(conjuncts, (void*) f);
+  }
+}
+
+/* :return: the representative of the class of the variable `var` */
+static int be_coi_find(int* parent, int var){
+  while (parent[var] != var) {
+    parent[var] = parent[parent[var]];
+    var         = parent[var];
+  }
+  return var;
+}
+
+/* Merges the classes of all the variables of `f` with the one of *first (the first variable met
+ * when *first is still negative).
+ */
+static void be_coi_merge(Rbc_t* f, hash_ptr seen, int* parent, int* first){
+  Rbc_t*   v = RbcGetRef(f);
+  unsigned i;
+
+  if ((node_ptr) NULL != find_assoc(seen, (node_ptr) v)) return;
+  insert_assoc(seen, (node_ptr) v, (node_ptr) v);
+
+  if (RBCVAR == Rbc_get_type(v)) {
+    int var = Rbc_GetVarIndex(v);
+    if (*first < 0) *first = var;
+    else            parent[be_coi_find(parent, var)] = be_coi_find(parent, *first);
+    return;
+  }
+  for (i = 0; i < v->numSons; i++) be_coi_merge(v->outList[i], seen, parent, first);
+}
+
+be_ptr be_cone_of_influence(Be_Manager_ptr mgr, be_ptr be, be_ptr seed){
+  Rbc_Manager_t* rbc       = (Rbc_Manager_t*) Be_Manager_GetSpecManager(mgr);
+  Olist_ptr      conjuncts = Olist_create();
+  hash_ptr       seen      = new_assoc();
+  int*           parent    = ALLOC(int, rbc->varCapacity);
+  int*           firsts;
+  int            seed_var  = -1;
+  int            size, kept, i;
+  Rbc_t*         result;
+  Oiter          iter;
+
+  for (i = 0; i < rbc->varCapacity; i++) parent[i] = i;
+
+  be_coi_conjuncts((Rbc_t*) Be_Manager_Be2Spec(mgr, be), conjuncts);
+  size   = Olist_get_size(conjuncts);
+  firsts = ALLOC(int, size);
+
+  i = 0;
+  OLIST_FOREACH(conjuncts, iter) {
+    firsts[i] = -1;
+    clear_assoc(seen);
+    be_coi_merge((Rbc_t*) Oiter_element(iter), seen, parent, &firsts[i]);
+    i++;
+  }
+  clear_assoc(seen);
+  be_coi_merge((Rbc_t*) Be_Manager_Be2Spec(mgr, seed), seen, parent, &seed_var);
+
+  /* the conjuncts without any variable (if any) are kept */
+  result = rbc->one;
+  kept   = 0;
+  i      = 0;
+  OLIST_FOREACH(conjuncts, iter) {
+    if (firsts[i] < 0
+        || (seed_var >= 0 && be_coi_find(parent, firsts[i]) == be_coi_find(parent, seed_var))) {
+      result = Rbc_MakeAnd(rbc, result, (Rbc_t*) Oiter_element(iter), RBC_TRUE);
+      kept++;
+    }
+    i++;
+  }
+
+  FREE(firsts);
+  FREE(parent);
+  free_assoc(seen);
+  Olist_destroy(conjuncts);
+  return kept == size ? be : Be_Manager_Spec2Be(mgr, (void*) result);
+}
+
+/****** SCRATCH REGIONS ***************************************************************************
+ * NuSMV never collects the nodes of the RBC DAG: generating the problems of many properties makes
+ * the DAG grow forever. A scratch region pins the nodes which exist when it is opened (the
+ * fatherless ones are marked, the others are reachable from them) so that the nodes created while
+ * it is open can be collected when it is closed, except the ones explicitly kept.
+ *
+ * The collection is implemented here rather than with Dag_ManagerGC since the latter frees the
+ * vertices of its garbage list while iterating over that very list.
+ **************************************************************************************************/
+
+/* The cache of the inlining package of rbc (see rbcInline.c) */
+extern hash_ptr inlining_cache;
+
+struct BeScratch_TAG {
+  BeEnc_ptr      enc;
+  Be_Manager_ptr mgr;
+  Rbc_Manager_t* rbc;
+  Olist_ptr      pinned; /* the vertices marked when the region was opened */
+  Olist_ptr      kept;   /* the vertices marked to survive the region */
+};
+
+BeScratch_ptr be_scratch_open(BeEnc_ptr enc){
+  BeScratch_ptr scratch = ALLOC(struct BeScratch_TAG, 1);
+  lsGen         gen;
+  Rbc_t*        v;
+
+  scratch->enc    = enc;
+  scratch->mgr    = BeEnc_get_be_manager(enc);
+  scratch->rbc    = (Rbc_Manager_t*) Be_Manager_GetSpecManager(scratch->mgr);
+  scratch->pinned = Olist_create();
+  scratch->kept   = Olist_create();
+
+  gen = lsStart(scratch->rbc->dagManager->gcList);
+  while (lsNext(gen, (lsGeneric*) &v, LS_NH) == LS_OK) {
+    v = RbcGetRef(v);
+    if (0 == v->mark) {
+      Rbc_Mark(scratch->rbc, v);
+      Olist_append(scratch->pinned, (void*) v);
+    }
+  }
+  lsFinish(gen);
+  return scratch;
+}
+
+void be_scratch_keep(BeScratch_ptr scratch, be_ptr be){
+  Rbc_t* v = RbcGetRef((Rbc_t*) Be_Manager_Be2Spec(scratch->mgr, be));
+  Rbc_Mark(scratch->rbc, v);
+  Olist_append(scratch->kept, (void*) v);
+}
+
+/* Frees the fatherless and unmarked vertex `v` and, recursively, the sons it leaves fatherless.
+ * :return: the number of vertices freed.
+ */
+static long be_scratch_collect(Rbc_Manager_t* rbc, Rbc_t* v){
+  Dag_Manager_t* dag   = rbc->dagManager;
+  long           count = 1;
+  Rbc_t*         tmp;
+  int            var;
+  unsigned       i;
+
+  st_delete(dag->vTable, (char**) &v, (char**) &tmp);
+
+  /* forget the cnf variable of the vertex (the variable itself is never reused) */
+  var = PTR_TO_INT(find_assoc(rbc->rbcNode2cnfVar_cnf, (node_ptr) v));
+  if (0 != var) {
+    remove_assoc(rbc->rbcNode2cnfVar_cnf, (node_ptr) v);
+    remove_assoc(rbc->cnfVar2rbcNode_cnf, PTR_FROM_INT(node_ptr, var));
+  }
+
+  if ((Rbc_t**) NULL != v->outList) {
+    for (i = 0; i < v->numSons; i++) {
+      Rbc_t* son = RbcGetRef(v->outList[i]);
+      if (0 == --(son->mark)) count += be_scratch_collect(rbc, son);
+    }
+    FREE(v->outList);
+  }
+  if ((lsHandle) NULL != v->vHandle) {
+    lsRemoveItem(v->vHandle, (lsGeneric*) &tmp);
+  }
+
+  ++(dag->stats[DAG_GC_NO]);
+  FREE(v);
+  return count;
+}
+
+/* Removes an entry of the shift memoization table of BeEnc (and frees its key) */
+static enum st_retval be_scratch_forget_shift(char* key, char* record, char* arg){
+  FREE(key);
+  return ST_DELETE;
+}
+
+long be_scratch_close(BeScratch_ptr scratch){
+  Olist_ptr garbage = Olist_create();
+  long      count   = 0;
+  lsGen     gen;
+  Oiter     iter;
+  Rbc_t*    v;
+
+  /* the garbage list must not change while it is iterated */
+  gen = lsStart(scratch->rbc->dagManager->gcList);
+  while (lsNext(gen, (lsGeneric*) &v, LS_NH) == LS_OK) {
+    v = RbcGetRef(v);
+    if (0 == v->mark) Olist_append(garbage, (void*) v);
+  }
+  lsFinish(gen);
+
+  /* a fatherless vertex is never the son of another one: none of them is freed twice */
+  OLIST_FOREACH(garbage, iter) {
+    count += be_scratch_collect(scratch->rbc, (Rbc_t*) Oiter_element(iter));
+  }
+
+  OLIST_FOREACH(scratch->kept, iter) {
+    Rbc_Unmark(scratch->rbc, (Rbc_t*) Oiter_element(iter));
+  }
+  OLIST_FOREACH(scratch->pinned, iter) {
+    Rbc_Unmark(scratch->rbc, (Rbc_t*) Oiter_element(iter));
+  }
+
+  /* these caches may refer to the collected vertices */
+  if (count > 0) {
+    st_foreach(scratch->enc->shift_hash, &be_scratch_forget_shift, NULL);
+    Bmc_Conv_quit_cache();
+    Bmc_Conv_init_cache();
+    /* the ltl tableau memo is lazily re-created by its next lookup */
+    bmc_quit_tableau_memoization();
+    if ((hash_ptr) NULL != inlining_cache) {
+      rbc_inlining_cache_quit();
+      rbc_inlining_cache_init();
+    }
+  }
+
+  Olist_destroy(garbage);
+  Olist_destroy(scratch->kept);
+  Olist_destroy(scratch->pinned);
+  FREE(scratch);
+  return count;
 }
@@ -30,6 +30,9 @@
 #include <utils/defs.h>
 
 #include <bmc/bmc.h>
+#include <sat/SatSolver.h>
+#include <utils/Slist.h>
+#include <utils/Olist.h>
 
 /*
  * This function shifts the formula (not necessarily booleanized) encoded
@@ -252,6 +255,29 @@ be_ptr sem_no_loop_offset(BeFsm_ptr fsm, node_ptr formula, int time, int bound,
  *     of `bound` steps encoded to start at time `offset` in the `fsm` encoding timeline.
  */
 be_ptr sem_with_loop_offset(BeFsm_ptr fsm, node_ptr formula, int time, int bound, int loop, int offset);
+/*
+ * Generates the Be [[formula]]_{bound} corresponding to the bounded semantics of `formula` (with
+ * or without loop) encoded with an `offset` long shift in the timeline of the encoder.
+ *
+ * This is the batched counterpart of `sem_no_loop_offset` and `sem_with_loop_offset`: the whole
+ * disjunction over the loop positions is assembled in one single call and the fairness
+ * constraints are shared among the loop positions instead of being rebuilt for each of them.
+ *
+ * .. warning::
+ *    The error checking and consistency verification *MUST* be done in the
+ *    python code calling this function.
+ *
+ * :param fsm: the BeFsm for which the property will be verified.
+ * :param formula: the property (in NNF) for which to generate the bounded semantics.
+ * :param bound: the logical time bound to the problem.
+ * :param offset: the time offset in the encoding block where the sem of this formula will be
+ *     generated.
+ * :param fairness: a flag (0 or 1) indicating whether or not to take the fairness constraints
+ *     into account.
+ * :return: a Be corresponding to the semantics of `formula` for a problem with a maximum of
+ *     `bound` steps encoded to start at time `offset` in the `fsm` encoding timeline.
+ */
+be_ptr sem_at_offset(BeFsm_ptr fsm, node_ptr formula, int bound, int offset, int fairness);
 
 /* This function is the non memoized version of :see:`sem_no_loop_offset`.
  * All the arguments and return value keep the same meaning between the two functions.
@@ -294,10 +320,305 @@ be_ptr MEMOIZER_get(node_ptr key);
  */
 void MEMOIZER_put(node_ptr key, be_ptr be);
 /* Clears the memoization cache and reclaims all its associated system resources.
+ * The usage statistics are reset too but the capacity of the cache is preserved.
  *
  * .. warning::
  *    This function *MUST* be called whenever the BMC sub system is deinitialized in PyNuSMV.
  */
 void MEMOIZER_clear();
+/* Sets the maximum number of entries of the cache. When the cache holds more entries than its
+ * new capacity, the least recently used ones are evicted right away.
+ *
+ * :param capacity: the maximum number of entries of the cache (a value <= 0 means unbounded)
+ */
+void MEMOIZER_set_capacity(long capacity);
+/* :return: the maximum number of entries of the cache (a value <= 0 means unbounded) */
+long MEMOIZER_get_capacity();
+/* :return: the number of entries currently stored in the cache */
+long MEMOIZER_get_size();
+/* :return: the number of lookups that found a memoized value since the last clear */
+long MEMOIZER_get_hits();
+/* :return: the number of lookups that found no memoized value since the last clear */
+long MEMOIZER_get_misses();
+/* :return: the number of entries evicted to respect the capacity since the last clear */
+long MEMOIZER_get_evictions();
+
+/* ********** INTERPOLATION ***********************************************/
+
+/* :return: 1 when the NuSMV library was built with a proof logging MiniSat
+ *     (MINISAT_WITH_PROOF_LOGGING) and hence supports the extraction of
+ *     interpolants, 0 otherwise.
+ *
+ * .. warning::
+ *    Without proof logging, the interpolation groups of the solvers are pure
+ *    virtual functions which abort the process when called. The python code
+ *    *MUST* check this flag before using any of them.
+ */
+int sat_interpolation_enabled();
+/* Extracts the interpolant of the last (unsatisfiable) problem solved by
+ * `solver`. The A part of the problem is made of the clauses added to the
+ * interpolation groups listed in `groups`, the B part is made of all the
+ * other clauses.
+ *
+ * The interpolant is built in terms of the boolean expressions of `mgr`: the
+ * CNF variables of the proof are mapped back onto the variables of the
+ * manager they were created from. The auxiliary CNF variables shared by A and
+ * B (those of the subformulas occurring in both parts) are mapped onto the
+ * subformula they stand for. For this to be sound, the clauses must define
+ * them with an equivalence (see BE_CNF_TSEITIN).
+ *
+ * :param solver: a MiniSat solver whose proof logging is enabled.
+ * :param mgr: the manager of the boolean expressions used to build the CNF
+ * :param groups: an Slist of the interpolation groups (ints) of the A part.
+ * :return: the interpolant, a boolean expression over the variables shared
+ *     by the A and B parts of the problem.
+ */
+be_ptr sat_interpolant(SatSolver_ptr solver, Be_Manager_ptr mgr, Slist_ptr groups);
+
+/* Shifts the (timed) boolean expression `expr` whose variables are all timed at
+ * `from` so that its variables get timed at `to`. This is the converse operation of
+ * `BeEnc_untimed_expr_to_timed` when `to` is negative: the variables are then brought
+ * back to the untimed block. Frozen variables only exist in the untimed block: they
+ * are left unchanged.
+ *
+ * .. warning::
+ *    The expression *MUST* only contain variables timed at `from` (current state,
+ *    frozen and input variables) otherwise the behavior is undefined. This is the
+ *    case of the interpolants computed on the frontier between two time steps.
+ *
+ * :param enc: the BeEnc (pointer) used to encode `expr`.
+ * :param expr: the expression to shift.
+ * :param from: the time at which all the variables of `expr` are timed.
+ * :param to: the time at which to shift `expr` (negative means untimed).
+ * :return: the shifted expression.
+ */
+be_ptr shift_timed_expr(BeEnc_ptr enc, be_ptr expr, int from, int to);
+
+/* ********** ASSUMPTIONS *************************************************/
+
+/* Solves the problem of the MiniSat `solver` under the given `assumptions`.
+ * This is a working replacement for `SatSolver_solve_all_groups_assume` which
+ * additionally lets the caller select the (incremental) groups to solve.
+ *
+ * :param solver: a MiniSat solver
+ * :param assumptions: an Slist of CNF literals (ints) assumed to hold.
+ * :param groups: an Olist of the groups to solve together with the permanent
+ *     group. When it is NULL, all the groups of the solver are solved.
+ * :return: the outcome of the solving (a SatSolverResult). In case of success, the model is
+ *     available through `SatSolver_get_model`. Otherwise, the assumptions
+ *     responsible for the failure are available through `sat_conflict`.
+ */
+int sat_solve_assume(SatSolver_ptr solver, Slist_ptr assumptions, Olist_ptr groups);
+/* Returns the final conflict of the last call to `sat_solve_assume` that
+ * returned UNSATISFIABLE: the subset of the assumptions (CNF literals) which
+ * suffices to make the problem unsatisfiable.
+ *
+ * :param solver: a MiniSat solver
+ * :return: a new Slist of CNF literals (ints) which is owned by the caller.
+ */
+Slist_ptr sat_conflict(SatSolver_ptr solver);
+
+/* ********** BULK CNF CONVERSIONS ****************************************/
+
+/* :return: the total number of literals in the clauses of `cnf` */
+int cnf_literals_count(Be_Cnf_ptr cnf);
+/* Flattens the clauses of `cnf` in one pass into two (caller allocated)
+ * arrays of 32 bits ints:
+ *
+ *   - `literals` receives the literals of all the clauses one after the other
+ *     (without the terminating zeroes);
+ *   - `offsets` receives the position in `literals` of the first literal of
+ *     each clause followed by the total number of literals. Hence, the ith
+ *     clause spans literals[offsets[i]] to literals[offsets[i+1]-1].
+ *
+ * :param cnf: the cnf to flatten.
+ * :param literals: the buffer receiving the literals.
+ * :param literals_size: the size (in bytes) of the `literals` buffer.
+ * :param offsets: the buffer receiving the offsets.
+ * :param offsets_size: the size (in bytes) of the `offsets` buffer.
+ * :return: 0 on success, -1 when one of the buffers is too small.
+ */
+int cnf_to_arrays(Be_Cnf_ptr cnf, char* literals, size_t literals_size,
+                  char* offsets, size_t offsets_size);
+/* Adds the clauses encoded in the flat `literals` and `offsets` arrays of 32
+ * bits ints (see `cnf_to_arrays`) to the `group` of `solver`.
+ *
+ * :param solver: the solver to feed.
+ * :param group: the group where to add the clauses.
+ * :param literals: the buffer holding the literals.
+ * :param literals_size: the size (in bytes) of the `literals` buffer.
+ * :param offsets: the buffer holding the offsets.
+ * :param offsets_size: the size (in bytes) of the `offsets` buffer.
+ * :return: the number of clauses added or -1 when the offsets are not
+ *     consistent with the literals.
+ */
+int sat_add_clauses(SatSolver_ptr solver, SatSolverGroup group,
+                    char* literals, size_t literals_size,
+                    char* offsets, size_t offsets_size);
+
+/* ********** EXTERNAL SOLVERS ********************************************/
+
+/* Records the outcome of a solving performed outside of `solver` (typically
+ * by an external solver process) so that `SatSolver_get_model` and
+ * `SatSolver_get_last_solving_time` return it.
+ *
+ * :param solver: the solver standing for the external one. It must not be
+ *     solved itself afterwards.
+ * :param model: an Slist of CNF literals (ints) satisfying the problem. It is
+ *     copied. NULL stands for an empty model.
+ * :param solving_time: the time (in ms) spent solving the problem.
+ */
+void sat_set_outcome(SatSolver_ptr solver, Slist_ptr model, long solving_time);
+
+/* ********** SAT MODEL DECODING ******************************************/
+
+/* Fills two (caller allocated) arrays of 32 bits ints of the same size with
+ * the location of the cnf variables 0 to size-1 in the encoding `enc`:
+ *
+ *   - `times` receives the time of the variable (as `BeEnc_index_to_time`);
+ *   - `untimed` receives the index of the untimed variable corresponding to
+ *     the cnf variable or -1 when the cnf variable does not stand for a
+ *     variable of the model (eg. it was introduced by the cnf conversion).
+ *
+ * :param enc: the encoding whose variables are located.
+ * :param times: the buffer receiving the times.
+ * :param times_size: the size (in bytes) of the `times` buffer.
+ * :param untimed: the buffer receiving the untimed indices.
+ * :param untimed_size: the size (in bytes) of the `untimed` buffer.
+ * :return: 0 on success, -1 when the buffers do not have the same size.
+ */
+int enc_cnf_decoding_table(BeEnc_ptr enc, char* times, size_t times_size,
+                           char* untimed, size_t untimed_size);
+
+/* ********** BE METRICS **************************************************/
+
+/* :param mgr: the manager of `be`.
+ * :param be: the root of the measured DAG.
+ * :return: the number of distinct connectives (AND, IFF, ITE nodes) of the
+ *     DAG rooted in `be`.
+ */
+int be_size(Be_Manager_ptr mgr, be_ptr be);
+/* :param mgr: the manager of `be`.
+ * :param be: the root of the measured DAG.
+ * :return: the number of connectives on the longest path from `be` to one of
+ *     its leaves (variables and constants have a depth of 0).
+ */
+int be_depth(Be_Manager_ptr mgr, be_ptr be);
+/* :param mgr: the manager of `be`.
+ * :param be: the root of the measured DAG.
+ * :return: the number of distinct variables occurring in `be`.
+ */
+int be_num_vars(Be_Manager_ptr mgr, be_ptr be);
+/* :return: the number of nodes currently stored in the DAG of `mgr` */
+long be_manager_get_nodes(Be_Manager_ptr mgr);
+/* :return: the number of bins of the hash table indexing the DAG of `mgr` */
+long be_manager_get_bins(Be_Manager_ptr mgr);
+/* :return: the number of nodes ever created in the DAG of `mgr` */
+long be_manager_get_created(Be_Manager_ptr mgr);
+/* :return: the number of nodes garbage collected from the DAG of `mgr` */
+long be_manager_get_collected(Be_Manager_ptr mgr);
+/* :return: the number of variables created in the RBC manager behind `mgr` */
+long be_manager_get_vars(Be_Manager_ptr mgr);
+
+/* ********** BE REWRITING ************************************************/
+
+/* Simplifies `be` with AIG-style local rewriting: the non shared trees of
+ * conjunctions are flattened, cleared from their duplicate and constant
+ * conjuncts, folded to false when they contain a complementary pair and
+ * rebuilt as balanced trees. The result is equivalent to `be`.
+ *
+ * :param mgr: the manager of `be`.
+ * :param be: the expression to simplify.
+ * :return: the simplified expression.
+ */
+be_ptr be_rewrite(Be_Manager_ptr mgr, be_ptr be);
+/* :return: the number of nodes folded into a constant by `be_rewrite` in
+ *     `mgr` since the last reset.
+ */
+long be_rewrite_get_folds(Be_Manager_ptr mgr);
+/* :return: the number of duplicate conjuncts removed by `be_rewrite` in
+ *     `mgr` since the last reset.
+ */
+long be_rewrite_get_merges(Be_Manager_ptr mgr);
+/* Resets the counters of `be_rewrite` (of all the managers) */
+void be_rewrite_reset_stats();
+/* Drops the counters of `be_rewrite` in `mgr` (which is about to be deleted) */
+void be_rewrite_forget_stats(Be_Manager_ptr mgr);
+
+/* ********** CNF ENCODINGS ***********************************************/
+
+/* The cnf encodings supported by `be_convert_to_cnf` */
+#define BE_CNF_TSEITIN             1
+#define BE_CNF_PLAISTED_GREENBAUM  2
+#define BE_CNF_COMPACT             3
+
+/* Converts `be` to cnf with the given `encoding`:
+ *
+ *   - BE_CNF_TSEITIN defines every connective with the clauses of both
+ *     polarities (`polarity` is ignored);
+ *   - BE_CNF_PLAISTED_GREENBAUM only emits the clauses of the polarities in
+ *     which each connective is used;
+ *   - BE_CNF_COMPACT is BE_CNF_PLAISTED_GREENBAUM where the conjunctions
+ *     having a single father are merged into that father.
+ *
+ * The resulting cnf is used exactly as the one of `Be_ConvertToCnf`: the cnf
+ * variables are shared with the conversions of NuSMV.
+ *
+ * :param mgr: the manager of `be`.
+ * :param be: the expression to convert.
+ * :param polarity: the polarity of the formula literal (1, -1 or 0 for both)
+ * :param encoding: one of the BE_CNF_* encodings.
+ * :return: a fresh cnf equisatisfiable with `be`.
+ */
+Be_Cnf_ptr be_convert_to_cnf(Be_Manager_ptr mgr, be_ptr be, int polarity, int encoding);
+/* :return: the number of distinct variables occurring in the clauses of
+ *     `cnf`.
+ */
+int cnf_variables_count(Be_Cnf_ptr cnf);
+
+/* ********** CONE OF INFLUENCE *******************************************/
+
+/* Restricts `be` to the cone of influence of `seed`: only the top level
+ * conjuncts of `be` sharing (transitively) some variables with `seed` are
+ * kept.
+ *
+ * :param mgr: the manager of `be` and `seed`.
+ * :param be: the expression to restrict.
+ * :param seed: the expression whose variables define the cone.
+ * :return: the conjunction of the conjuncts of `be` in the cone of `seed`
+ *     (`be` itself when no conjunct is dropped).
+ */
+be_ptr be_cone_of_influence(Be_Manager_ptr mgr, be_ptr be, be_ptr seed);
+
+/* ********** SCRATCH REGIONS *********************************************/
+
+/* A scratch region of the RBC DAG of a be manager */
+typedef struct BeScratch_TAG* BeScratch_ptr;
+
+/* Opens a scratch region in the DAG of the manager of `enc`: all the nodes
+ * existing when the region is opened survive its closing.
+ *
+ * :param enc: the encoding whose manager (and shifting cache) is used.
+ * :return: the new region. It must be closed with `be_scratch_close`.
+ */
+BeScratch_ptr be_scratch_open(BeEnc_ptr enc);
+/* Protects `be` (and its sub expressions) from being collected when `scratch`
+ * is closed.
+ *
+ * :param scratch: the region where `be` was created.
+ * :param be: the expression to keep.
+ */
+void be_scratch_keep(BeScratch_ptr scratch, be_ptr be);
+/* Closes `scratch` and frees all the nodes created since it was opened which
+ * were not kept. The caches of NuSMV referring to these nodes are cleared.
+ *
+ * .. warning::
+ *    The be's created in the region (and not kept) are dangling pointers
+ *    once the region is closed.
+ *
+ * :param scratch: the region to close (it is freed).
+ * :return: the number of nodes freed.
+ */
+long be_scratch_close(BeScratch_ptr scratch);
 
 #endif
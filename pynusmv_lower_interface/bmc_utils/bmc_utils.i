@@ -32,6 +32,20 @@
 
 %feature("autodoc", 1);
 
+/* The flat int32 buffers of the bulk cnf conversions are passed as python
+   objects supporting the (writable) buffer protocol: numpy arrays,
+   array.array, bytearray ... */
+%include <pybuffer.i>
+%pybuffer_mutable_binary(char* literals, size_t literals_size);
+%pybuffer_mutable_binary(char* offsets,  size_t offsets_size);
+%pybuffer_mutable_binary(char* times,    size_t times_size);
+%pybuffer_mutable_binary(char* untimed,  size_t untimed_size);
+
+/* SatSolverGroup's are plain ints (see the sat module) */
+%typemap(in) SatSolverGroup {
+	$1 = (SatSolverGroup) PyInt_AsLong($input);
+}
+
 %include ../nusmv/typedefs.tpl
 
 %include ../../dependencies/NuSMV/NuSMV-2.5.4/nusmv/src/utils/defs.h
@@ -35,6 +35,13 @@
 %typemap(out) SatSolverGroup {
 	$result = PyInt_FromLong((long) $1);
 }
+/* the same goes for SatSolverItpGroup's (interpolation groups) */
+%typemap(in) SatSolverItpGroup {
+	$1 = (SatSolverItpGroup) PyInt_AsLong($input);
+}
+%typemap(out) SatSolverItpGroup {
+	$result = PyInt_FromLong((long) $1);
+}
 /******************************************************************************/
 
 %include ../../../dependencies/NuSMV/NuSMV-2.5.4/nusmv/src/utils/defs.h
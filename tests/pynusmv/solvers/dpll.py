@@ -0,0 +1,67 @@
+"""
+A trivial stand-in for an external sat solver: reads a DIMACS problem on its
+standard input, solves it with a naive DPLL and prints the answer in the
+format of the SAT competitions.
+
+Usage: python dpll.py [--sleep SECONDS] [--garbage] [--crash]
+"""
+import os
+import sys
+import time
+
+def parse(text):
+    clauses = []
+    clause  = []
+    for line in text.splitlines():
+        if not line or line[0] in 'cp':
+            continue
+        for lit in map(int, line.split()):
+            if lit == 0:
+                clauses.append(clause)
+                clause = []
+            else:
+                clause.append(lit)
+    return clauses
+
+def dpll(clauses, assignment):
+    while True:
+        simplified = []
+        for clause in clauses:
+            if any(lit in assignment for lit in clause):
+                continue
+            rest = [lit for lit in clause if -lit not in assignment]
+            if not rest:
+                return None
+            simplified.append(rest)
+        units = [c[0] for c in simplified if len(c) == 1]
+        if not units:
+            break
+        assignment = assignment | {units[0]}
+        clauses    = simplified
+    if not simplified:
+        return assignment
+    lit = simplified[0][0]
+    return dpll(simplified, assignment | {lit}) \
+        or dpll(simplified, assignment | {-lit})
+
+def main(args):
+    if '--sleep' in args:
+        time.sleep(float(args[args.index('--sleep') + 1]))
+    if '--garbage' in args:
+        print("this is not a sat solver")
+        return 0
+    if '--crash' in args:
+        os.abort()
+    clauses = parse(sys.stdin.read())
+    model   = dpll(clauses, frozenset())
+    if model is None:
+        print("s UNSATISFIABLE")
+        return 20
+    variables = {abs(lit) for clause in clauses for lit in clause}
+    values    = [v if v in model else -v for v in sorted(variables)]
+    print("s SATISFIABLE")
+    print("v " + " ".join(map(str, values)) + " 0")
+    return 10
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -7,7 +7,8 @@ from pynusmv.bmc.glob      import go_bmc, bmc_exit
 from pynusmv               import glob 
 from pynusmv.be.fsm        import BeFsm  
 from pynusmv.be.expression import Be
-from pynusmv.sat           import Polarity
+from pynusmv.be.manager    import BeRbcManager
+from pynusmv.sat           import Polarity, SatSolverFactory, SatSolverResult
 
 class TestBe(unittest.TestCase):
       
@@ -238,6 +239,53 @@ class TestBe(unittest.TestCase):
         self.assertTrue( false.iff(false).is_constant())
     
             
+    def test_metrics(self):
+        true = Be.true(self._manager)
+        v    = self._fsm.encoding.by_name["v"].boolean_expression
+        w    = self._fsm.encoding.by_name["w"].boolean_expression
+
+        self.assertEqual((0, 0, 0), (true.size, true.depth, true.num_vars))
+        self.assertEqual((0, 0, 1), (v.size, v.depth, v.num_vars))
+
+        x = v ^ w
+        self.assertEqual((1, 1, 2), (x.size, x.depth, x.num_vars))
+        # x is shared: it is only counted once
+        shared = (x & v).iff(x & w)
+        self.assertEqual((4, 3, 2), (shared.size, shared.depth, shared.num_vars))
+        self.assertEqual(shared.size, (~shared).size)
+
+    def test_rewrite(self):
+        v = self._fsm.encoding.by_name["v"].boolean_expression
+        w = self._fsm.encoding.by_name["w"].boolean_expression
+        x = v ^ w
+
+        # the complementary conjuncts are too far apart for the rbc constructors
+        contradiction = ((x & v) & w) & ~x
+        self.assertFalse(contradiction.is_false())
+        folds = self._manager.stats().folds
+        self.assertTrue(contradiction.rewrite().is_false())
+        self.assertGreater(self._manager.stats().folds, folds)
+
+        duplicate = ((x & v) & w) & x
+        merges    = self._manager.stats().merges
+        rewritten = duplicate.rewrite()
+        self.assertGreater(self._manager.stats().merges, merges)
+        self.assertEqual(3, rewritten.size)
+        
+        # the counters are those of the manager
+        other = BeRbcManager.with_capacity(10)
+        self.assertEqual((0, 0), (other.stats().folds, other.stats().merges))
+        self.assertLessEqual(rewritten.depth, duplicate.depth)
+
+        # the rewriting preserves the semantics
+        solver = SatSolverFactory.create()
+        cnf    = (~duplicate.iff(rewritten)).to_cnf(Polarity.POSITIVE)
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+
+        self.assertTrue(contradiction.to_cnf(rewrite=True).original_problem.is_false())
+
     ############################################################################
     # The behavior of the features tested is not verifiable without a sat solver
     # hence the following test cases only serve the purpose of validating the
@@ -7,8 +7,9 @@ from pynusmv.init          import init_nusmv, deinit_nusmv
 from pynusmv.bmc.glob      import go_bmc, bmc_exit
 from pynusmv               import glob 
 from pynusmv.be.fsm        import BeFsm  
-from pynusmv.be.expression import Be
-from pynusmv.sat           import Polarity
+from pynusmv.be.expression import Be, CnfEncoding
+from pynusmv.sat           import Polarity, SatSolverFactory, SatSolverResult
+from pynusmv.bmc.utils     import BmcModel
 
 class TestBeCnf(unittest.TestCase):
       
@@ -190,4 +191,88 @@ class TestBeCnf(unittest.TestCase):
         # negative polarity corresponds to a negation of the formula
         cnf= (-w.imply(v)).to_cnf()
         self.assertTrue(str(cnf) in ["formula literal = X9 <-> (X3) & (!X1)", 
-                                     "formula literal = X9 <-> (!X1) & (X3)"])
\ No newline at end of file
+                                     "formula literal = X9 <-> (!X1) & (X3)"])
+    
+    def test_to_arrays(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        
+        v  = self._fsm.encoding.by_name['v'].boolean_expression
+        w  = self._fsm.encoding.by_name['w'].boolean_expression
+        cnf= (w.imply(v) & (v | w)).to_cnf(Polarity.NOT_SET)
+        
+        literals, offsets = cnf.to_arrays()
+        self.assertEqual(numpy.int32, literals.dtype)
+        self.assertEqual(numpy.int32, offsets.dtype)
+        self.assertEqual(cnf.clauses_number + 1, len(offsets))
+        self.assertEqual(len(literals), offsets[-1])
+        
+        clauses = [list(literals[offsets[i]:offsets[i+1]]) 
+                   for i in range(len(offsets)-1)]
+        self.assertEqual(list(cnf.clauses_list), clauses)
+        
+        # constants have no clause
+        literals, offsets = Be.true(self._manager).to_cnf().to_arrays()
+        self.assertEqual(0, len(literals))
+        self.assertEqual([0], list(offsets))
+
+    def _solve(self, cnf):
+        solver = SatSolverFactory.create()
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        return solver.solve()
+
+    def test_encodings(self):
+        model = BmcModel(self._fsm)
+        v     = self._fsm.encoding.by_name['v']
+        w     = self._fsm.encoding.by_name['w']
+        # v alternates from TRUE and w is always FALSE: bad is unsatisfiable
+        # along the paths and good is satisfiable
+        bad   = v.at_time[3].boolean_expression & w.at_time[2].boolean_expression
+        good  = v.at_time[3].boolean_expression.iff(w.at_time[3].boolean_expression)
+
+        for problem in (model.path(3) & bad, model.path(3) & good):
+            expected = self._solve(problem.to_cnf())
+            stats    = {}
+            for encoding in CnfEncoding:
+                cnf = problem.to_cnf(Polarity.POSITIVE, encoding=encoding)
+                self.assertEqual(expected, self._solve(cnf), encoding.name)
+                stats[encoding] = cnf.stats
+                self.assertEqual(cnf.clauses_number, cnf.stats.clauses)
+
+            self.assertLessEqual(stats[CnfEncoding.PLAISTED_GREENBAUM].clauses,
+                                 stats[CnfEncoding.TSEITIN].clauses)
+            self.assertLessEqual(stats[CnfEncoding.COMPACT].variables,
+                                 stats[CnfEncoding.PLAISTED_GREENBAUM].variables)
+
+        # the models of the alternative encodings are decoded the usual way
+        cnf    = (model.path(3) & good).to_cnf(encoding=CnfEncoding.COMPACT)
+        solver = SatSolverFactory.create()
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.SATISFIABLE, solver.solve())
+        self.assertTrue(all(self._manager.cnf_literal_to_be_literal(l) != 0
+                            for l in cnf.vars_list))
+
+    def test_encodings_constants(self):
+        true  = Be.true(self._manager)
+        false = Be.false(self._manager)
+        for encoding in CnfEncoding:
+            self.assertEqual((0, 0, 0), tuple(true.to_cnf(encoding=encoding).stats))
+            self.assertEqual(1, false.to_cnf(encoding=encoding).clauses_number)
+
+    def test_cone_of_influence(self):
+        model = BmcModel(self._fsm)
+        v     = self._fsm.encoding.by_name['v'].at_time[2].boolean_expression
+        path  = model.path(2)
+
+        # v and w do not interact: the constraints on w are out of the cone of v
+        cone  = path.cone_of_influence(v)
+        self.assertLess(cone.num_vars, path.num_vars)
+        self.assertLess((cone & v).to_cnf().clauses_number,
+                        (path & v).to_cnf().clauses_number)
+        self.assertEqual(self._solve((path & v).to_cnf()),
+                         self._solve((path & v).to_cnf(cone_of_influence=v)))
+        self.assertEqual(path, path.cone_of_influence(path))
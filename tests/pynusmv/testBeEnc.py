@@ -5,11 +5,15 @@ import unittest
 
 from tests import utils as tests 
 
+from pynusmv_lower_interface.nusmv.enc      import enc  as nsenc
+from pynusmv_lower_interface.nusmv.enc.base import base as nsbaseenc
+from pynusmv_lower_interface.nusmv.enc.bool import bool as nsboolenc
+
 from pynusmv.init       import init_nusmv, deinit_nusmv
 from pynusmv.glob       import load_from_file 
 from pynusmv.bmc.glob   import go_bmc, bmc_exit
 from pynusmv.be.encoder import BeEnc, BeVarType
-from pynusmv.node       import Node
+from pynusmv.node       import Node, Identifier, Boolean
 from pynusmv.parser     import parse_simple_expression
 
 class TestBeEnc(unittest.TestCase):
@@ -148,6 +152,49 @@ class TestBeEnc(unittest.TestCase):
         with self.assertRaises(KeyError):
             self._TESTED.by_name["doesnt_exist"]
     
+    def test_lookup_caches(self):
+        enc = self._TESTED
+        v   = enc.by_name['v']
+        # the same objects are served over and over
+        self.assertIs(v, enc.by_name['v'])
+        self.assertIs(v, enc.at_index[v.index])
+        self.assertIs(v.at_time[2], v.at_time[2])
+        self.assertIs(v, v.at_time[2].untimed)
+        self.assertEqual(enc.untimed_variables, list(enc))
+        
+        # the cached timed variables are those of the encoder
+        timed = enc.by_expr[enc.shift_to_time(v.boolean_expression, 2)]
+        self.assertEqual(timed, v.at_time[2])
+        self.assertEqual(2, v.at_time[2].time)
+        self.assertEqual(v.at_time[3], v.at_time[2].at_time[3])
+        
+        # the caches can be rebuilt at any time
+        enc.clear_caches()
+        self.assertEqual(v, enc.by_name['v'])
+        self.assertEqual(timed, enc.by_name['v'].at_time[2])
+    
+    def test_commit_layer_clears_caches(self):
+        enc   = self._TESTED
+        other = BeEnc.global_singleton_instance()
+        with self.assertRaises(KeyError):
+            other.by_name['w']
+        
+        # declare a new variable in its own layer and encode it
+        symb  = enc.symbol_table
+        symb.create_layer("extra")
+        symb.declare_state_var("extra", Identifier.from_string("w"), Boolean())
+        boolenc = nsboolenc.boolenc2baseenc(nsenc.Enc_get_bool_encoding())
+        nsbaseenc.BaseEnc_commit_layer(boolenc, "extra")
+        enc.commit_layer("extra")
+        
+        # the lookup tables of all the wrappers of the encoder were dropped
+        self.assertEqual('w', str(other.by_name['w'].name))
+        self.assertEqual('next(w)', str(enc.by_name['next(w)'].name))
+        
+        enc.remove_layer("extra")
+        with self.assertRaises(KeyError):
+            other.by_name['w']
+    
     def test_by_expr(self):
         v = self._TESTED.by_name['v']
         self.assertEqual(v, self._TESTED.by_expr[v.boolean_expression])    
@@ -72,6 +72,19 @@ class TestBeManager(unittest.TestCase):
         # abstraction)
         mgr.reserve(12)
         
+    def test_stats(self):
+        stats = self.mgr.stats()
+        self.assertGreater(stats.nodes, 0)
+        self.assertGreater(stats.load, 0)
+        self.assertGreaterEqual(stats.created, stats.nodes)
+        self.assertGreaterEqual(stats.variables, len(self.enc.curr_variables))
+
+        a = self.enc.by_name["a"]
+        b = self.enc.by_name["b"]
+        ((a.boolean_expression ^ b.next.boolean_expression)
+         & (b.boolean_expression ^ a.next.boolean_expression))
+        self.assertGreater(self.mgr.stats().created, stats.created)
+
     def test_dump(self):
         with StdioFile.stdout() as out:
             a = self.enc.by_name["a"].at_time[2].boolean_expression
@@ -125,4 +125,43 @@ class TestMultiBitsVariables(TestCase):
             
             self.assertEqual("{'two_bits': Ko}", str(decoded[0]))
             self.assertEqual("{'two_bits': Ok}", str(decoded[1]))
-        
\ No newline at end of file
+            
+    def test_decode_sat_model_refresh(self):
+        """
+        Tests that the decoding tables of BeEnc follow the growth of the 
+        encoder (and the appearance of new cnf variables)
+        """
+        with Configure(self, __file__, "/models/multibit.smv"):
+            b0 = self.enc.by_name["two_bits.0"]
+            b1 = self.enc.by_name["two_bits.1"]
+            bb = self.enc.by_name["__bool__"]
+            
+            def solve(expr):
+                cnf    = expr.to_cnf()
+                solver = SatSolverFactory.create()
+                solver+= cnf
+                solver.polarity(cnf, polarity=Polarity.POSITIVE)
+                solver.solve()
+                return list(solver.model)
+            
+            first = solve(b0.at_time[0].boolean_expression &
+                          b1.at_time[0].boolean_expression)
+            self.assertEqual("{'two_bits': Ko}", 
+                             str(self.enc.decode_sat_model(first)[0]))
+            
+            # this extends the max time of the encoder
+            later = self.enc.max_time + 3
+            second= solve(b0.at_time[later].boolean_expression  &
+                          b1.at_time[later].boolean_expression  &
+                          -bb.at_time[later].boolean_expression &
+                          -b0.at_time[0].boolean_expression     &
+                          -b1.at_time[0].boolean_expression)
+            decoded = self.enc.decode_sat_model(second)
+            self.assertEqual("{'two_bits': Ok}", str(decoded[0]))
+            self.assertEqual("Ko", str(decoded[later]['two_bits']))
+            self.assertFalse(decoded[later]['__bool__'])
+            
+            # the memoized values do not alter the results
+            self.assertEqual(str(decoded), str(self.enc.decode_sat_model(second)))
+            self.assertEqual("{'two_bits': Ko}", 
+                             str(self.enc.decode_sat_model(first)[0]))
@@ -8,6 +8,9 @@ from pynusmv.glob       import (load,
                                 build_boolean_model)
 
 from pynusmv.bmc        import glob as bmcglob
+from pynusmv.bmc        import ltlspec
+from pynusmv.parser     import parse_ltl_spec
+from pynusmv.node       import Node
 from pynusmv.exception  import (NuSMVNeedBooleanModelError,
                                 NuSMVBmcAlreadyInitializedError,
                                 NuSMVNoReadModelError)
@@ -108,4 +111,48 @@ class TestBmcGlob(unittest.TestCase):
         load(self.model())
         with bmcglob.BmcSupport():
             # may not provoke any error
-            pass
\ No newline at end of file
+            pass
+
+    def test_scratch_manager(self):
+        load(self.model())
+        with bmcglob.BmcSupport():
+            fsm   = bmcglob.master_be_fsm()
+            mgr   = fsm.encoding.manager
+            a     = fsm.encoding.by_name['a']
+            b     = fsm.encoding.by_name['b']
+            shared= a.boolean_expression & b.boolean_expression
+            nodes = mgr.stats().nodes
+
+            with bmcglob.scratch_manager(capacity=1000) as scratch:
+                self.assertTrue(scratch.active)
+                problem = fsm.init & fsm.trans & fsm.invariants
+                for t in range(5):
+                    problem = problem & (a.at_time[t].boolean_expression
+                                         ^ b.at_time[t+1].boolean_expression)
+                kept = bmcglob.keep(a.boolean_expression.iff(b.next.boolean_expression))
+                size = fsm.encoding.shift_to_time(fsm.trans, 3).size
+                inside = mgr.stats().nodes
+                self.assertGreater(inside, nodes)
+
+            self.assertFalse(scratch.active)
+            self.assertGreater(scratch.collected, 0)
+            self.assertEqual(inside - scratch.collected, mgr.stats().nodes)
+            # the expressions created before the region and the kept ones survive
+            self.assertEqual((1, 2), (shared.size, shared.num_vars))
+            self.assertEqual((1, 2), (kept.size, kept.num_vars))
+            # the shifted expressions memoized in the region are forgotten
+            self.assertEqual(size, fsm.encoding.shift_to_time(fsm.trans, 3).size)
+
+            # nothing happens without an active region
+            self.assertIs(shared, bmcglob.keep(shared))
+
+            # the ltl tableaux memoized in a region are forgotten too
+            spec  = Node.from_ptr(parse_ltl_spec("G (a <-> !b)"))
+            sizes = []
+            for _ in range(2):
+                with bmcglob.scratch_manager():
+                    problem = ltlspec.generate_ltl_problem(fsm, spec, bound=5)
+                    cnf     = problem.to_cnf()
+                    sizes.append((problem.size, problem.num_vars,
+                                  cnf.clauses_number))
+            self.assertEqual(sizes[0], sizes[1])
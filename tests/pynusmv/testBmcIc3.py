@@ -0,0 +1,96 @@
+"""
+This module validates the behavior of the functions defined in `pynusmv.bmc.ic3`
+"""
+import unittest
+from tests                 import utils as tests
+
+from pynusmv.init          import init_nusmv, deinit_nusmv
+from pynusmv.glob          import load_from_file, prop_database, compute_model
+from pynusmv.parser        import parse_simple_expression
+from pynusmv.node          import Node
+from pynusmv               import mc
+
+from pynusmv.bmc.glob      import go_bmc, bmc_exit
+from pynusmv.bmc           import ic3
+from pynusmv.bmc.ic3       import Ic3Checker, Ic3Verdict
+
+class TestBmcIc3(unittest.TestCase):
+    
+    def setUp(self):
+        init_nusmv()
+        
+    def tearDown(self):
+        bmc_exit()
+        deinit_nusmv()
+    
+    def load(self, model):
+        load_from_file(tests.current_directory(__file__)+"/models/"+model)
+        compute_model()
+        go_bmc()
+    
+    def test_check_invar_ic3(self):
+        self.load("dummy_invarspecs.smv")
+        valid, invalid = list(prop_database())
+        
+        result = ic3.check_invar_ic3(valid)
+        self.assertEqual(Ic3Verdict.PROVED, result.verdict)
+        self.assertIsNone(result.trace)
+        
+        result = ic3.check_invar_ic3(invalid)
+        self.assertEqual(Ic3Verdict.VIOLATED, result.verdict)
+        self.assertIsNotNone(result.trace)
+        
+        with self.assertRaises(ValueError):
+            ic3.check_invar_ic3(valid, max_frames=-1)
+    
+    def test_deep_violation(self):
+        self.load("dummy_ltlspecs.smv")
+        prop   = Node.from_ptr(parse_simple_expression("y != 6"))
+        result = Ic3Checker(prop).check()
+        self.assertEqual(Ic3Verdict.VIOLATED, result.verdict)
+        self.assertEqual(6, len(result.trace))
+    
+    def test_certificate(self):
+        self.load("dummy_ltlspecs.smv")
+        fsm     = prop_database().master.bddFsm
+        prop    = Node.from_ptr(parse_simple_expression("y != 10"))
+        checker = Ic3Checker(prop)
+        self.assertIsNone(checker.invariant())
+        
+        result  = checker.check()
+        self.assertEqual(Ic3Verdict.PROVED, result.verdict)
+        self.assertIsNotNone(checker.invariant())
+        
+        invariant = checker.invariant_bdd(fsm)
+        bad       = mc.eval_simple_expression(fsm, "y = 10")
+        self.assertTrue((invariant & bad).is_false())
+        self.assertTrue(fsm.init <= invariant)
+        self.assertTrue(fsm.post(invariant) <= invariant)
+        
+        stats = checker.stats
+        self.assertEqual(result.frames+1, len(stats))
+        self.assertEqual(list(range(len(stats))), [s.level for s in stats])
+        self.assertGreater(sum(s.sat_calls for s in stats), 0)
+    
+    def test_max_frames(self):
+        self.load("dummy_ltlspecs.smv")
+        prop    = Node.from_ptr(parse_simple_expression("y != 6"))
+        checker = Ic3Checker(prop)
+        self.assertEqual(Ic3Verdict.UNKNOWN, checker.check(2).verdict)
+        self.assertEqual(Ic3Verdict.VIOLATED, checker.check().verdict)
+    
+    def test_counter_example(self):
+        self.load("dummy_ltlspecs.smv")
+        # y != 2 holds in the initial state but is violated two steps later
+        prop   = Node.from_ptr(parse_simple_expression("y != 2"))
+        result = Ic3Checker(prop).check()
+        self.assertEqual(Ic3Verdict.VIOLATED, result.verdict)
+        values = [{str(s): str(v) for s, v in step}["y"] 
+                  for step in result.trace]
+        self.assertEqual(["0", "1", "2"], values)
+        
+        # y <= 7 holds but is not valid (y ranges over 0..15)
+        prop   = Node.from_ptr(parse_simple_expression("y <= 7"))
+        result = Ic3Checker(prop).check()
+        self.assertEqual(Ic3Verdict.PROVED, result.verdict)
+        self.assertIsNone(result.trace)
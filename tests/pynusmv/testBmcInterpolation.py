@@ -0,0 +1,127 @@
+"""
+This module validates the behavior of the functions defined in
+`pynusmv.bmc.interpolation`
+"""
+import unittest
+from tests                   import utils as tests
+
+from pynusmv.init            import init_nusmv, deinit_nusmv
+from pynusmv.glob            import load_from_file, prop_database, compute_model
+from pynusmv.parser          import parse_simple_expression
+from pynusmv.node            import Node
+from pynusmv.sat             import SatSolverFactory, SatSolverResult, Polarity
+from pynusmv.exception       import NuSmvSatSolverError
+
+from pynusmv.bmc.glob        import go_bmc, bmc_exit, master_be_fsm
+from pynusmv.bmc             import interpolation
+from pynusmv.bmc             import utils
+from pynusmv.bmc.interpolation import InterpolationChecker, ItpVerdict
+
+class TestBmcInterpolation(unittest.TestCase):
+    
+    def setUp(self):
+        init_nusmv()
+        
+    def tearDown(self):
+        bmc_exit()
+        deinit_nusmv()
+    
+    def load(self, model):
+        load_from_file(tests.current_directory(__file__)+"/models/"+model)
+        compute_model()
+        go_bmc()
+        solver = SatSolverFactory.create(incremental=False, proof=True)
+        if not solver.supports_interpolation:
+            with self.assertRaises(NuSmvSatSolverError):
+                InterpolationChecker(
+                    Node.from_ptr(parse_simple_expression("y != 10"))).check()
+            self.skipTest("NuSMV was not built with a proof logging MiniSat")
+    
+    def test_check_invar_itp(self):
+        self.load("dummy_invarspecs.smv")
+        valid, invalid = list(prop_database())
+        
+        result = interpolation.check_invar_itp(valid)
+        self.assertEqual(ItpVerdict.PROVED, result.verdict)
+        self.assertIsNone(result.trace)
+        
+        result = interpolation.check_invar_itp(invalid)
+        self.assertEqual(ItpVerdict.VIOLATED, result.verdict)
+        self.assertIsNotNone(result.trace)
+        
+        with self.assertRaises(ValueError):
+            interpolation.check_invar_itp(valid, max_bound=-1)
+    
+    def test_deep_violation(self):
+        self.load("dummy_ltlspecs.smv")
+        prop   = Node.from_ptr(parse_simple_expression("y != 6"))
+        result = InterpolationChecker(prop).check()
+        self.assertEqual(ItpVerdict.VIOLATED, result.verdict)
+        self.assertEqual(6, len(result.trace))
+    
+    def test_certificate(self):
+        self.load("dummy_ltlspecs.smv")
+        fsm     = master_be_fsm()
+        enc     = fsm.encoding
+        model   = utils.BmcModel(fsm)
+        prop    = Node.from_ptr(parse_simple_expression("y != 10"))
+        checker = InterpolationChecker(prop)
+        self.assertIsNone(checker.invariant())
+        
+        result  = checker.check()
+        self.assertEqual(ItpVerdict.PROVED, result.verdict)
+        self.assertGreater(result.iterations, 0)
+        
+        invar   = checker.invariant()
+        bad     = enc.shift_to_time(
+                    utils.make_nnf_boolean_wff(
+                        Node.from_ptr(parse_simple_expression("y = 10"))
+                    ).to_be(enc), 0)
+        # init => invar, invar & T => invar' and invar & bad is unsat
+        for problem in [model.init[0] & ~enc.shift_to_time(invar, 0),
+                        enc.shift_to_time(invar, 0) & model.unrolling(0, 1)
+                            & ~enc.shift_to_time(invar, 1),
+                        enc.shift_to_time(invar, 0) & bad]:
+            solver = SatSolverFactory.create(incremental=False, proof=False)
+            cnf    = problem.to_cnf(Polarity.POSITIVE)
+            solver+= cnf
+            solver.polarity(cnf, Polarity.POSITIVE)
+            self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+    
+    def test_max_bound(self):
+        self.load("dummy_ltlspecs.smv")
+        prop    = Node.from_ptr(parse_simple_expression("y != 6"))
+        checker = InterpolationChecker(prop)
+        self.assertEqual(ItpVerdict.UNKNOWN, checker.check(2).verdict)
+        self.assertEqual(ItpVerdict.VIOLATED, checker.check().verdict)
+    
+    def test_frozen_variables(self):
+        self.load("frozen_counter.smv")
+        fsm     = master_be_fsm()
+        enc     = fsm.encoding
+        model   = utils.BmcModel(fsm)
+        
+        result  = InterpolationChecker(
+                    Node.from_ptr(parse_simple_expression("y != 3"))).check()
+        self.assertEqual(ItpVerdict.VIOLATED, result.verdict)
+        self.assertEqual(3, len(result.trace))
+        
+        # the invariant depends on the frozen variable
+        prop    = Node.from_ptr(parse_simple_expression("stuck -> y = 0"))
+        checker = InterpolationChecker(prop)
+        self.assertEqual(ItpVerdict.PROVED, checker.check().verdict)
+        
+        invar   = checker.invariant()
+        bad     = enc.shift_to_time(
+                    utils.make_nnf_boolean_wff(
+                        Node.from_ptr(parse_simple_expression("stuck & y != 0"))
+                    ).to_be(enc), 0)
+        for problem in [model.init[0] & ~enc.shift_to_time(invar, 0),
+                        enc.shift_to_time(invar, 0) & model.unrolling(0, 1)
+                            & ~enc.shift_to_time(invar, 1),
+                        enc.shift_to_time(invar, 0) & bad]:
+            solver = SatSolverFactory.create(incremental=False, proof=False)
+            cnf    = problem.to_cnf(Polarity.POSITIVE)
+            solver+= cnf
+            solver.polarity(cnf, Polarity.POSITIVE)
+            self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
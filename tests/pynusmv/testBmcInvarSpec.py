@@ -5,13 +5,16 @@ import unittest
 from tests                 import utils as tests
 
 from pynusmv.init          import init_nusmv, deinit_nusmv
-from pynusmv.glob          import load_from_file, prop_database
+from pynusmv.glob          import load_from_file, prop_database, compute_model
+from pynusmv.parser        import parse_ltl_spec, parse_simple_expression
+from pynusmv.node          import Node
 from pynusmv.utils         import StdioFile
 
 from pynusmv.bmc.glob      import go_bmc, bmc_exit, master_be_fsm
 from pynusmv.bmc           import invarspec 
 from pynusmv.bmc           import utils 
 from pynusmv.bmc.utils     import DumpType , BmcModel
+from pynusmv.bmc.invarspec import KInductionChecker, KInductionVerdict
 
 class TestBmcInvarSpec(unittest.TestCase):
     
@@ -133,3 +136,80 @@ class TestBmcInvarSpec(unittest.TestCase):
             problem = invarspec.generate_invar_problem(self.fsm, expr)
             invarspec.dump_dimacs_filename(self.fsm.encoding, problem.to_cnf(), "testit")
             
+
+
+class TestKInduction(unittest.TestCase):
+    
+    def setUp(self):
+        init_nusmv()
+        
+    def tearDown(self):
+        bmc_exit()
+        deinit_nusmv()
+    
+    def load(self, model):
+        load_from_file(tests.current_directory(__file__)+"/models/"+model)
+        compute_model()
+        go_bmc()
+    
+    def ltl(self, text):
+        return Node.from_ptr(parse_ltl_spec(text))
+    
+    def test_invariants(self):
+        self.load("dummy_invarspecs.smv")
+        valid, invalid = list(prop_database())
+        
+        result = KInductionChecker(valid.expr).check(10)
+        self.assertEqual(KInductionVerdict.PROVED, result.verdict)
+        self.assertEqual(1, result.bound)
+        self.assertIsNone(result.trace)
+        
+        result = KInductionChecker(invalid.expr).check(10)
+        self.assertEqual(KInductionVerdict.VIOLATED, result.verdict)
+        self.assertEqual(0, result.bound)
+        self.assertIsNotNone(result.trace)
+        
+        with self.assertRaises(ValueError):
+            KInductionChecker(valid.expr).check(-1)
+    
+    def test_monitor(self):
+        self.load("dummy_ltlspecs.smv")
+        with self.assertRaises(ValueError):
+            KInductionChecker(self.ltl("G F ( y = 0 )"))
+        
+        checker = KInductionChecker(self.ltl("G ( y = 3 -> X y = 4 )"))
+        self.assertEqual(1, checker.depth)
+        self.assertEqual(KInductionVerdict.PROVED, checker.check(10).verdict)
+        
+        result = KInductionChecker(self.ltl("G ( y = 5 -> X y = 0 )")).check(10)
+        self.assertEqual(KInductionVerdict.VIOLATED, result.verdict)
+        self.assertEqual(5, result.bound)
+        
+        # X y = 1 holds but G X y = 1 does not: only the latter is a monitor
+        with self.assertRaises(ValueError):
+            KInductionChecker(self.ltl("X y = 1"))
+        result = KInductionChecker(self.ltl("G X y = 1")).check(10)
+        self.assertEqual(KInductionVerdict.VIOLATED, result.verdict)
+    
+    def test_resume_and_lemmas(self):
+        self.load("dummy_ltlspecs.smv")
+        spec    = self.ltl("G ( y != 10 )")
+        
+        # 8 -> 9 -> 10 is an unreachable induction counter example
+        checker = KInductionChecker(spec)
+        self.assertEqual(KInductionVerdict.UNKNOWN, checker.check(2).verdict)
+        self.assertEqual(3, checker.next_bound)
+        result  = checker.check(10)
+        self.assertEqual(KInductionVerdict.PROVED, result.verdict)
+        self.assertEqual(3, result.bound)
+        
+        # a lemma rules out the unreachable states
+        lemma   = Node.from_ptr(parse_simple_expression("y <= 7"))
+        result  = KInductionChecker(spec, lemmas=[lemma]).check(10)
+        self.assertEqual(KInductionVerdict.PROVED, result.verdict)
+        self.assertEqual(0, result.bound)
+        
+        reachable = prop_database().master.bddFsm.reachable_states
+        result  = KInductionChecker(spec, lemmas=[reachable]).check(10)
+        self.assertEqual(KInductionVerdict.PROVED, result.verdict)
+        self.assertEqual(0, result.bound)
@@ -209,6 +209,39 @@ class TestBmcLTLSpec(unittest.TestCase):
         regular   = ltlspec.bounded_semantics_all_loops(self.fsm, spec, bound=5, loop=0)
         self.assertNotEqual(regular, optimized)
         
+    def test_incremental_checker(self):
+        spec    = Node.from_ptr(parse_ltl_spec("G ( y <= 5 )"))
+        checker = ltlspec.IncrementalLtlChecker(spec, self.fsm)
+        results = checker.check(10)
+        
+        # stops at the first counter example
+        self.assertEqual(list(range(7)), [r.bound for r in results])
+        for result in results[:-1]:
+            self.assertEqual(SatSolverResult.UNSATISFIABLE, result.result)
+            self.assertIsNone(result.trace)
+            self.assertGreater(result.clauses, 0)
+            self.assertGreaterEqual(result.solve_time, 0)
+        self.assertEqual(SatSolverResult.SATISFIABLE, results[-1].result)
+        self.assertIsNotNone(results[-1].trace)
+        self.assertEqual(results[-1].trace, checker.counter_example)
+        self.assertEqual(7, checker.next_bound)
+        
+        with self.assertRaises(ValueError):
+            checker.check(-1)
+    
+    def test_incremental_checker_resume(self):
+        spec    = Node.from_ptr(parse_ltl_spec("G ( y <= 7 )"))
+        checker = ltlspec.IncrementalLtlChecker(spec, self.fsm)
+        self.assertEqual(4, len(checker.check(3)))
+        self.assertEqual(4, checker.next_bound)
+        
+        results = checker.check(10)
+        self.assertEqual(list(range(4, 11)), [r.bound for r in results])
+        self.assertEqual(11, len(checker.results))
+        self.assertIsNone(checker.counter_example)
+        for result in checker.results:
+            self.assertEqual(SatSolverResult.UNSATISFIABLE, result.result)
+    
     def test_dump_dimacs(self):
         # parse the ltl property
         spec    = Node.from_ptr(parse_ltl_spec("G ( y <= 7 )"))
@@ -5,6 +5,7 @@ from pynusmv.parser        import parse_ltl_spec
 from pynusmv.wff           import Wff 
 from pynusmv.be.expression import Be
 from pynusmv.bmc           import ltlspec, utils as bmcutils
+from pynusmv.sat           import SatSolverFactory, SatSolverResult, Polarity
 
 class TestBmcLTLSpecAtOffset(TestCase):
     
@@ -561,3 +562,86 @@ class TestBmcLTLSpecAtOffset(TestCase):
             expr    = ltlspec.bounded_semantics_at_offset(fsm, formula, bound, offset)
 #             VERIFIED manually, complains only about the CNF clauses literals and that's OK.
 #             self.assertEqual(canonical_cnf(expr), canonical_cnf(ref_expr))
+    
+    ############################################################################
+    ############################### batched ####################################
+    ############################################################################ 
+    def reference_semantics_at_offset(self, fsm, formula, bound, offset, fairness):
+        """
+        The loop-per-position construction of `bounded_semantics_at_offset`
+        """
+        enc      = fsm.encoding
+        straight = ltlspec.bounded_semantics_without_loop_at_offset(fsm, formula, 0, bound, offset)
+        k_loop   = Be.false(enc.manager)
+        for i in range(bound): 
+            fairness_cond = bmcutils.fairness_constraint(fsm, offset+bound, offset+i) \
+                                     if fairness \
+                                     else Be.true(enc.manager)
+            k_loop |= ( bmcutils.loop_condition(enc, offset+bound, offset+i) \
+                      & fairness_cond \
+                      & ltlspec.bounded_semantics_with_loop_at_offset(fsm, formula, 0, bound, i, offset))
+        return straight | k_loop
+    
+    def assertEquivalent(self, left, right):
+        cnf    = (left ^ right).to_cnf()
+        solver = SatSolverFactory.create()
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+    
+    def test_batched_semantics_at_offset(self):
+        with Configure(self, __file__, "/models/flipflops_vif_fairness.smv"):
+            fsm     = self.befsm
+            formula = self.nnf("G F (v <-> !f)")
+            for fairness in (True, False):
+                for bound, offset in ((0, 0), (1, 0), (3, 0), (3, 2), (5, 1)):
+                    expr = ltlspec.bounded_semantics_at_offset(fsm, formula, bound, offset, fairness)
+                    ref  = self.reference_semantics_at_offset(fsm, formula, bound, offset, fairness)
+                    self.assertEquivalent(expr, ref)
+    
+    ############################################################################
+    ############################### memoizer ###################################
+    ############################################################################ 
+    def test_memoizer_stats(self):
+        with Configure(self, __file__, "/models/flipflops.smv"):
+            fsm     = self.befsm
+            formula = self.nnf("G (a <-> !b)")
+            ltlspec.memoizer_clear()
+            self.assertEqual(ltlspec.MemoizerStats(0, 0, 0, 0, 0), 
+                             ltlspec.memoizer_stats())
+            
+            first   = ltlspec.bounded_semantics_without_loop_at_offset(fsm, formula, 0, 2, 0)
+            stats   = ltlspec.memoizer_stats()
+            self.assertGreater(stats.size, 0)
+            self.assertGreater(stats.misses, 0)
+            
+            second  = ltlspec.bounded_semantics_without_loop_at_offset(fsm, formula, 0, 2, 0)
+            self.assertEqual(first, second)
+            self.assertEqual(stats.hits+1, ltlspec.memoizer_stats().hits)
+            
+            ltlspec.memoizer_clear()
+            self.assertEqual(0, ltlspec.memoizer_stats().size)
+    
+    def test_memoizer_capacity(self):
+        with Configure(self, __file__, "/models/flipflops.smv"):
+            fsm     = self.befsm
+            formula = self.nnf("G (a <-> !b)")
+            ltlspec.memoizer_clear()
+            try:
+                with self.assertRaises(ValueError):
+                    ltlspec.set_memoizer_capacity(-1)
+                
+                ltlspec.set_memoizer_capacity(2)
+                self.assertEqual(2, ltlspec.get_memoizer_capacity())
+                ltlspec.bounded_semantics_at_offset(fsm, formula, 3, 0)
+                stats = ltlspec.memoizer_stats()
+                self.assertLessEqual(stats.size, 2)
+                self.assertGreater(stats.evictions, 0)
+                
+                # results are unaffected by the evictions
+                ltlspec.set_memoizer_capacity(None)
+                self.assertEqual(0, ltlspec.get_memoizer_capacity())
+                self.assertEqual(ltlspec.bounded_semantics_at_offset(fsm, formula, 3, 0),
+                                 ltlspec.bounded_semantics_at_offset(fsm, formula, 3, 0))
+            finally:
+                ltlspec.set_memoizer_capacity(None)
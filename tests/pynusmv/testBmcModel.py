@@ -2,6 +2,8 @@ import unittest
 
 from tests import utils as tests
 
+from pynusmv_lower_interface.nusmv.bmc import bmc as _bmc
+
 from pynusmv.init          import init_nusmv, deinit_nusmv
 from pynusmv.glob          import load_from_file
 from pynusmv.bmc.glob      import go_bmc, bmc_exit
@@ -116,6 +118,35 @@ class TestBmcModel(unittest.TestCase):
         self.assertEqual(w_init, (noinit & model.init[0]))
         self.assertEqual(noinit, model.unrolling(0, 3))
         
+    def test_cache(self):
+        model = BmcModel(self.fsm)
+        self.assertEqual((0, 0, 0), model.cache_stats)
+        
+        # the cached expressions are the ones NuSMV builds
+        for k in range(5):
+            self.assertEqual(Be(_bmc.Bmc_Model_GetPathWithInit(self.fsm._ptr, k), 
+                                self.enc.manager), 
+                             model.path(k))
+        self.assertEqual(Be(_bmc.Bmc_Model_GetUnrolling(self.fsm._ptr, 2, 6),
+                            self.enc.manager),
+                         model.unrolling(2, 6))
+        self.assertEqual(Be(_bmc.Bmc_Gen_UnrollingFragment(self.fsm._ptr, 3),
+                            self.enc.manager),
+                         model.unrolling_fragment[3])
+        
+        # longer unrollings extend the shorter ones (with the steps of 2..6)
+        misses = model.cache_stats.misses
+        model.unrolling(0, 5)
+        self.assertEqual(misses + 1, model.cache_stats.misses)
+        
+        # asking again is a hit
+        hits = model.cache_stats.hits
+        self.assertEqual(model.path(3), model.path(3))
+        self.assertEqual(hits + 2, model.cache_stats.hits)
+        
+        model.clear_cache()
+        self.assertEqual((0, 0, 0), model.cache_stats)
+        
     def test_fairness(self):
         model = BmcModel(self.fsm)
         # K, L must be consistent with one another
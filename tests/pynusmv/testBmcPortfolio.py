@@ -0,0 +1,58 @@
+"""
+This module validates the behavior of the functions defined in `pynusmv.bmc.portfolio`
+"""
+import unittest
+from tests                 import utils as tests
+
+from pynusmv.bmc           import portfolio
+from pynusmv.bmc           import utils
+from pynusmv.bmc.portfolio import WorkItem, SolverConfig
+from pynusmv.exception     import PyNuSMVError
+
+class TestBmcPortfolio(unittest.TestCase):
+    
+    def model(self):
+        return tests.current_directory(__file__)+"/models/dummy_ltlspecs.smv"
+    
+    def test_work_items(self):
+        with self.assertRaises(ValueError):
+            list(portfolio.work_items(-1))
+        
+        items = list(portfolio.work_items(2))
+        self.assertEqual([0, 1, 2], [i.bound for i in items])
+        self.assertTrue(all(utils.is_all_loopbacks(i.loop) for i in items))
+        
+        items = list(portfolio.work_items(2, loops=True))
+        self.assertEqual(6, len(items))
+        self.assertIn(WorkItem(2, 1), items)
+        self.assertTrue(utils.is_no_loopback(items[0].loop))
+        
+    def test_check_ltl_violated(self):
+        result = portfolio.check_ltl(self.model(), "G ( y <= 5 )", 
+                                     bound=10, processes=2)
+        self.assertIsNotNone(result)
+        self.assertEqual(6, result.bound)
+        self.assertEqual(SolverConfig("MiniSat"), result.solver)
+        self.assertEqual("6", result.counter_example[-1]["y"])
+    
+    def test_check_ltl_loops(self):
+        result = portfolio.check_ltl(self.model(), "F ( y = 8 )", 
+                                     bound=10, loops=True, processes=2)
+        self.assertIsNotNone(result)
+        # the shortest lasso revisits the initial state (y = 0) at time 8
+        self.assertEqual(8, result.bound)
+        self.assertEqual(0, result.loop)
+        self.assertEqual(9, len(result.counter_example))
+    
+    def test_check_ltl_holds(self):
+        self.assertIsNone(portfolio.check_ltl(self.model(), "G ( y <= 7 )", 
+                                              bound=5, processes=2))
+    
+    def test_check_ltl_bad_model(self):
+        directory = tests.current_directory(__file__)+"/models/"
+        with self.assertRaises(IOError):
+            portfolio.check_ltl(directory+"does_not_exist.smv", "G ( y <= 7 )",
+                                bound=5, processes=2)
+        with self.assertRaises(PyNuSMVError):
+            portfolio.check_ltl(directory+"counter-syntax-error.smv", 
+                                "G ( y <= 7 )", bound=5, processes=2)
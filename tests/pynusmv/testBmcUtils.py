@@ -1,4 +1,9 @@
 import unittest
+import io
+import gzip
+import bz2
+import lzma
+
 from tests                 import utils as tests
 from pynusmv_lower_interface.nusmv.parser  import parser as _parser
 
@@ -424,6 +429,85 @@ class TestBmcUtils(unittest.TestCase):
                                       10, 0, 
                                       bmcutils.DumpType.DIMACS, "dimacs_dump")
                 
+    def _dimacs_problem(self):
+        load_from_string(
+            """
+            MODULE main
+            VAR     v : boolean;
+                    w : boolean;
+            ASSIGN  init(v) := TRUE; 
+                    next(v) := !v;
+            LTLSPEC F G ( w <-> v )
+            """)
+        fsm  = master_be_fsm()
+        prop = next(iter(prop_database()))
+        return fsm, generate_ltl_problem(fsm, prop.expr, bound=3).to_cnf()
+    
+    def _clauses(self, text):
+        return [line for line in text.splitlines() 
+                if line and not line.startswith(("c", "p"))]
+    
+    def test_write_dimacs(self):
+        with BmcSupport():
+            fsm, cnf = self._dimacs_problem()
+            stream   = io.BytesIO()
+            written  = bmcutils.write_dimacs(cnf, stream, fsm.encoding, 3, 
+                                             chunk_size=7)
+            text     = stream.getvalue().decode()
+            
+            self.assertEqual(cnf.clauses_number + 1, written)
+            self.assertIn("p cnf {} {}\n".format(cnf.max_var_index, written), text)
+            self.assertIn("c @@@@@ Time 3\n", text)
+            self.assertIn("Model Variable v\n", text)
+            
+            clauses = self._clauses(text)
+            self.assertEqual(written, len(clauses))
+            self.assertEqual("{} 0".format(cnf.formula_literal), clauses[0])
+            self.assertEqual([" ".join(map(str, c))+" 0" for c in cnf.clauses_list],
+                             clauses[1:])
+    
+    def test_write_dimacs_compressed(self):
+        with BmcSupport():
+            fsm, cnf = self._dimacs_problem()
+            plain    = io.BytesIO()
+            bmcutils.write_dimacs(cnf, plain, fsm.encoding, 3)
+            for codec, module in (('gzip', gzip), ('bz2', bz2), ('lzma', lzma)):
+                stream = io.BytesIO()
+                bmcutils.write_dimacs(cnf, stream, fsm.encoding, 3, codec)
+                self.assertFalse(stream.closed)
+                self.assertEqual(plain.getvalue(), 
+                                 module.decompress(stream.getvalue()))
+            with self.assertRaises(ValueError):
+                bmcutils.write_dimacs(cnf, io.BytesIO(), compression='zip')
+    
+    def test_write_dimacs_parts(self):
+        with BmcSupport():
+            fsm, cnf = self._dimacs_problem()
+            plain    = io.BytesIO()
+            bmcutils.write_dimacs(cnf, plain)
+            
+            streams  = []
+            def open_part(i):
+                self.assertEqual(len(streams), i)
+                streams.append(io.BytesIO())
+                return streams[-1]
+            parts, written = bmcutils.write_dimacs_parts(cnf, open_part, 5)
+            
+            self.assertEqual(len(streams), parts)
+            self.assertEqual(cnf.clauses_number + 1, written)
+            self.assertEqual((written + 4) // 5, parts)
+            clauses = []
+            for stream in streams:
+                part = self._clauses(stream.getvalue().decode())
+                self.assertLessEqual(len(part), 5)
+                self.assertIn("p cnf {} {}\n".format(cnf.max_var_index, len(part)),
+                              stream.getvalue().decode())
+                clauses.extend(part)
+            self.assertEqual(self._clauses(plain.getvalue().decode()), clauses)
+            
+            with self.assertRaises(ValueError):
+                bmcutils.write_dimacs_parts(cnf, open_part, 0)
+    
     def test_print_counter_example(self):
         load_from_string(
             """
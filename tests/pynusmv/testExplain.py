@@ -9,6 +9,7 @@ from pynusmv.dd import BDD
 from pynusmv.dd import BDDList
 from pynusmv.prop import PropDb
 from pynusmv.mc import eval_ctl_spec, explainEX, explainEU, explainEG, explain
+from pynusmv.mc import ShortestExplainer
 from pynusmv.prop import Spec
 from pynusmv.prop import (true as sptrue, false as spfalse, imply, iff,
                                ex, eg, ef, eu, ew, ax, ag, af, au, aw, atom)
@@ -188,4 +189,76 @@ class TestExplain(unittest.TestCase):
         self.assertEqual(initState, path[0])
         for i in range(2,len(path)-2,2):
             self.assertTrue(path[i] <= adminNone)
-        self.assertTrue(path[-1] <= adminAlice)
\ No newline at end of file
+        self.assertTrue(path[-1] <= adminAlice)
+    
+    def test_shortest_explain_eu(self):
+        fsm = self.init_model()
+        explainer = ShortestExplainer(fsm)
+        
+        initState = fsm.pick_one_state(fsm.init)
+        true = BDD.true(fsm.bddEnc.DDmanager)
+        adminAlice = eval_ctl_spec(fsm, atom("admin = alice"))
+        
+        # starting -> choosing -> waiting with admin = alice
+        path = explainer.explain_eu(initState, true, adminAlice)
+        self.assertEqual(initState, path[0])
+        self.assertEqual(len(path), 5)
+        self.assertTrue(path[-1] <= adminAlice)
+        
+        # Onion rings are computed once
+        self.assertEqual(len(explainer._rings), 1)
+        state = fsm.pick_one_state(fsm.post(fsm.init))
+        path = explainer.explain_eu(state, true, adminAlice)
+        self.assertEqual(len(path), 3)
+        self.assertEqual(len(explainer._rings), 1)
+        
+        with self.assertRaises(ValueError):
+            explainer.explain_eu(initState, adminAlice, adminAlice)
+    
+    def test_shortest_explain_eg(self):
+        fsm = self.init_model()
+        explainer = ShortestExplainer(fsm)
+        
+        adminAlice = eval_ctl_spec(fsm, atom("admin = alice"))
+        egAlice = eval_ctl_spec(fsm, eg(atom("admin = alice")))
+        state = fsm.pick_one_state(egAlice)
+        
+        # waiting <-> processing
+        path, (inloop, loop) = explainer.explain_eg(state, adminAlice)
+        self.assertEqual(state, path[0])
+        self.assertIn(loop, path)
+        self.assertEqual(len(path), 3)
+        for i in range(0, len(path), 2):
+            self.assertTrue(path[i] <= adminAlice)
+    
+    def test_shortest_explain_eg_first_state(self):
+        fsm = self.inputs_model()
+        explainer = ShortestExplainer(fsm)
+        
+        p = eval_ctl_spec(fsm, atom("p"))
+        egp = eval_ctl_spec(fsm, eg(atom("p")))
+        state = fsm.pick_one_state(egp)
+        path, (inloop, loop) = explainer.explain_eg(state, p)
+        self.assertEqual(state, path[0])
+        self.assertEqual(len(path), 1)
+        self.assertEqual(loop, state)
+    
+    def test_shortest_explain(self):
+        fsm = self.init_model()
+        explainer = ShortestExplainer(fsm)
+        
+        initState = fsm.pick_one_state(fsm.init)
+        adminAlice = eval_ctl_spec(fsm, atom("admin = alice"))
+        
+        spec = Spec(parse_ctl_spec("EF EG admin = alice"))
+        path = explainer.explain(initState, spec)
+        self.assertEqual(initState, path[0])
+        self.assertIn(path[-1], path[:-1])
+        self.assertEqual(len(path), 9)
+        self.assertTrue(path[-1] <= adminAlice)
+        
+        spec = Spec(parse_ctl_spec("!AG admin != bob"))
+        path = explainer.explain(initState, spec)
+        self.assertEqual(len(path), 5)
+        self.assertFalse(path[-1] <= adminAlice)
+
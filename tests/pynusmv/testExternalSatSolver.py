@@ -0,0 +1,112 @@
+import os
+import sys
+import unittest
+
+from tests                import utils as tests
+from pynusmv.init         import init_nusmv, deinit_nusmv
+from pynusmv.glob         import load 
+from pynusmv.bmc.glob     import go_bmc, bmc_exit
+from pynusmv.be.fsm       import BeFsm  
+from pynusmv.be.expression import Be
+from pynusmv.bmc          import utils as bmcutils
+from pynusmv.sat          import (SatSolverFactory, ExternalSatSolver, Polarity,
+                                  SatSolverResult)
+from pynusmv.exception    import NuSmvSatSolverError
+
+class TestExternalSatSolver(unittest.TestCase):
+      
+    def model(self):
+        return tests.current_directory(__file__)+"/models/flipflops_explicit_relation.smv"
+    
+    def solver(self, *args, timeout=None):
+        script = tests.current_directory(__file__)+"/solvers/dpll.py"
+        return SatSolverFactory.create_external(sys.executable, 
+                                                [script] + list(args), 
+                                                timeout)
+
+    def setUp(self):
+        init_nusmv()
+        load(self.model())
+        go_bmc()
+        self.fsm = BeFsm.global_master_instance()
+ 
+    def tearDown(self):
+        bmc_exit()
+        deinit_nusmv()
+    
+    def test_create_external(self):
+        solver = self.solver()
+        self.assertIsInstance(solver, ExternalSatSolver)
+        self.assertEqual(os.path.basename(sys.executable), solver.name)
+        self.assertFalse(solver.supports_interpolation)
+        with self.assertRaises(NuSmvSatSolverError):
+            solver.random_mode = 0.1
+    
+    def test_model(self):
+        beenc = self.fsm.encoding
+        v     = beenc.by_name['v']
+        w     = beenc.by_name['w']
+        sat   = (v.boolean_expression * -w.boolean_expression).to_cnf()
+        
+        solver= self.solver()
+        solver+= sat
+        solver.polarity(sat, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.SATISFIABLE, solver.solve())
+        
+        cnf_model = set(solver.model)
+        self.assertTrue( v.index in cnf_model, 'v must be true')        
+        self.assertTrue(-w.index in cnf_model, 'w must be false')
+        
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, 
+                         solver.solve([w.cnf_literal]))
+        self.assertEqual([], solver.conflicts)
+    
+    def test_constants(self):
+        false  = Be.false(self.fsm.encoding.manager).to_cnf()
+        solver = self.solver()
+        solver+= false
+        solver.polarity(false, Polarity.NEGATIVE)
+        self.assertEqual(SatSolverResult.SATISFIABLE, solver.solve())
+        solver.polarity(false, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+    
+    def test_add_clauses(self):
+        solver = self.solver()
+        self.assertEqual(3, solver.add_clauses([1, 2, -1, 2, -2], [0, 2, 4, 5]))
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+        with self.assertRaises(ValueError):
+            solver.add_clauses([1, 2], [0, 3])
+        with self.assertRaises(NuSmvSatSolverError):
+            solver.add_clauses([1], [0, 1], group=42)
+    
+    def test_counter_example(self):
+        fsm    = self.fsm
+        enc    = fsm.encoding
+        model  = bmcutils.BmcModel(fsm)
+        v      = enc.by_name['v'].boolean_expression
+        # v is false at time 1
+        problem= model.path(1) & enc.shift_to_time(-v, 1)
+        cnf    = problem.to_cnf(Polarity.POSITIVE)
+        
+        solver = self.solver()
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.SATISFIABLE, solver.solve())
+        
+        decoded = enc.decode_sat_model(solver.model)
+        self.assertEqual("TRUE",  str(decoded[0]['v']))
+        self.assertEqual("FALSE", str(decoded[1]['v']))
+        
+        trace = bmcutils.generate_counter_example(fsm, problem, solver, 1)
+        self.assertEqual(1, len(trace))
+    
+    def test_failures(self):
+        self.assertEqual(SatSolverResult.INTERNAL_ERROR, 
+                         self.solver('--garbage').solve())
+        self.assertEqual(SatSolverResult.TIMEOUT, 
+                         self.solver('--sleep', '10', timeout=0.5).solve())
+        # a solver killed by a signal before its timeout did not time out
+        self.assertEqual(SatSolverResult.INTERNAL_ERROR, 
+                         self.solver('--crash', timeout=10).solve())
+        with self.assertRaises(NuSmvSatSolverError):
+            SatSolverFactory.create_external("/no/such/solver").solve()
@@ -526,6 +526,59 @@ class TestFsm(unittest.TestCase):
             self.assertTrue(fair == rc1 or fair == rc2)
             
     
+    def test_fair_states_algorithms(self):
+        fsm = BddFsm.from_filename(
+                                "tests/pynusmv/models/cardgame-post-fair.smv")
+        reachable = fsm.reachable_states
+        expected = fsm.fair_states & reachable
+        for algorithm in ("nusmv", "el", "owcty", "lockstep"):
+            self.assertEqual(expected,
+                             fsm.get_fair_states(algorithm=algorithm,
+                                                 restrict_to=reachable))
+        with self.assertRaises(ValueError):
+            fsm.get_fair_states(algorithm="unknown")
+    
+    
+    def test_fair_states_cache(self):
+        fsm = BddFsm.from_filename(
+                                "tests/pynusmv/models/cardgame-post-fair.smv")
+        fair = fsm.get_fair_states(algorithm="owcty")
+        self.assertIs(fair, fsm.get_fair_states(algorithm="owcty"))
+        
+        fsm.trans = fsm.trans
+        self.assertIsNot(fair, fsm.get_fair_states(algorithm="owcty"))
+        self.assertEqual(fair, fsm.get_fair_states(algorithm="owcty"))
+        self.assertEqual(fair, fsm.fair_states)
+    
+    
+    def test_sccs(self):
+        fsm = BddFsm.from_filename("tests/pynusmv/models/admin.smv")
+        reachable = fsm.reachable_states
+        for algorithm in ("skeleton", "lockstep"):
+            sccs = list(fsm.sccs(algorithm=algorithm, skip_trivial=False))
+            union = BDD.false(fsm)
+            for scc in sccs:
+                self.assertTrue((union & scc).is_false())
+                union = union | scc
+            self.assertEqual(union, reachable)
+            # starting -> choosing are trivial, then two loops
+            self.assertEqual(len(sccs), 4)
+            self.assertEqual(len(list(fsm.sccs(algorithm=algorithm))), 2)
+        with self.assertRaises(ValueError):
+            fsm.sccs(algorithm="unknown")
+    
+    
+    def test_sccs_stop_at_first_fair(self):
+        fsm = BddFsm.from_filename(
+                                "tests/pynusmv/models/cardgame-post-fair.smv")
+        sccs = list(fsm.sccs(stop_at_first_fair=True))
+        self.assertTrue(len(sccs) > 0)
+        last = sccs[-1]
+        for fairness in fsm.fairness_constraints:
+            self.assertTrue((last & fairness).isnot_false())
+        self.assertTrue((last & fsm.pre(last)).isnot_false())
+    
+    
     def test_no_fairness(self):
         fsm = BddFsm.from_filename("tests/pynusmv/models/counters.smv")
         self.assertIsNotNone(fsm)
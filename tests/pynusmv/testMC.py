@@ -3,6 +3,8 @@ import unittest
 from pynusmv_lower_interface.nusmv.cmd import cmd
 from pynusmv_lower_interface.nusmv.prop import prop as nsprop
 from pynusmv_lower_interface.nusmv.mc import mc as nsmc
+from pynusmv_lower_interface.nusmv.opt import opt as nsopt
+from pynusmv_lower_interface.nusmv.fsm.bdd import bdd as nsfsmbdd
 
 from pynusmv.init import init_nusmv, deinit_nusmv
 from pynusmv import mc
@@ -11,6 +13,7 @@ from pynusmv import prop
 from pynusmv import parser
 from pynusmv.utils import fixpoint
 from pynusmv.dd import BDD
+from pynusmv.fsm import BddFsm
 
 
 class TestMC(unittest.TestCase):
@@ -106,6 +109,97 @@ class TestMC(unittest.TestCase):
         self.assertTrue(any(state["admin"] != "none"
                             for state in explanation[::2]))
     
+    def test_mc_explain_ltl_counterexample(self):
+        glob.load("tests/pynusmv/models/admin.smv")
+        glob.compute_model()
+        
+        spec = prop.Spec(parser.parse_ltl_spec("G admin = none"))
+        result, explanation = mc.check_explain_ltl_spec(spec)
+        self.assertIsInstance(explanation, mc.Counterexample)
+        self.assertEqual(len(explanation) % 2, 1)
+        self.assertIsNotNone(explanation.loop_start)
+        self.assertEqual(explanation[explanation.loop_start],
+                         explanation[-1])
+        self.assertEqual(explanation[0], tuple(explanation)[0])
+        
+        trace = explanation.to_trace()
+        self.assertEqual(len(trace), len(explanation) // 2)
+        
+        # The counterexample still behaves as the tuple it used to be
+        fsm = glob.prop_database().master.bddFsm
+        steps = tuple(fsm.pick_one_state(explanation.bdd(index))
+                      .get_str_values() if index % 2 == 0 else
+                      fsm.pick_one_inputs(explanation.bdd(index))
+                      .get_str_values()
+                      for index in range(len(explanation)))
+        self.assertEqual(explanation, steps)
+        self.assertEqual(steps, explanation)
+        self.assertEqual(mc.check_explain_ltl_spec(spec), (False, steps))
+        self.assertEqual(explanation + steps[:1], steps + steps[:1])
+        self.assertEqual(steps[:1] + explanation, steps[:1] + steps)
+        with self.assertRaises(TypeError):
+            # as the tuple of its dictionaries, it is not hashable
+            hash(explanation)
+        self.assertTrue(trace.steps[explanation.loop_start // 2 + 1]
+                        .is_loopback)
+    
+    def test_mc_explain_ltl_el_fwd(self):
+        glob.load("tests/pynusmv/models/admin.smv")
+        glob.compute_model()
+        nsopt.set_oreg_justice_emptiness_bdd_algorithm(
+            nsopt.OptsHandler_get_instance(),
+            nsfsmbdd.BDD_OREG_JUSTICE_EMPTINESS_BDD_ALGORITHM_EL_FWD)
+        
+        spec = prop.Spec(parser.parse_ltl_spec("G admin = none"))
+        result, explanation = mc.check_explain_ltl_spec(spec)
+        self.assertFalse(result)
+        self.assertTrue(any(state["admin"] != "none"
+                            for state in explanation[::2]))
+        # The explanation is a lasso
+        self.assertIn(explanation[-1], explanation[:-1:2])
+        
+        spec = prop.Spec(parser.parse_ltl_spec(
+                         "(F admin = alice) | (F admin = bob)"))
+        self.assertEqual(mc.check_explain_ltl_spec(spec), (True, None))
+    
+    def test_ltl_checker(self):
+        glob.load("tests/pynusmv/models/admin.smv")
+        glob.compute_model()
+        fsm = glob.prop_database().master.bddFsm
+        
+        false = prop.Spec(parser.parse_ltl_spec("G admin = none"))
+        true = prop.Spec(parser.parse_ltl_spec(
+                         "(F admin = alice) | (F admin = bob)"))
+        
+        with mc.LtlChecker(fsm) as checker:
+            self.assertFalse(checker.check(false))
+            self.assertTrue(checker.check(true))
+            self.assertEqual(len(checker._structs), 2)
+            
+            # Equal specs and conjunctions of checked specs reuse tableaux
+            self.assertFalse(checker.check(prop.Spec(
+                             parser.parse_ltl_spec("G admin = none"))))
+            self.assertTrue(checker.check(true & true))
+            self.assertFalse(checker.check(true & false))
+            self.assertEqual(len(checker._structs), 2)
+            
+            result, explanation = checker.check_explain(true & false)
+            self.assertFalse(result)
+            self.assertTrue(any(state["admin"] != "none"
+                                for state in explanation[::2]))
+            self.assertEqual(checker.check_explain(true), (True, None))
+        
+        self.assertTrue(checker.closed)
+        self.assertEqual(len(checker._structs), 0)
+        with self.assertRaises(ValueError):
+            checker.check(true)
+        
+        # Only the master FSM is supported
+        other = BddFsm(nsfsmbdd.BddFsm_copy(fsm._ptr), freeit=False)
+        with self.assertRaises(ValueError):
+            mc.LtlChecker(other)
+        nsfsmbdd.BddFsm_destroy(other._ptr)
+    
     def test_ef(self):
         glob.load("tests/pynusmv/models/admin.smv")
         glob.compute_model()
@@ -116,6 +210,16 @@ class TestMC(unittest.TestCase):
         efalice = mc.eval_ctl_spec(fsm, spec)
         self.assertEqual(mc.ef(fsm, alice), efalice)
     
+    def test_shortest_path_unreachable(self):
+        glob.load("tests/pynusmv/models/admin.smv")
+        glob.compute_model()
+        fsm = glob.prop_database().master.bddFsm
+        
+        source = fsm.pick_one_state(fsm.init)
+        with self.assertRaises(ValueError):
+            mc._shortest_path(fsm, source, BDD.false(fsm),
+                              fsm.reachable_states)
+    
     def test_eg(self):
         glob.load("tests/pynusmv/models/admin.smv")
         glob.compute_model()
@@ -0,0 +1,118 @@
+import unittest
+
+from pynusmv.init import init_nusmv, deinit_nusmv
+from pynusmv import glob
+from pynusmv import mc
+from pynusmv import mucalc
+from pynusmv.mucalc import parse, evaluate, Evaluator, mu, nu, var, atom
+from pynusmv.utils import fixpoint
+from pynusmv.dd import BDD
+from pynusmv.exception import MuCalculusError
+
+
+class TestMuCalc(unittest.TestCase):
+
+    def setUp(self):
+        init_nusmv()
+
+    def tearDown(self):
+        deinit_nusmv()
+
+    def model(self, path="tests/pynusmv/models/admin.smv"):
+        glob.load(path)
+        glob.compute_model()
+        return glob.prop_database().master.bddFsm
+
+    def test_parse(self):
+        term = parse("nu Z. p & pre(Z)")
+        self.assertEqual(term, nu("Z", var("p") & mucalc.pre(var("Z"))))
+        self.assertEqual(term.free_vars, {"p"})
+        self.assertEqual(parse("mu X. ~~X | pre(X)").free_vars, set())
+
+    def test_parse_error(self):
+        with self.assertRaises(MuCalculusError):
+            parse("mu X. (X")
+
+    def test_non_monotonic(self):
+        with self.assertRaises(MuCalculusError):
+            mu("X", ~var("X"))
+        with self.assertRaises(MuCalculusError):
+            parse("nu X. pre(~(X & TRUE))")
+
+    def test_unbound(self):
+        fsm = self.model()
+        with self.assertRaises(MuCalculusError):
+            evaluate(fsm, "mu X. Y | pre(X)")
+
+    def test_ef(self):
+        fsm = self.model()
+        alice = mc.eval_simple_expression(fsm, "admin = alice")
+        self.assertEqual(evaluate(fsm, "mu Z. {admin = alice} | pre(Z)")
+                         & fsm.reachable_states,
+                         mc.ef(fsm, alice) & fsm.reachable_states)
+
+    def test_eg(self):
+        fsm = self.model()
+        alice = mc.eval_simple_expression(fsm, "admin = alice")
+        term = parse("nu Z. alice & pre(Z)", atoms={"alice": alice})
+        self.assertEqual(evaluate(fsm, term) & fsm.reachable_states,
+                         mc.eg(fsm, alice))
+        self.assertEqual(evaluate(fsm, term),
+                         fixpoint(lambda Z: alice & fsm.pre(Z), BDD.true()))
+
+    def test_env(self):
+        fsm = self.model()
+        alice = mc.eval_simple_expression(fsm, "admin = alice")
+        self.assertEqual(evaluate(fsm, "mu Z. p | pre(Z)", {"p": alice}),
+                         evaluate(fsm, "mu Z. {admin = alice} | pre(Z)"))
+
+    def test_fair_states(self):
+        fsm = self.model("tests/pynusmv/models/cardgame-post-fair.smv")
+        fairness = {"f{}".format(i): atom(f)
+                    for i, f in enumerate(fsm.fairness_constraints)}
+        body = " & ".join("pre(mu Y. (Z & {}) | pre(Y))".format(name)
+                          for name in fairness)
+        term = parse("nu Z. " + body, atoms=fairness)
+        self.assertEqual(evaluate(fsm, term) & fsm.reachable_states,
+                         fsm.fair_states & fsm.reachable_states)
+
+    def test_cache(self):
+        fsm = self.model()
+        evaluator = Evaluator(fsm)
+        term = parse("(mu Z. {admin = bob} | pre(Z))"
+                     " & ~(mu Z. {admin = bob} | pre(Z))")
+        self.assertTrue(evaluator.evaluate(term).is_false())
+        self.assertGreater(evaluator.stats.hits, 0)
+        self.assertIn(term, evaluator.cache)
+
+        evaluations = evaluator.stats.evaluations
+        evaluator.evaluate(term)
+        self.assertEqual(evaluator.stats.evaluations, evaluations)
+
+        evaluator.clear_cache()
+        self.assertEqual(len(evaluator.cache), 0)
+
+    def test_reuse(self):
+        fsm = self.model()
+        evaluator = Evaluator(fsm)
+        alice = mc.eval_simple_expression(fsm, "admin = alice")
+        term = parse("mu X. mu Y. (alice | pre(X)) | pre(Y)",
+                     atoms={"alice": alice})
+        self.assertEqual(evaluator.evaluate(term),
+                         evaluate(fsm, parse("mu Z. alice | pre(Z)",
+                                             atoms={"alice": alice})))
+        self.assertGreater(evaluator.stats.reused, 0)
+
+    def test_reuse_negated(self):
+        fsm = self.model()
+        evaluator = Evaluator(fsm)
+        alice = mc.eval_simple_expression(fsm, "admin = alice")
+        term = parse("mu Z. ~p | pre(Z)")
+        self.assertEqual(evaluator.evaluate(term, {"p": alice}),
+                         evaluate(fsm, term, {"p": alice}))
+
+        # p grows, hence the fixpoint shrinks and cannot start from the
+        # previous one
+        self.assertEqual(evaluator.evaluate(term, {"p": BDD.true(fsm)}),
+                         evaluate(fsm, term, {"p": BDD.true(fsm)}))
+        self.assertEqual(evaluator.stats.reused, 0)
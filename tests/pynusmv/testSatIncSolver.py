@@ -66,4 +66,29 @@ class TestSatIncSolver(unittest.TestCase):
         solver.move_to_permanent(group)
         solution = solver.solve()
         self.assertEqual(SatSolverResult.UNSATISFIABLE, solution)
-    
\ No newline at end of file
+    
+    
+    def test_solve_groups_assumptions(self):
+        solver = SatSolverFactory.create("MiniSat", incremental=True)
+        v      = self.fsm.encoding.by_name["v"]
+        w      = self.fsm.encoding.by_name["w"]
+        
+        # the group says v => w
+        group  = solver.create_group()
+        clause = (-v.boolean_expression + w.boolean_expression).to_cnf()
+        solver.add_to_group(clause, group)
+        solver.polarity(clause, Polarity.POSITIVE, group)
+        
+        assumptions = [v.cnf_literal, -w.cnf_literal]
+        self.assertEqual(SatSolverResult.UNSATISFIABLE,
+                         solver.solve_groups([group], assumptions))
+        self.assertEqual(set(assumptions), set(solver.conflicts))
+        self.assertEqual(SatSolverResult.UNSATISFIABLE,
+                         solver.solve_all_groups(assumptions))
+        
+        # without the group, the assumptions are consistent
+        self.assertEqual(SatSolverResult.SATISFIABLE,
+                         solver.solve_groups([], assumptions))
+        model = set(solver.model)
+        self.assertTrue(v.cnf_literal in model)
+        self.assertTrue(-w.cnf_literal in model)
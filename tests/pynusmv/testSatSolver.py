@@ -5,7 +5,9 @@ from pynusmv.init         import init_nusmv, deinit_nusmv
 from pynusmv.glob         import load 
 from pynusmv.bmc.glob     import go_bmc, bmc_exit
 from pynusmv.be.fsm       import BeFsm  
+from pynusmv.be.expression import CnfEncoding
 from pynusmv.sat          import SatSolverFactory, Polarity, SatSolverResult
+from pynusmv.exception    import NuSmvSatSolverError
 
 class TestSatSolver(unittest.TestCase):
       
@@ -105,3 +107,139 @@ class TestSatSolver(unittest.TestCase):
         self.assertTrue( v.index in set(cnf_model), 'v must be true')        
         self.assertTrue(-w.index in set(cnf_model), 'w must be false')
  
+    
+    def test_interpolation_unsupported(self):
+        solver= SatSolverFactory.create('MiniSat', incremental=False, proof=False)
+        self.assertFalse(solver.supports_interpolation)
+        with self.assertRaises(NuSmvSatSolverError):
+            solver.new_itp_group()
+        with self.assertRaises(NuSmvSatSolverError):
+            solver.curr_itp_group
+    
+    def test_interpolant(self):
+        solver= SatSolverFactory.create('MiniSat', incremental=False, proof=True)
+        if not solver.supports_interpolation:
+            self.skipTest("NuSMV was not built with a proof logging MiniSat")
+        
+        mgr   = self.fsm.encoding.manager
+        v     = self.fsm.encoding.by_name['v'].boolean_expression
+        w     = self.fsm.encoding.by_name['w'].boolean_expression
+        
+        # A = v & w ; B = !v  => the interpolant only talks about v
+        group_a = solver.new_itp_group()
+        self.assertEqual(group_a, solver.curr_itp_group)
+        a = (v & w).to_cnf()
+        solver += a
+        solver.polarity(a, Polarity.POSITIVE)
+        solver.new_itp_group()
+        b = (~v).to_cnf()
+        solver += b
+        solver.polarity(b, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+        
+        itp = solver.interpolant([group_a], mgr)
+        # A => itp and itp & B is unsat
+        for problem in [(v & w) & ~itp, itp & ~v]:
+            check = SatSolverFactory.create('MiniSat', incremental=False, proof=False)
+            cnf   = problem.to_cnf()
+            check+= cnf
+            check.polarity(cnf, Polarity.POSITIVE)
+            self.assertEqual(SatSolverResult.UNSATISFIABLE, check.solve())
+    
+    def test_interpolant_shared_subformula(self):
+        solver= SatSolverFactory.create('MiniSat', incremental=False, proof=True)
+        if not solver.supports_interpolation:
+            self.skipTest("NuSMV was not built with a proof logging MiniSat")
+        
+        mgr   = self.fsm.encoding.manager
+        v     = self.fsm.encoding.by_name['v'].boolean_expression
+        w     = self.fsm.encoding.by_name['w'].boolean_expression
+        
+        # A = (v | w) & !w ; B = !(v | w) => A and B share the cnf variable 
+        # of the gate (v | w)
+        shared  = v | w
+        group_a = solver.new_itp_group()
+        a = (shared & ~w).to_cnf(encoding=CnfEncoding.TSEITIN)
+        solver += a
+        solver.polarity(a, Polarity.POSITIVE)
+        solver.new_itp_group()
+        b = (~shared).to_cnf(encoding=CnfEncoding.TSEITIN)
+        solver += b
+        solver.polarity(b, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+        
+        itp = solver.interpolant([group_a], mgr)
+        # A => itp and itp & B is unsat
+        for problem in [(shared & ~w) & ~itp, itp & ~shared]:
+            check = SatSolverFactory.create('MiniSat', incremental=False, proof=False)
+            cnf   = problem.to_cnf()
+            check+= cnf
+            check.polarity(cnf, Polarity.POSITIVE)
+            self.assertEqual(SatSolverResult.UNSATISFIABLE, check.solve())
+    
+    def test_solve_assumptions(self):
+        beenc = self.fsm.encoding
+        v     = beenc.by_name['v']
+        w     = beenc.by_name['w']
+        solver= SatSolverFactory.create('MiniSat', incremental=False, proof=False)
+        
+        # v => w
+        cnf   = (-v.boolean_expression + w.boolean_expression).to_cnf()
+        solver+= cnf
+        solver.polarity(cnf, Polarity.POSITIVE)
+        
+        self.assertEqual(SatSolverResult.SATISFIABLE,
+                         solver.solve([v.cnf_literal, w.cnf_literal]))
+        self.assertTrue(w.cnf_literal in set(solver.model))
+        self.assertEqual([], solver.conflicts)
+        
+        # v & !w is inconsistent, the conflict does not mention the 3rd var
+        f     = v.next
+        self.assertEqual(SatSolverResult.UNSATISFIABLE,
+                         solver.solve([f.cnf_literal, v.cnf_literal, -w.cnf_literal]))
+        self.assertEqual({v.cnf_literal, -w.cnf_literal}, set(solver.conflicts))
+        
+        # the assumptions are not kept for the subsequent solvings
+        self.assertEqual(SatSolverResult.SATISFIABLE, solver.solve())
+        self.assertEqual([], solver.conflicts)
+    
+    def test_solve_assumptions_zchaff(self):
+        if 'ZChaff' not in SatSolverFactory.available_solvers():
+            self.skipTest("ZChaff is not available")
+        solver= SatSolverFactory.create('ZChaff', incremental=False, proof=False)
+        with self.assertRaises(NuSmvSatSolverError):
+            solver.solve([1])
+    
+    def test_add_clauses(self):
+        beenc = self.fsm.encoding
+        v     = beenc.by_name['v'].cnf_literal
+        w     = beenc.by_name['w'].cnf_literal
+        
+        # (v | w) & (!v) & (!w | v)
+        solver= SatSolverFactory.create('MiniSat', incremental=False, proof=False)
+        self.assertEqual(2, solver.add_clauses([v, w, -v], [0, 2, 3]))
+        self.assertEqual(SatSolverResult.SATISFIABLE, solver.solve())
+        self.assertEqual(1, solver.add_clauses([-w, v], [0, 2]))
+        self.assertEqual(SatSolverResult.UNSATISFIABLE, solver.solve())
+        
+        with self.assertRaises(ValueError):
+            solver.add_clauses([v, w], [0, 3])
+        
+    def test_add_clauses_from_cnf(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        
+        v     = self.fsm.encoding.by_name['v'].boolean_expression
+        w     = self.fsm.encoding.by_name['w'].boolean_expression
+        cnf   = (v & ~w).to_cnf(Polarity.POSITIVE)
+        
+        solver= SatSolverFactory.create('MiniSat', incremental=False, proof=False)
+        literals, offsets = cnf.to_arrays()
+        self.assertEqual(cnf.clauses_number, solver.add_clauses(literals, offsets))
+        solver.polarity(cnf, Polarity.POSITIVE)
+        self.assertEqual(SatSolverResult.SATISFIABLE, solver.solve())
+        model = set(solver.model)
+        self.assertTrue(self.fsm.encoding.by_name['v'].cnf_literal in model)
+        self.assertTrue(-self.fsm.encoding.by_name['w'].cnf_literal in model)
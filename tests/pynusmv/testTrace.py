@@ -298,4 +298,32 @@ class TestTrace(unittest.TestCase):
             
             # once a step is appended, we can access one offset further
             step2 = trace.append_step()
-            self.assertEquals(step2, trace.steps[2])
\ No newline at end of file
+            self.assertEquals(step2, trace.steps[2])
+    
+    def test_to_table(self):
+        with BmcSupport():
+            sexp_fsm = master_bool_sexp_fsm()
+            be_fsm   = master_be_fsm()
+            
+            trace    = Trace.create("Dummy example", 
+                         TraceType.COUNTER_EXAMPLE, 
+                         sexp_fsm.symbol_table,
+                         sexp_fsm.symbols_list,
+                         is_volatile=True)
+            
+            v    = be_fsm.encoding.by_name['v'].name
+            yes  = Node.from_ptr(parse_simple_expression("TRUE"))
+            step = trace.steps[1]
+            step+= (v, yes)
+            trace.append_step()
+            
+            table = trace.to_table()
+            self.assertEqual(list(trace.symbols), list(table))
+            self.assertEqual([yes, None], table[v])
+            self.assertEqual({v: [yes, None]}, trace.to_table([v]))
+            
+            # the rows of the table are the steps of the trace
+            for i, step in enumerate(trace):
+                row = {sym: col[i] for sym, col in table.items() 
+                                   if col[i] is not None}
+                self.assertEqual(dict(step), row)